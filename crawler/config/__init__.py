@@ -20,6 +20,34 @@ load_dotenv()
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 
+# REST 폴백 클라이언트(repositories/db.py) 커넥션 풀 설정
+# - POOL_SIZE : 호스트당 유지할 최대 커넥션 수 (to_thread 동시 호출 수보다 크게)
+# - KEEPALIVE : 0이면 요청마다 커넥션을 닫음 (디버깅용)
+# - HTTP2     : 1이면 httpx(h2 설치 필요)로 HTTP/2 멀티플렉싱 사용
+SUPABASE_POOL_SIZE = int(os.getenv("SUPABASE_POOL_SIZE") or "20")
+SUPABASE_KEEPALIVE = (os.getenv("SUPABASE_KEEPALIVE") or "1").strip() != "0"
+SUPABASE_HTTP2 = (os.getenv("SUPABASE_HTTP2") or "0").strip() == "1"
+SUPABASE_TIMEOUT = int(os.getenv("SUPABASE_TIMEOUT") or "60")
+
+# 비동기 워커(async_supabase_client)의 동시 DB 요청 상한
+SUPABASE_ASYNC_CONCURRENCY = int(os.getenv("SUPABASE_ASYNC_CONCURRENCY") or "10")
+
+# REST 클라이언트 재시도 / 서킷 브레이커
+# - RETRY_MAX          : 429/5xx/네트워크 오류 시 최대 재시도 횟수 (0이면 재시도 안 함)
+#                        멱등 요청(GET/HEAD/PATCH/DELETE)과 on_conflict 업서트만 재시도합니다.
+# - RETRY_BASE_SEC     : 지수 백오프 기준 대기 (base * 2^n 범위에서 full jitter)
+# - RETRY_MAX_SEC      : 1회 대기 상한 (Retry-After 헤더 값도 이 값으로 자름)
+# - BREAKER_THRESHOLD  : 연속 실패(5xx/네트워크) 이 횟수면 서킷 OPEN (0이면 끔)
+# - BREAKER_COOLDOWN_SEC: OPEN 후 이 시간 동안 요청을 보내지 않고 즉시 실패
+SUPABASE_RETRY_MAX = int(os.getenv("SUPABASE_RETRY_MAX") or "3")
+SUPABASE_RETRY_BASE_SEC = float(os.getenv("SUPABASE_RETRY_BASE_SEC") or "0.5")
+SUPABASE_RETRY_MAX_SEC = float(os.getenv("SUPABASE_RETRY_MAX_SEC") or "20")
+SUPABASE_BREAKER_THRESHOLD = int(os.getenv("SUPABASE_BREAKER_THRESHOLD") or "5")
+SUPABASE_BREAKER_COOLDOWN_SEC = float(os.getenv("SUPABASE_BREAKER_COOLDOWN_SEC") or "30")
+
+# DB 요청 계측 (repositories/db_metrics.py) — 0이면 요청별 지연/용량 집계를 끕니다.
+SUPABASE_METRICS = (os.getenv("SUPABASE_METRICS") or "1").strip() != "0"
+
 # ==============================
 # Naver API 설정
 # ==============================
@@ -27,6 +55,64 @@ SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 NAVER_CLIENT_ID = os.getenv("NAVER_CLIENT_ID")
 NAVER_CLIENT_SECRET = os.getenv("NAVER_CLIENT_SECRET")
 
+# 키워드 동시 검색 설정 (crawlers/naver_news.py)
+# - CONCURRENCY : 동시에 진행할 검색 요청 수 (스레드 수)
+# - RPS         : 초당 최대 요청 수. 네이버 검색 API 호출 한도(초당 10회)를 넘지 않게 합니다.
+NAVER_CONCURRENCY = int(os.getenv("NAVER_CONCURRENCY") or "8")
+NAVER_RPS = float(os.getenv("NAVER_RPS") or "10")
+
+# 저빈도 키워드 OR 쿼리 묶음 검색 (crawlers/query_packer.py) — 0이면 키워드마다 따로 검색
+NAVER_PACK_ENABLED = (os.getenv("NAVER_PACK") or "1").strip() != "0"
+
+# 확장 쿼리(키워드 × 확장어) 실행당 최대 검색 수 (services/query_planner.py)
+# 네이버 검색 API 일일 한도(25,000회) 안에서 원본 키워드 검색 후 남는 몫으로 잡습니다.
+EXPAND_QUERY_BUDGET = int(os.getenv("EXPAND_QUERY_BUDGET") or "300")
+
+# 쿼리별 수집 주기 (services/crawl_scheduler.py, scheduler_main.py)
+# - BUDGET_PER_HOUR : 시간당 검색 횟수 예산 (일일 한도 25,000회에서 페이지 추가 조회 몫을 남김)
+# - MIN/MAX_INTERVAL: 한 쿼리의 검색 주기 하한/상한 (분)
+NEWS_CRAWL_BUDGET_PER_HOUR = float(os.getenv("NEWS_CRAWL_BUDGET_PER_HOUR") or "600")
+NEWS_MIN_INTERVAL_MIN = float(os.getenv("NEWS_MIN_INTERVAL_MIN") or "10")
+NEWS_MAX_INTERVAL_MIN = float(os.getenv("NEWS_MAX_INTERVAL_MIN") or "1440")
+
+# ==============================
+# 뉴스 수집: 이미 적재한 URL 로컬 필터 (repositories/seen_url_filter.py)
+# ==============================
+
+# - ENABLED    : 0이면 필터를 쓰지 않고 모든 URL을 DB에서 확인
+# - PATH       : Bloom filter 파일 경로 (실행 디렉토리 기준)
+# - CAPACITY   : 예상 최대 URL 수 (넘으면 재구성 시 2배씩 키움)
+# - ERROR_RATE : 오탐 확률 (필터가 '이미 봄'이라고 잘못 판정해 신규 기사를 건너뛸 확률)
+# - REBUILD    : 1이면 시작 시 articles 테이블에서 필터를 새로 만듦
+SEEN_URL_FILTER_ENABLED = (os.getenv("SEEN_URL_FILTER") or "1").strip() != "0"
+SEEN_URL_FILTER_PATH = os.getenv("SEEN_URL_FILTER_PATH") or "seen_urls.bloom"
+SEEN_URL_FILTER_CAPACITY = int(os.getenv("SEEN_URL_FILTER_CAPACITY") or "1000000")
+SEEN_URL_FILTER_ERROR_RATE = float(os.getenv("SEEN_URL_FILTER_ERROR_RATE") or "0.0001")
+SEEN_URL_FILTER_REBUILD = (os.getenv("SEEN_URL_FILTER_REBUILD") or "0").strip() == "1"
+
+# ==============================
+# 뉴스 수집: 체크포인트 스풀 (repositories/news_spool.py)
+# ==============================
+
+# 메타 저장 후 분석이 끝나지 않은 기사를 로컬 파일에 기록해 두고 다음 실행에서 이어서 분석합니다.
+# - ENABLED   : 0이면 스풀을 쓰지 않음
+# - PATH      : 스풀 파일 경로 (실행 디렉토리 기준, 권한 0600)
+# - TTL_HOURS : 이 시간이 지난 기사 원문은 분석하지 않고 버림 (원문 보관 최소화)
+NEWS_SPOOL_ENABLED = (os.getenv("NEWS_SPOOL") or "1").strip() != "0"
+NEWS_SPOOL_PATH = os.getenv("NEWS_SPOOL_PATH") or "news_spool.jsonl"
+NEWS_SPOOL_TTL_HOURS = float(os.getenv("NEWS_SPOOL_TTL_HOURS") or "24")
+
+# ==============================
+# 뉴스 수집: 유사(전재) 기사 묶기 (services/near_duplicate.py)
+# ==============================
+
+# - ENABLED      : 0이면 유사 기사도 모두 LLM 분석
+# - MAX_DISTANCE : SimHash(64bit) 해밍 거리 이 값 이하이면 같은 기사로 봄 (클수록 더 많이 묶음)
+# - WINDOW_HOURS : 이 시간 안에 본 기사와만 비교 (프로세스 메모리 색인)
+NEAR_DUP_ENABLED = (os.getenv("NEAR_DUP") or "1").strip() != "0"
+NEAR_DUP_MAX_DISTANCE = int(os.getenv("NEAR_DUP_MAX_DISTANCE") or "6")
+NEAR_DUP_WINDOW_HOURS = float(os.getenv("NEAR_DUP_WINDOW_HOURS") or "48")
+
 # ==============================
 # DART Open API 설정
 # ==============================
@@ -39,6 +125,15 @@ DART_API_KEY = os.getenv("DART_API_KEY")
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
+# 뉴스 묶음 분석 호출 제한 (services/batch_signal_service.py, llm/rate_limiter.py)
+# - CONCURRENCY : 동시에 진행할 LLM 묶음 분석 수
+# - RPM / TPM   : 분당 요청 수 / 분당 토큰 수 상한 (계정 등급 한도에 맞춰 설정, 0이면 제한 없음)
+# - RETRY_MAX   : 429/일시 오류 시 최대 재시도 횟수
+OPENAI_CONCURRENCY = int(os.getenv("OPENAI_CONCURRENCY") or "4")
+OPENAI_RPM = float(os.getenv("OPENAI_RPM") or "500")
+OPENAI_TPM = float(os.getenv("OPENAI_TPM") or "200000")
+OPENAI_RETRY_MAX = int(os.getenv("OPENAI_RETRY_MAX") or "5")
+
 # ==============================
 # 스케줄링 설정
 # ==============================
@@ -6,6 +6,30 @@ base.py
 """
 
 from abc import ABC, abstractmethod
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from functools import partial
+from itertools import islice
+from typing import Callable, Iterable, Iterator, Mapping, Optional, TypeVar, Union
+
+T = TypeVar("T")
+
+
+class FetchResult(list):
+    """
+    fetch_articles() 결과 목록. (list와 같게 쓰면 됨)
+    truncated=True: API 조회 한도(페이지 깊이)에 막혀 since 이후 기사를 끝까지 읽지 못함
+                    → 호출 측은 워터마크를 가져온 가장 오래된 기사 시각보다 앞으로 옮기면 안 됩니다.
+    """
+
+    def __init__(self, articles: Iterable[dict] = (), truncated: bool = False):
+        super().__init__(articles)
+        self.truncated = truncated
+
+
+# 스레드 1개당 동시에 걸어 둘 검색 작업 수 (진행 중 + 결과를 아직 가져가지 않은 작업)
+# 소비 측(run_crawler)이 분석 대기열에서 막혀 있는 동안 검색 결과가 메모리에 무한정 쌓이지 않게 합니다.
+PENDING_PER_WORKER = 2
 
 
 class BaseCrawler(ABC):
@@ -13,6 +37,64 @@ class BaseCrawler(ABC):
     모든 크롤러는 반드시 fetch_articles를 구현해야 함
     """
 
+    # fetch_many()의 기본 동시 요청 수 (하위 클래스에서 조정)
+    concurrency: int = 1
+
     @abstractmethod
-    def fetch_articles(self, keyword: str):
-        pass
\ No newline at end of file
+    def fetch_articles(self, keyword: str, since: Optional[datetime] = None):
+        """since(워터마크)가 주어지면 그 시각 이후 기사만 빠짐없이 가져오도록 구현합니다."""
+        pass
+
+    def fetch_many(
+        self,
+        keywords: Iterable[str],
+        since: Union[datetime, Mapping[str, datetime], None] = None,
+        expected: Optional[Mapping[str, float]] = None,
+    ) -> Iterator[tuple[str, Optional[list[dict]]]]:
+        """
+        여러 키워드를 스레드 풀로 동시에 검색하고, 끝나는 순서대로 (keyword, 기사 목록)을 내보냅니다.
+
+        - 동시 요청 수는 self.concurrency로 제한합니다.
+        - 결과를 가져가는 만큼만 다음 키워드를 검색합니다. (걸어 둔 작업 최대 concurrency × PENDING_PER_WORKER개)
+        - 초당 요청 수 제한은 각 크롤러의 fetch_articles()가 책임집니다.
+        - 한 키워드의 검색이 실패해도 나머지는 계속 진행합니다. (실패 키워드는 기사 목록 대신 None)
+        - since: 모든 키워드 공통 워터마크 또는 {keyword: 워터마크} (없는 키워드는 워터마크 없음)
+        - expected: {keyword: 예상 신규 기사 수} — 하위 클래스가 여러 키워드를 묶어 검색할 때 참고 (기본 구현은 무시)
+        """
+        keywords = list(keywords)
+        since_of = since.get if isinstance(since, Mapping) else (lambda _kw: since)
+
+        if self.concurrency <= 1:
+            for keyword in keywords:
+                yield keyword, self._fetch_safe(keyword, since_of(keyword))
+            return
+
+        yield from self._run_bounded(partial(self._fetch_pair, kw, since_of(kw)) for kw in keywords)
+
+    def _run_bounded(self, calls: Iterable[Callable[[], T]]) -> Iterator[T]:
+        """
+        calls를 self.concurrency개 스레드로 실행하고 끝나는 순서대로 결과를 내보냅니다.
+        걸어 둔 작업이 concurrency × PENDING_PER_WORKER개를 넘지 않도록, 결과를 하나 내보낼 때마다 다음 작업을 넣습니다.
+        """
+        calls = iter(calls)
+        max_pending = max(1, self.concurrency) * PENDING_PER_WORKER
+        with ThreadPoolExecutor(max_workers=max(1, self.concurrency)) as pool:
+            pending = {pool.submit(call) for call in islice(calls, max_pending)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    yield fut.result()
+                    nxt = next(calls, None)
+                    if nxt is not None:
+                        pending.add(pool.submit(nxt))
+
+    def _fetch_pair(self, keyword: str, since: Optional[datetime]) -> tuple[str, Optional[list[dict]]]:
+        return keyword, self._fetch_safe(keyword, since)
+
+    def _fetch_safe(self, keyword: str, since: Optional[datetime]) -> Optional[list[dict]]:
+        # 실패하면 None — 빈 결과(기사 없음)와 구분해 호출 측이 성과/발행 빈도에 반영하지 않게 합니다.
+        try:
+            return self.fetch_articles(keyword, since=since)
+        except Exception as e:
+            print(f"❌ 검색 실패 ({keyword}): {e}")
+            return None
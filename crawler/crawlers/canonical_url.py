@@ -0,0 +1,120 @@
+"""
+crawlers/canonical_url.py — 기사 URL 정규화
+
+역할:
+    - 같은 기사를 가리키는 URL 표기 차이를 없애 한 키로 비교할 수 있게 합니다.
+      (여러 키워드 검색 결과에 같은 기사가 섞여 들어올 때 한 번만 처리하기 위함)
+    - 스킴/호스트 소문자화, 기본 포트 제거, fragment(#...) 제거, 쿼리 파라미터 정렬
+    - 추적용 쿼리 파라미터(utm_*, fbclid 등) 제거
+    - 도메인/경로별 규칙 (_HOST_RULES, _PATH_RULES)
+        · 네이버 뉴스: 여러 경로(news.naver.com/main/read.naver?oid=&aid=, m.news…, n.news…/article/…)를
+          n.news.naver.com/mnews/article/{oid}/{aid} 하나로
+        · 기사 id가 쿼리에 있는 사이트: id 파라미터만 남김
+    - 정규화 결과는 다시 정규화해도 같습니다. (DB url, content_hash, 중복 확인 키로 그대로 사용)
+"""
+
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# 어느 사이트든 기사 식별과 무관한 추적용 파라미터
+_TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "yclid", "igshid",
+    "mc_cid", "mc_eid", "_ga", "cmpid", "ref_src", "ocid",
+}
+_TRACKING_PREFIXES = ("utm_",)
+
+# 네이버 뉴스 기사 (oid=언론사, aid=기사 번호)
+_NAVER_NEWS_HOSTS = {"news.naver.com", "n.news.naver.com", "m.news.naver.com"}
+_NAVER_ARTICLE_PATH = re.compile(r"^/(?:mnews/)?article/(\d+)/(\d+)")
+
+# 호스트별 규칙: 남길 쿼리 파라미터 (빈 집합이면 쿼리 전체 제거)
+_HOST_RULES: dict[str, set[str]] = {
+    "sports.news.naver.com": {"oid", "aid"},
+    "m.sports.naver.com":    {"oid", "aid"},
+    "entertain.naver.com":   {"oid", "aid"},
+    "m.entertain.naver.com": {"oid", "aid"},
+    "v.daum.net":            set(),
+    "news.v.daum.net":       set(),
+    "www.yna.co.kr":         set(),   # /view/AKR…?input=… (input은 유입 경로)
+}
+
+# 경로별 규칙 (소문자 경로): 여러 언론사가 같이 쓰는 기사 CMS
+# 규칙의 파라미터가 하나도 없는 URL에는 적용하지 않고 추적 파라미터만 지웁니다.
+_PATH_RULES: dict[str, set[str]] = {
+    "/news/articleview.html": {"idxno"},
+    "/news/articleview.php":  {"idxno"},
+    "/view.php":              {"ud", "idxno", "no"},
+}
+
+
+def _naver_article(host: str, path: str, params: list[tuple[str, str]]) -> str:
+    """네이버 뉴스 기사 URL이면 표준형을, 아니면 빈 문자열을 반환합니다."""
+    if host not in _NAVER_NEWS_HOSTS:
+        return ""
+    m = _NAVER_ARTICLE_PATH.match(path)
+    if m:
+        oid, aid = m.groups()
+    else:
+        query = dict(params)
+        oid, aid = query.get("oid", ""), query.get("aid", "")
+        if not (oid.isdigit() and aid.isdigit()):
+            return ""
+    return f"https://n.news.naver.com/mnews/article/{oid}/{aid}"
+
+
+def _filter_params(host: str, path: str, params: list[tuple[str, str]]) -> list[tuple[str, str]]:
+    keep = _HOST_RULES.get(host)
+    if keep is None:
+        # 경로 규칙은 여러 사이트에 걸치므로, 규칙의 id 파라미터가 실제로 있을 때만 적용합니다.
+        # (같은 경로에 다른 이름의 id를 쓰는 사이트에서 id를 지워 기사를 하나로 뭉개지 않도록)
+        rule = _PATH_RULES.get(path.lower())
+        if rule and any(k in rule for k, _ in params):
+            keep = rule
+    if keep is not None:
+        return [(k, v) for k, v in params if k in keep]
+    return [
+        (k, v) for k, v in params
+        if k.lower() not in _TRACKING_PARAMS and not k.lower().startswith(_TRACKING_PREFIXES)
+    ]
+
+
+def canonical_url(url: str) -> str:
+    """비교용 정규화 URL. 파싱할 수 없으면 앞뒤 공백만 제거해 그대로 반환합니다."""
+    url = (url or "").strip()
+    if not url:
+        return ""
+    try:
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        host = (parts.hostname or "").lower()
+        port = parts.port
+    except ValueError:
+        return url
+
+    path = parts.path or "/"
+    params = parse_qsl(parts.query, keep_blank_values=True)
+
+    naver = _naver_article(host, path, params)
+    if naver:
+        return naver
+
+    netloc = host
+    if port and _DEFAULT_PORTS.get(scheme) != port:
+        netloc = f"{host}:{port}"
+
+    query = urlencode(sorted(_filter_params(host, path, params)))
+    return urlunsplit((scheme, netloc, path, query, ""))
+
+
+def pick_article_url(link: str, original_link: str) -> str:
+    """
+    네이버 검색 결과 1건의 대표 URL (정규화 후).
+    네이버 뉴스에 실린 기사는 네이버 기사 URL(oid/aid)이 언론사 URL보다 안정적이라 그쪽을,
+    아니면 언론사 원문 URL(originallink)을 씁니다.
+    """
+    link_key = canonical_url(link)
+    if link_key.startswith("https://n.news.naver.com/mnews/article/"):
+        return link_key
+    return canonical_url(original_link) or link_key
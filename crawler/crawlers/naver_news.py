@@ -6,15 +6,33 @@ crawlers/naver_news.py — 네이버 뉴스 API 크롤러
     - API 응답에서 HTML 태그를 제거하고 기사 목록(title, description, url, published_at)을 반환합니다.
     - title과 description은 분석용으로만 메모리에서 사용하며 DB에 저장하지 않습니다.
 
-    ※ 한 번에 최대 30건을 가져오며, 최신순(sort=date)으로 정렬합니다.
+    ※ 최신순(sort=date)으로 정렬합니다. 워터마크가 없으면 첫 페이지(30건)만,
+       있으면 워터마크에 닿을 때까지 100건씩 페이지를 넘겨 가져옵니다.
+    ※ fetch_many()로 여러 키워드를 동시에 검색할 수 있습니다.
+       동시 요청 수(NAVER_CONCURRENCY)와 초당 요청 수(NAVER_RPS)를 함께 제한합니다.
+    ※ fetch_many(expected=...)를 주면 기사가 드문 키워드를 OR 쿼리로 묶어 검색합니다. (crawlers/query_packer.py)
+       묶음 결과가 1페이지를 넘치거나(포화), 제목/요약에 어느 키워드도 없는 기사가 섞여 있으면
+       그 묶음은 키워드별로 다시 검색합니다.
 """
 
+import threading
+import time
 import requests
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import partial
+from typing import Iterable, Iterator, Mapping, Optional, Union
 import re
 
-from config import NAVER_CLIENT_ID, NAVER_CLIENT_SECRET
-from .base import BaseCrawler
+from config import NAVER_CLIENT_ID, NAVER_CLIENT_SECRET, NAVER_CONCURRENCY, NAVER_RPS, NAVER_PACK_ENABLED
+from .base import BaseCrawler, FetchResult
+from .query_packer import pack_keywords, or_query, attribute
+from .canonical_url import pick_article_url
+
+# 검색 API 페이지 파라미터
+DEFAULT_DISPLAY = 30   # 워터마크가 없을 때(첫 실행) 가져올 건수
+MAX_DISPLAY = 100      # display 최대값
+MAX_START = 1000       # start 최대값 (이보다 깊은 결과는 API가 주지 않음)
+PACK_MAX_PAGES = 1     # 묶음 검색은 이 페이지 수 안에 워터마크에 닿지 않으면 포화로 보고 개별 검색
 
 
 def _clean_html(text: str) -> str:
@@ -25,23 +43,161 @@ def _clean_html(text: str) -> str:
     return " ".join(text.split())       # 연속 공백 정리
 
 
+class _RateLimiter:
+    """
+    스레드 간 공유되는 초당 요청 수 제한기.
+    요청 시작 시각을 1/rps 간격으로 배정하므로 순간적으로 몰려도 초당 rps회를 넘지 않습니다.
+    """
+
+    def __init__(self, rps: float):
+        self._interval = 1.0 / rps if rps > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+
+    def acquire(self) -> None:
+        if not self._interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start_at = max(now, self._next_at)
+            self._next_at = start_at + self._interval
+        if start_at > now:
+            time.sleep(start_at - now)
+
+
 class NaverNewsCrawler(BaseCrawler):
     """네이버 검색 오픈 API를 사용하는 뉴스 크롤러."""
 
     NAVER_URL = "https://openapi.naver.com/v1/search/news.json"
 
-    def fetch_articles(self, keyword: str) -> list[dict]:
+    def __init__(self, concurrency: int = NAVER_CONCURRENCY, rps: float = NAVER_RPS):
+        self.concurrency = max(1, int(concurrency))
+        self._limiter = _RateLimiter(rps)
+
+        # 스레드들이 커넥션을 재사용하도록 동시 요청 수만큼 keep-alive 풀을 둡니다.
+        self._session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=self.concurrency)
+        self._session.mount("https://", adapter)
+
+    def fetch_articles(self, keyword: str, since: Optional[datetime] = None) -> FetchResult:
         """
-        키워드로 네이버 뉴스를 검색하여 기사 목록을 반환합니다.
+        키워드로 네이버 뉴스를 검색하여 기사 목록을 반환합니다. (최신순)
+
+        since(워터마크)가 있으면 display=100으로 start를 넘겨가며 페이지를 읽고,
+        since 이전(같은 시각 포함) 기사가 나오는 페이지에서 멈춥니다.
+            - 조용한 키워드: 1회 호출로 끝
+            - 바쁜 키워드 : since 이후 기사를 빠짐없이 수집 (API 한도 start ≤ 1000 까지)
+        since가 없으면(첫 실행) 첫 페이지만 가져옵니다.
+        한도(start ≤ 1000)에 막혀 since까지 읽지 못하면 결과의 truncated가 True입니다.
 
         반환 형식 (기사 1건):
             {
                 "title"       : 기사 제목 (HTML 태그 제거 후)   ← 메모리에서만 사용
                 "description" : 기사 요약 (HTML 태그 제거 후)   ← 메모리에서만 사용
-                "url"         : 기사 원문 URL
+                "url"         : 기사 URL (crawlers/canonical_url.py로 정규화 — 중복 확인/DB 키)
+                "original_url": 언론사 원문 URL (originallink, 없으면 빈 문자열)
+                "link"        : 네이버 link 원본 (정규화 전)
                 "published_at": 발행 시각 (datetime, timezone 포함)
             }
         """
+        articles, complete = self._fetch_until(keyword, since)
+        if not complete:
+            print(f"⚠️ 검색 결과 잘림 ({keyword}): start {MAX_START} 한도까지 {len(articles)}건을 읽었지만 워터마크에 닿지 못했습니다.")
+        return FetchResult(articles, truncated=not complete)
+
+    def _fetch_until(self, query: str, since: Optional[datetime], max_pages: Optional[int] = None) -> tuple[list[dict], bool]:
+        """
+        since 이후 기사를 페이지를 넘겨가며 가져옵니다.
+        반환값: (기사 목록, 워터마크(또는 마지막 페이지)까지 다 읽었는지)
+        """
+        if since is not None and since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)  # DB 워터마크는 UTC naive로 저장됨
+
+        articles: list[dict] = []
+        start = 1
+        pages = 0
+        while start <= MAX_START:
+            page = self._fetch_page(query, start=start, display=MAX_DISPLAY if since else DEFAULT_DISPLAY)
+            pages += 1
+            articles.extend(a for a in page if since is None or a["published_at"] > since)
+
+            if since is None:
+                return articles, True  # 워터마크가 없으면 첫 페이지만
+            if len(page) < MAX_DISPLAY:
+                return articles, True  # 마지막 페이지
+            if page[-1]["published_at"] <= since:
+                return articles, True  # 워터마크를 지남 → 이후 페이지는 이미 수집한 기사
+            if max_pages is not None and pages >= max_pages:
+                break
+            start += MAX_DISPLAY
+
+        return articles, False
+
+    def fetch_many(
+        self,
+        keywords: Iterable[str],
+        since: Union[datetime, Mapping[str, datetime], None] = None,
+        expected: Optional[Mapping[str, float]] = None,
+    ) -> Iterator[tuple[str, Optional[list[dict]]]]:
+        """
+        BaseCrawler.fetch_many + 저빈도 키워드 묶음 검색.
+
+        expected({keyword: 예상 신규 기사 수})가 있으면 워터마크가 있는 키워드 중
+        기사가 드문 것들을 OR 쿼리로 묶어 한 번에 검색하고, 결과를 키워드별로 나눠 내보냅니다.
+        """
+        keywords = list(keywords)
+        since_of = since.get if isinstance(since, Mapping) else (lambda _kw: since)
+        if not NAVER_PACK_ENABLED or not expected:
+            yield from super().fetch_many(keywords, since=since)
+            return
+
+        # 워터마크가 없는 키워드는 첫 페이지만 읽으므로 묶지 않습니다. (묶으면 30건을 나눠 가짐)
+        packable = {k: v for k, v in expected.items() if since_of(k) is not None}
+        groups, singles = pack_keywords(keywords, packable)
+        if groups:
+            packed = sum(len(g) for g in groups)
+            print(f"📦 묶음 검색: 키워드 {packed}개 → OR 쿼리 {len(groups)}개 (개별 검색 {len(singles)}개)")
+
+        calls = [partial(self._fetch_group, g, since_of) for g in groups]
+        calls += [partial(self._fetch_one, kw, since_of(kw)) for kw in singles]
+        for results in self._run_bounded(calls):
+            yield from results
+
+    def _fetch_one(self, keyword: str, since: Optional[datetime]) -> list[tuple[str, Optional[list[dict]]]]:
+        return [(keyword, self._fetch_safe(keyword, since))]
+
+    def _fetch_group(self, group: list[str], since_of) -> list[tuple[str, Optional[list[dict]]]]:
+        """OR 쿼리 1개로 묶음을 검색하고 키워드별로 나눕니다. 포화/실패/나눌 수 없는 기사가 있으면 키워드별로 다시 검색합니다."""
+        query = or_query(group)
+        oldest = min(since_of(kw) for kw in group)
+        try:
+            articles, complete = self._fetch_until(query, oldest, max_pages=PACK_MAX_PAGES)
+        except Exception as e:
+            print(f"⚠️ 묶음 검색 실패 → 개별 검색 ({query}): {e}")
+            complete = False
+        else:
+            if not complete:
+                print(f"⚠️ 묶음 검색 결과 포화 → 개별 검색 ({query})")
+
+        if not complete:
+            return [(kw, self._fetch_safe(kw, since_of(kw))) for kw in group]
+
+        by_keyword, unmatched = attribute(articles, group)
+        if unmatched:
+            # 본문에서만 키워드가 걸린 기사는 어느 키워드 몫인지 알 수 없습니다.
+            # 버리면 워터마크가 그 기사를 지나 다시는 못 가져오므로, 포화와 같이 키워드별로 다시 검색합니다.
+            print(f"⚠️ 묶음 검색에서 키워드를 찾지 못한 기사 {unmatched}건 → 개별 검색 ({query})")
+            return [(kw, self._fetch_safe(kw, since_of(kw))) for kw in group]
+        out = []
+        for kw in group:
+            mark = since_of(kw)
+            if mark.tzinfo is None:
+                mark = mark.replace(tzinfo=timezone.utc)
+            out.append((kw, [a for a in by_keyword[kw] if a["published_at"] > mark]))
+        return out
+
+    def _fetch_page(self, keyword: str, start: int, display: int) -> list[dict]:
+        """검색 결과 1페이지 (start번째부터 display건)"""
         headers = {
             "X-Naver-Client-Id":     NAVER_CLIENT_ID,
             "X-Naver-Client-Secret": NAVER_CLIENT_SECRET
@@ -49,20 +205,34 @@ class NaverNewsCrawler(BaseCrawler):
 
         params = {
             "query":   keyword,
-            "display": 30,      # 한 번에 최대 30건 수집 (API 최대값)
+            "display": display,
+            "start":   start,
             "sort":    "date"   # 최신 기사 우선 정렬
         }
 
-        response = requests.get(self.NAVER_URL, headers=headers, params=params, timeout=10)
-        data = response.json()
+        self._limiter.acquire()
+        response = self._session.get(self.NAVER_URL, headers=headers, params=params, timeout=10)
+        # 429(호출 한도)/오류 응답을 빈 마지막 페이지로 오인하지 않도록 예외로 올립니다.
+        # (묶음 검색은 이 예외를 보고 키워드별 검색으로 넘어감)
+        try:
+            data = response.json()
+        except ValueError:
+            data = {}
+        if response.status_code != 200 or data.get("errorCode"):
+            raise RuntimeError(
+                f"네이버 검색 API 오류 {response.status_code} {data.get('errorCode', '')}: "
+                f"{data.get('errorMessage') or response.text[:200]}"
+            )
 
         articles = []
         for item in data.get("items", []):
             articles.append({
                 "title":        _clean_html(item.get("title", "")),        # 메모리 분석용 (DB 저장 안 함)
                 "description":  _clean_html(item.get("description", "")),  # 메모리 분석용 (DB 저장 안 함)
-                "url":          item.get("link"),
+                "url":          pick_article_url(item.get("link"), item.get("originallink")),  # 정규화 URL
+                "original_url": item.get("originallink") or "",
+                "link":         item.get("link") or "",  # 정규화 전 네이버 link (정규화 이전에 저장된 기사 확인용)
                 "published_at": datetime.strptime(item["pubDate"], "%a, %d %b %Y %H:%M:%S %z")
             })
 
-        return articles
\ No newline at end of file
+        return articles
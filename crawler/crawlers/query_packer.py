@@ -0,0 +1,160 @@
+"""
+crawlers/query_packer.py — 저빈도 키워드 묶음 검색 (OR 쿼리)
+
+역할:
+    - 기사가 드문 키워드 여러 개를 네이버 검색 OR 쿼리("A | B | C") 하나로 묶어 검색 횟수를 줄입니다.
+      (고객사 이름처럼 하루 몇 건 안 나오는 키워드가 대부분이라 키워드마다 1회씩 부르면 호출 대부분이 빈 결과)
+    - 묶음 검색 결과는 제목+요약에서 각 키워드가 나오는지 보고 키워드별로 다시 나눕니다.
+      (Aho-Corasick 다중 문자열 검색 — 기사 한 건을 한 번만 훑어 묶음 안 모든 키워드를 찾음)
+
+묶는 조건:
+    - 공백/검색 연산자가 없는 키워드만 (여러 단어 키워드는 OR 우선순위가 모호해서 따로 검색)
+    - 묶음당 키워드 PACK_MAX_KEYWORDS개, 쿼리 길이 PACK_MAX_QUERY_LEN자 이하
+    - 묶음의 예상 신규 기사 수 합이 PACK_MAX_EXPECTED 이하 (결과 1페이지 안에 다 들어오도록)
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Iterable, Mapping
+
+PACK_MAX_KEYWORDS = 10
+PACK_MAX_QUERY_LEN = 100     # OR 쿼리 문자열 최대 길이 (구분자 " | " 포함)
+PACK_MAX_EXPECTED = 50.0     # 묶음 하나의 예상 신규 기사 수 상한 (display=100의 절반 — 예측이 빗나갈 여유)
+
+OR_SEPARATOR = " | "
+_OPERATOR_CHARS = set('|"+-')
+
+
+def _normalize(text: str) -> str:
+    # 대소문자/띄어쓰기 차이를 무시하고 비교합니다.
+    return "".join((text or "").lower().split())
+
+
+def packable(keyword: str) -> bool:
+    """OR 쿼리에 넣을 수 있는 키워드인지 (한 단어, 검색 연산자 없음)"""
+    keyword = (keyword or "").strip()
+    return (
+        len(keyword) >= 2
+        and len(keyword.split()) == 1
+        and not (_OPERATOR_CHARS & set(keyword))
+    )
+
+
+def or_query(group: Iterable[str]) -> str:
+    return OR_SEPARATOR.join(group)
+
+
+def pack_keywords(
+    keywords: Iterable[str],
+    expected: Mapping[str, float],
+    max_keywords: int = PACK_MAX_KEYWORDS,
+    max_query_len: int = PACK_MAX_QUERY_LEN,
+    max_expected: float = PACK_MAX_EXPECTED,
+) -> tuple[list[list[str]], list[str]]:
+    """
+    키워드를 OR 쿼리 묶음과 개별 검색으로 나눕니다.
+
+    expected: {키워드: 이번 검색에서 예상되는 신규 기사 수} — 없는 키워드는 개별 검색
+    반환값: (묶음 목록 — 각 2개 이상, 개별 검색 키워드 목록)
+
+    예상 기사 수가 큰 키워드부터 들어갈 수 있는 첫 묶음에 넣습니다. (first-fit decreasing)
+    """
+    singles: list[str] = []
+    candidates: list[str] = []
+    for kw in dict.fromkeys(keywords):
+        if kw in expected and packable(kw) and expected[kw] <= max_expected:
+            candidates.append(kw)
+        else:
+            singles.append(kw)
+
+    bins: list[list] = []  # [키워드 목록, 예상 기사 수 합, 쿼리 길이]
+    for kw in sorted(candidates, key=lambda k: expected[k], reverse=True):
+        size = float(expected[kw])
+        for b in bins:
+            length = b[2] + len(OR_SEPARATOR) + len(kw)
+            if len(b[0]) < max_keywords and b[1] + size <= max_expected and length <= max_query_len:
+                b[0].append(kw)
+                b[1] += size
+                b[2] = length
+                break
+        else:
+            bins.append([[kw], size, len(kw)])
+
+    groups = []
+    for members, _, _ in bins:
+        if len(members) >= 2:
+            groups.append(members)
+        else:
+            singles.extend(members)
+    return groups, singles
+
+
+class KeywordMatcher:
+    """여러 키워드를 한 번에 찾는 Aho-Corasick 자동자 (대소문자/공백 무시)"""
+
+    def __init__(self, keywords: Iterable[str]):
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[set[str]] = [set()]
+
+        for kw in keywords:
+            pattern = _normalize(kw)
+            if not pattern:
+                continue
+            node = 0
+            for ch in pattern:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(set())
+                node = nxt
+            self._out[node].add(kw)
+
+        # 실패 링크: 너비 우선으로, 현재 접두사의 가장 긴 접미사 노드를 가리킵니다.
+        pending = deque(self._goto[0].values())
+        while pending:
+            node = pending.popleft()
+            for ch, nxt in self._goto[node].items():
+                pending.append(nxt)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] |= self._out[self._fail[nxt]]
+
+    def find(self, text: str) -> set[str]:
+        """text에 나오는 키워드 집합"""
+        node = 0
+        found: set[str] = set()
+        for ch in _normalize(text):
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            if self._out[node]:
+                found |= self._out[node]
+        return found
+
+
+def attribute(articles: Iterable[dict], group: list[str]) -> tuple[dict[str, list[dict]], int]:
+    """
+    묶음 검색 결과를 키워드별로 나눕니다.
+    반환값: ({키워드: 기사 목록}, 어느 키워드도 찾지 못한 기사 수)
+
+    제목/요약에 키워드가 없는 기사(본문에서만 걸린 기사)는 어느 키워드 몫인지 알 수 없어 어디에도 넣지 않고
+    개수만 돌려줍니다. (0이 아니면 호출 측이 키워드별로 다시 검색)
+    """
+    matcher = KeywordMatcher(group)
+    by_keyword: dict[str, list[dict]] = {kw: [] for kw in group}
+    unmatched = 0
+    for article in articles:
+        found = matcher.find(f"{article.get('title', '')} {article.get('description', '')}")
+        if not found:
+            unmatched += 1
+        for kw in found:
+            by_keyword[kw].append(article)
+    return by_keyword, unmatched
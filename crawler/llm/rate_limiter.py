@@ -0,0 +1,110 @@
+"""
+crawler/llm/rate_limiter.py
+
+OpenAI 호출용 분당 요청 수(RPM) / 분당 토큰 수(TPM) 제한기입니다.
+여러 스레드가 하나의 제한기를 공유합니다.
+
+- acquire(tokens): 요청 1회 + 예상 토큰만큼 버킷에 여유가 생길 때까지 대기
+- settle(estimated, actual): 응답의 실제 사용 토큰으로 TPM 버킷을 보정
+- on_rate_limited(retry_after): 429를 받으면 전체 요청을 잠시 멈추고 속도를 절반으로 낮춤
+- on_success(): 성공할 때마다 속도를 조금씩 원래대로 회복 (AIMD)
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from typing import Optional
+
+# 429 후 속도 조절
+MIN_RATE_FACTOR = 0.1       # 속도를 이 비율 아래로는 낮추지 않음
+RECOVER_STEP = 0.05         # 성공 1회마다 회복하는 비율
+BACKOFF_BASE_SEC = 1.0      # Retry-After가 없을 때 지수 백오프 기준 (연속 429마다 2배)
+BACKOFF_MAX_SEC = 60.0
+
+
+def estimate_tokens(text: str) -> int:
+    """토크나이저 없이 보수적으로 토큰 수를 추정합니다. (ASCII 4자 ≈ 1토큰, 한글 등 1자 ≈ 1토큰)"""
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return ascii_chars // 4 + (len(text) - ascii_chars) + 1
+
+
+class TokenRateLimiter:
+    """RPM/TPM 토큰 버킷. rpm/tpm이 0 이하이면 해당 제한은 끕니다."""
+
+    def __init__(self, rpm: float, tpm: float):
+        self._rpm = float(rpm)
+        self._tpm = float(tpm)
+        self._lock = threading.Lock()
+        self._factor = 1.0           # 429에 따라 낮아지는 속도 비율 (0.1 ~ 1.0)
+        self._req = self._rpm        # 남은 요청 수
+        self._tok = self._tpm        # 남은 토큰 수 (실사용 보정으로 음수가 될 수 있음)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0    # 429 이후 이 시각까지 모든 요청 대기
+        self._consecutive_429 = 0
+
+    @property
+    def factor(self) -> float:
+        return self._factor
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._updated = now
+        if self._rpm > 0:
+            cap = self._rpm * self._factor
+            self._req = min(cap, self._req + elapsed * cap / 60.0)
+        if self._tpm > 0:
+            cap = self._tpm * self._factor
+            self._tok = min(cap, self._tok + elapsed * cap / 60.0)
+
+    def acquire(self, tokens: int = 0) -> None:
+        # TPM보다 큰 요청 1건이 영원히 기다리지 않도록 상한을 둡니다.
+        tokens = min(float(tokens), self._tpm * MIN_RATE_FACTOR) if self._tpm > 0 else 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                wait = self._blocked_until - now
+                if wait <= 0:
+                    wait_req = (1 - self._req) / (self._rpm * self._factor / 60.0) if self._rpm > 0 else 0.0
+                    wait_tok = (tokens - self._tok) / (self._tpm * self._factor / 60.0) if self._tpm > 0 else 0.0
+                    wait = max(wait_req, wait_tok)
+                    if wait <= 0:
+                        if self._rpm > 0:
+                            self._req -= 1
+                        if self._tpm > 0:
+                            self._tok -= tokens
+                        return
+            time.sleep(wait)
+
+    def settle(self, estimated: int, actual: int) -> None:
+        """예상 토큰과 실제 사용 토큰의 차이만큼 TPM 버킷을 되돌리거나 더 차감합니다."""
+        if self._tpm <= 0:
+            return
+        with self._lock:
+            self._tok += float(estimated) - float(actual)
+
+    def on_success(self) -> None:
+        with self._lock:
+            self._consecutive_429 = 0
+            self._factor = min(1.0, self._factor + RECOVER_STEP)
+
+    def on_rate_limited(self, retry_after: Optional[float] = None) -> float:
+        """429 처리: 속도를 절반으로 낮추고 모든 요청을 잠시 멈춥니다. 대기 시간(초)을 반환합니다."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._consecutive_429 += 1
+            self._factor = max(MIN_RATE_FACTOR, self._factor * 0.5)
+            if self._rpm > 0:
+                self._req = min(self._req, self._rpm * self._factor)
+            if self._tpm > 0:
+                self._tok = min(self._tok, self._tpm * self._factor)
+
+            if retry_after is None or retry_after <= 0:
+                ceiling = min(BACKOFF_MAX_SEC, BACKOFF_BASE_SEC * (2 ** (self._consecutive_429 - 1)))
+                retry_after = random.uniform(ceiling / 2, ceiling)
+            delay = min(float(retry_after), BACKOFF_MAX_SEC)
+            self._blocked_until = max(self._blocked_until, now + delay)
+            return delay
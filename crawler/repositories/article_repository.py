@@ -6,8 +6,17 @@ article_repository.py
   반드시 이 파일을 통해 접근해야 함
 """
 
+from typing import Iterable, Mapping, Optional
+
 from .db import supabase
 
+# in.(...) 한 번에 넣을 URL 개수.
+# 뉴스 URL은 인코딩 후 100~200자라 50개면 쿼리스트링이 8KB 안쪽에 머뭅니다. (게이트웨이 URL 길이 제한)
+URL_IN_CHUNK_SIZE = 50
+
+# 배열 INSERT 한 번에 보낼 기사 row 수 (메타만 저장하므로 row가 작음)
+ARTICLE_INSERT_CHUNK_SIZE = 500
+
 
 def article_exists(url: str) -> bool:
     """
@@ -25,6 +34,93 @@ def article_exists(url: str) -> bool:
     return len(result.data) > 0
 
 
+def filter_new_urls(
+    urls: Iterable[str],
+    chunk_size: int = URL_IN_CHUNK_SIZE,
+    aliases: Optional[Mapping[str, Iterable[str]]] = None,
+) -> set[str]:
+    """
+    URL 목록 중 articles에 아직 없는 URL 집합을 반환합니다.
+    article_exists()를 URL마다 부르는 대신 in_("url", [...]) 조회 몇 번으로 확인합니다.
+
+    aliases: {url: [같은 기사의 다른 URL, ...]} — 별칭 중 하나라도 articles에 있으면 신규가 아닙니다.
+             (URL 정규화 이전에 원래 형태(네이버 link)로 저장된 기사를 알아보기 위함)
+    """
+    candidates = list(dict.fromkeys(u for u in urls if u))  # 순서 유지 + 중복 제거
+    aliases = {u: [a for a in (aliases or {}).get(u, ()) if a and a != u] for u in candidates}
+    lookup = list(dict.fromkeys([*candidates, *(a for alts in aliases.values() for a in alts)]))
+    existing: set[str] = set()
+
+    for i in range(0, len(lookup), chunk_size):
+        chunk = lookup[i:i + chunk_size]
+        result = (
+            supabase
+            .table("articles")
+            .select("url")
+            .in_("url", chunk)
+            .execute()
+        )
+        existing.update(row["url"] for row in (result.data or []))
+
+    return {u for u in candidates if u not in existing and not any(a in existing for a in aliases[u])}
+
+
+def get_article_ids_by_url(urls: Iterable[str], chunk_size: int = URL_IN_CHUNK_SIZE) -> dict[str, str]:
+    """URL 목록 중 articles에 있는 기사의 {url: id}를 반환합니다."""
+    candidates = list(dict.fromkeys(u for u in urls if u))
+    found: dict[str, str] = {}
+
+    for i in range(0, len(candidates), chunk_size):
+        chunk = candidates[i:i + chunk_size]
+        result = (
+            supabase
+            .table("articles")
+            .select("id, url")
+            .in_("url", chunk)
+            .execute()
+        )
+        found.update((row["url"], row["id"]) for row in (result.data or []))
+
+    return found
+
+
+def insert_articles_bulk(rows: list[dict], chunk_size: int = ARTICLE_INSERT_CHUNK_SIZE) -> dict[str, dict]:
+    """
+    기사 row 여러 건을 url 기준 ON CONFLICT DO NOTHING으로 한 번에 저장합니다.
+
+    반환값: {url: 저장된 row(id 포함)}
+        - 새로 INSERT된 row만 들어갑니다.
+        - 이미 있던 URL(다른 실행이 먼저 저장한 경우 포함)은 빠지므로 호출 측은 건너뛰면 됩니다.
+    """
+    saved: dict[str, dict] = {}
+    for i in range(0, len(rows), chunk_size):
+        chunk = rows[i:i + chunk_size]
+        result = (
+            supabase
+            .table("articles")
+            .upsert(chunk, on_conflict="url", ignore_duplicates=True)
+            .execute()
+        )
+        for row in result.data or []:
+            saved[row["url"]] = row
+    return saved
+
+
+def insert_article_duplicates(rows: list[dict]) -> None:
+    """
+    유사 기사 묶음의 멤버 기사를 기록합니다.
+    rows: [{"article_id", "representative_id", "distance"}] — article_id 충돌 시 무시
+    """
+    if not rows:
+        return
+    (
+        supabase
+        .table("article_duplicates")
+        .upsert(rows, on_conflict="article_id", ignore_duplicates=True, returning="minimal")
+        .execute()
+    )
+
+
 def insert_article(data: dict):
     """
     기사 데이터 insert
@@ -8,14 +8,49 @@ db.py
 pydantic_core 등으로 SDK import가 깨져 있으면 Supabase REST(PostgREST)로 폴백합니다.
 
 외부에서 사용할 것은 `supabase` 객체 하나입니다.
+
+REST 폴백 경로는 keep-alive 커넥션 풀(_PooledHttp)을 재사용합니다.
+DART 워커들이 asyncio.to_thread로 같은 싱글톤을 동시에 호출하므로
+풀은 스레드 간 공유가 가능해야 합니다. (SDK 경로는 SDK 내부 httpx 풀 사용)
+
+REST 경로의 429/5xx/네트워크 오류는 _RetryPolicy로 재시도하고(멱등 요청 + on_conflict 업서트만),
+백엔드가 계속 실패하면 _CircuitBreaker가 일정 시간 요청을 막고 CircuitOpenError로 즉시 실패시킵니다.
 """
 
 from __future__ import annotations
 
+import asyncio
+import random
+import threading
+import time
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Union
-
-from config import SUPABASE_URL, SUPABASE_KEY
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from config import (
+    SUPABASE_URL,
+    SUPABASE_KEY,
+    SUPABASE_POOL_SIZE,
+    SUPABASE_KEEPALIVE,
+    SUPABASE_HTTP2,
+    SUPABASE_TIMEOUT,
+    SUPABASE_ASYNC_CONCURRENCY,
+    SUPABASE_RETRY_MAX,
+    SUPABASE_RETRY_BASE_SEC,
+    SUPABASE_RETRY_MAX_SEC,
+    SUPABASE_BREAKER_THRESHOLD,
+    SUPABASE_BREAKER_COOLDOWN_SEC,
+)
+from repositories.db_metrics import metrics, record_http
+
+# Prefer 헤더 허용 값 (PostgREST)
+_RETURN_METHODS = ("representation", "minimal")
+_COUNT_METHODS = ("exact", "planned", "estimated")
+
+# 스트리밍 조회(iter_pages / stream / stream_rows) 기본 페이지 크기.
+# PostgREST max-rows(Supabase 기본 1000) 이하로 두어야 페이지가 잘리지 않습니다.
+DEFAULT_PAGE_SIZE = 1000
 
 
 def _require_requests():
@@ -26,77 +61,382 @@ def _require_requests():
         raise RuntimeError("requests가 필요합니다. `pip install requests` 후 다시 실행하세요.") from e
 
 
+class _PooledHttp:
+    """
+    스레드 간 공유되는 keep-alive HTTP 커넥션 풀.
+
+    - 기본: requests.Session + HTTPAdapter (urllib3 커넥션 풀은 스레드 안전)
+    - http2=True: httpx.Client(http2=True) 사용. httpx/h2가 없으면 requests로 폴백합니다.
+
+    풀 적중/미스 통계:
+        requests  = 전송한 요청 수
+        misses    = 새로 연 TCP 커넥션 수 (핸드셰이크 발생)
+        hits      = requests - misses (기존 커넥션 재사용)
+    """
+
+    def __init__(self, pool_size: int, keepalive: bool, http2: bool, timeout: int):
+        self._timeout = timeout
+        self._keepalive = keepalive
+        self._lock = threading.Lock()
+        self._requests_sent = 0
+        self._h2_connections = 0
+        self._adapter = None
+        self._client: Any = None
+        self.transport = "requests"
+
+        if http2:
+            try:
+                import httpx  # type: ignore
+                import h2  # type: ignore  # noqa: F401  (httpx의 HTTP/2 지원에 필요)
+
+                self._client = httpx.Client(
+                    http2=True,
+                    timeout=timeout,
+                    limits=httpx.Limits(
+                        max_connections=pool_size,
+                        max_keepalive_connections=pool_size if keepalive else 0,
+                    ),
+                )
+                self.transport = "httpx-h2"
+            except Exception:
+                print("⚠️ SUPABASE_HTTP2=1 이지만 httpx[http2]가 없어 requests(HTTP/1.1)로 폴백합니다.")
+
+        if self._client is None:
+            requests = _require_requests()
+            session = requests.Session()
+            self._adapter = requests.adapters.HTTPAdapter(
+                pool_connections=4,        # 호스트별 풀 개수 (Supabase 1개 호스트면 충분)
+                pool_maxsize=pool_size,    # 호스트당 유지할 커넥션 수
+            )
+            session.mount("https://", self._adapter)
+            session.mount("http://", self._adapter)
+            self._client = session
+
+    def _trace(self, event_name: str, info: Dict[str, Any]) -> None:
+        # httpcore trace 훅: 새 TCP 커넥션이 열릴 때만 카운트합니다.
+        if event_name == "connection.connect_tcp.complete":
+            with self._lock:
+                self._h2_connections += 1
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        params: Any,
+        json: Any,
+    ):
+        if not self._keepalive:
+            headers = {**headers, "Connection": "close"}
+
+        with self._lock:
+            self._requests_sent += 1
+
+        if self.transport == "httpx-h2":
+            return self._client.request(
+                method,
+                url,
+                headers=headers,
+                params=params,
+                json=json,
+                extensions={"trace": self._trace},
+            )
+
+        return self._client.request(
+            method=method,
+            url=url,
+            headers=headers,
+            params=params,
+            json=json,
+            timeout=self._timeout,
+        )
+
+    def _connections_opened(self) -> int:
+        if self.transport == "httpx-h2":
+            return self._h2_connections
+        pools = self._adapter.poolmanager.pools
+        return sum(pools[k].num_connections for k in pools.keys())
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            sent = self._requests_sent
+        misses = min(self._connections_opened(), sent)
+        hits = sent - misses
+        return {
+            "transport":   self.transport,
+            "requests":    sent,
+            "pool_hits":   hits,
+            "pool_misses": misses,
+            "hit_rate":    round(hits / sent, 4) if sent else 0.0,
+        }
+
+    def close(self) -> None:
+        self._client.close()
+
+
+class SupabaseRestError(RuntimeError):
+    """PostgREST가 4xx/5xx를 반환했을 때. (기존 RuntimeError 처리와 호환)"""
+
+    def __init__(self, status: int, body: str, retry_after: Optional[float] = None):
+        super().__init__(f"Supabase REST error {status}: {body[:500]}")
+        self.status = status
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(RuntimeError):
+    """서킷 브레이커가 열려 있어 요청을 보내지 않고 즉시 실패했을 때."""
+
+
+# 재시도 대상 HTTP 상태 (일시적 오류)
+_RETRY_STATUS = frozenset({408, 429, 500, 502, 503, 504})
+
+# 그대로 다시 보내도 결과가 같은 메서드.
+# PostgREST PATCH는 컬럼을 고정 값으로 SET 하므로(증감 연산 없음) 반복해도 결과가 같습니다.
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "PATCH", "DELETE"})
+
+
+def _is_replayable(method: str, table: str, on_conflict: Optional[str]) -> bool:
+    # POST는 on_conflict가 있는 업서트만 재전송합니다. (insert / rpc는 중복 실행 위험)
+    if method in _IDEMPOTENT_METHODS:
+        return True
+    return method == "POST" and bool(on_conflict) and not table.startswith("rpc/")
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After 헤더 (초 또는 HTTP-date) → 대기 초"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except Exception:
+        return None
+
+
+class _RetryPolicy:
+    """지터가 들어간 지수 백오프. Retry-After가 있으면 그 값을 우선합니다."""
+
+    def __init__(
+        self,
+        max_retries: int = SUPABASE_RETRY_MAX,
+        base_sec: float = SUPABASE_RETRY_BASE_SEC,
+        max_sec: float = SUPABASE_RETRY_MAX_SEC,
+    ):
+        self.max_retries = max(0, int(max_retries))
+        self.base_sec = max(0.0, float(base_sec))
+        self.max_sec = max(0.0, float(max_sec))
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        if retry_after is not None:
+            return min(self.max_sec, retry_after)
+        # full jitter: [0, base * 2^attempt] 범위에서 균등 분포 (동시 재시도 몰림 방지)
+        return random.uniform(0.0, min(self.max_sec, self.base_sec * (2 ** attempt)))
+
+    def next_delay(self, attempt: int, replayable: bool, r: Any = None) -> Optional[float]:
+        """
+        다시 보낼지 판단합니다. 재시도하면 대기 초, 아니면 None.
+        r=None 은 네트워크 예외(응답 없음)를 뜻합니다.
+        """
+        if not replayable or attempt >= self.max_retries:
+            return None
+        if r is None:
+            return self.delay(attempt)
+        if r.status_code not in _RETRY_STATUS:
+            return None
+        return self.delay(attempt, _parse_retry_after(r.headers.get("Retry-After")))
+
+
+class _CircuitBreaker:
+    """
+    연속 실패(5xx/네트워크 오류)가 threshold번이면 OPEN → cooldown 동안 요청을 보내지 않고 즉시 실패.
+    cooldown이 지나면 요청 1건만 시험 삼아 통과(half-open)시키고, 성공하면 CLOSED로 복귀합니다.
+
+    백엔드가 내려가 있을 때 워커가 타임아웃(수십 초)을 요청마다 기다리지 않게 합니다.
+    동기/비동기 클라이언트가 같은 백엔드를 보므로 모듈 전역 인스턴스를 공유합니다.
+    """
+
+    def __init__(self, threshold: int = SUPABASE_BREAKER_THRESHOLD, cooldown_sec: float = SUPABASE_BREAKER_COOLDOWN_SEC):
+        self.threshold = int(threshold)
+        self.cooldown_sec = float(cooldown_sec)
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+
+    def before_request(self) -> bool:
+        """요청 전 호출. 이 요청이 half-open 시험 요청이면 True (끝나면 반드시 end_probe() 호출)."""
+        if self.threshold <= 0:
+            return False
+        with self._lock:
+            if self._opened_at is None:
+                return False
+            remaining = self.cooldown_sec - (time.monotonic() - self._opened_at)
+            if remaining > 0 or self._probing:
+                raise CircuitOpenError(
+                    f"Supabase 서킷 브레이커 OPEN (연속 실패 {self._failures}회) — 요청을 보내지 않았습니다."
+                )
+            self._probing = True  # half-open: 이 요청 1건만 통과
+            return True
+
+    def end_probe(self) -> None:
+        """
+        시험 요청이 끝났을 때 호출합니다. (finally에서)
+        record()로 결과가 반영되지 않은 채 끝난 경우(CancelledError, KeyboardInterrupt 등)에도
+        half-open 상태가 풀려 다음 요청이 다시 시험할 수 있게 합니다.
+        """
+        with self._lock:
+            self._probing = False
+
+    def record(self, ok: bool) -> None:
+        """ok=False: 5xx 또는 네트워크 예외. 4xx/429는 백엔드가 살아 있으므로 ok=True."""
+        if self.threshold <= 0:
+            return
+        with self._lock:
+            if ok:
+                if self._opened_at is not None:
+                    print("🔌 Supabase 서킷 브레이커 CLOSED (복구 확인)")
+                self._failures = 0
+                self._opened_at = None
+                self._probing = False
+                return
+
+            self._failures += 1
+            if self._probing or (self._opened_at is None and self._failures >= self.threshold):
+                if not self._probing:
+                    print(
+                        f"🔌 Supabase 서킷 브레이커 OPEN (연속 실패 {self._failures}회) "
+                        f"— {self.cooldown_sec:.0f}초간 즉시 실패 처리"
+                    )
+                self._opened_at = time.monotonic()
+                self._probing = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            return "half-open" if self._probing else "open"
+
+
+_breaker = _CircuitBreaker()
+
+
 @dataclass
 class _ExecResult:
     data: Any
     count: Optional[int] = None
 
 
+def _in_list(values: List[Any]) -> str:
+    def _fmt(v: Any) -> str:
+        if isinstance(v, str):
+            return f'"{v}"'
+        return str(v)
+
+    return "(" + ",".join(_fmt(v) for v in values) + ")"
+
+
 class _NotProxy:
+    """query.not_.<op>(...) → 'col=not.<op>.<값>' 필터를 추가합니다."""
+
     def __init__(self, q: "_TableQuery"):
         self._q = q
 
+    def _add(self, col: str, op: str, val: Any) -> "_TableQuery":
+        return self._q._add_filter(col, f"not.{op}.{val}")
+
     def is_(self, col: str, val: str) -> "_TableQuery":
-        self._q._params[col] = f"not.is.{val}"
-        return self._q
+        return self._add(col, "is", val)
+
+    def eq(self, col: str, val: Any) -> "_TableQuery":
+        return self._add(col, "eq", val)
+
+    def in_(self, col: str, values: List[Any]) -> "_TableQuery":
+        return self._add(col, "in", _in_list(values))
 
 
 class _TableQuery:
+    """
+    PostgREST 쿼리 빌더 (supabase SDK 빌더의 부분 호환).
+
+    - _params : select / order / limit / offset 같은 수식자 (키당 1개)
+    - _filters: (컬럼, '연산자.값') 목록. 같은 컬럼에 여러 조건을 걸면 모두 유지되어
+                반복 쿼리 파라미터로 전송되고 PostgREST에서 AND로 결합됩니다.
+                예) .gte("created_at", a).lte("created_at", b)
+                    → ?created_at=gte.a&created_at=lte.b
+    """
+
     def __init__(self, client: "_RestSupabaseClient", table: str):
         self._c = client
         self._table = table
         self._method = "GET"
         self._params: Dict[str, str] = {}
+        self._filters: List[Tuple[str, str]] = []
         self._payload: Any = None
         self._prefer: List[str] = []
         self._on_conflict: Optional[str] = None
         self.not_ = _NotProxy(self)
 
-    def select(self, columns: str = "*") -> "_TableQuery":
-        self._method = "GET"
+    def _add_filter(self, col: str, expr: str) -> "_TableQuery":
+        self._filters.append((col, expr))
+        return self
+
+    def _set_count(self, count: Optional[str]) -> None:
+        self._prefer = [p for p in self._prefer if not p.startswith("count=")]
+        if count:
+            if count not in _COUNT_METHODS:
+                raise ValueError(f"count는 {_COUNT_METHODS} 중 하나여야 합니다: {count}")
+            self._prefer.append(f"count={count}")
+
+    def _set_write(self, method: str, payload: Any, returning: str, count: Optional[str]) -> None:
+        if returning not in _RETURN_METHODS:
+            raise ValueError(f"returning은 {_RETURN_METHODS} 중 하나여야 합니다: {returning}")
+        self._method = method
+        self._payload = payload
+        self._prefer = [f"return={returning}"]
+        self._set_count(count)
+
+    def _query_params(self) -> List[Tuple[str, str]]:
+        return list(self._filters) + list(self._params.items())
+
+    def select(self, columns: str = "*", count: Optional[str] = None, head: bool = False) -> "_TableQuery":
+        """
+        count: "exact" | "planned" | "estimated" → 결과의 .count에 전체 건수를 채웁니다.
+        head : True면 HEAD 요청으로 row 없이 건수만 조회합니다. (큐 깊이 확인용)
+        """
+        self._method = "HEAD" if head else "GET"
         self._params["select"] = columns
+        self._set_count(count)
         return self
 
     def eq(self, col: str, val: Any) -> "_TableQuery":
-        self._params[col] = f"eq.{val}"
-        return self
+        return self._add_filter(col, f"eq.{val}")
 
     def gte(self, col: str, val: Any) -> "_TableQuery":
-        self._params[col] = f"gte.{val}"
-        return self
+        return self._add_filter(col, f"gte.{val}")
 
     def lte(self, col: str, val: Any) -> "_TableQuery":
-        self._params[col] = f"lte.{val}"
-        return self
+        return self._add_filter(col, f"lte.{val}")
 
     def lt(self, col: str, val: Any) -> "_TableQuery":
-        self._params[col] = f"lt.{val}"
-        return self
+        return self._add_filter(col, f"lt.{val}")
 
     def gt(self, col: str, val: Any) -> "_TableQuery":
-        self._params[col] = f"gt.{val}"
-        return self
+        return self._add_filter(col, f"gt.{val}")
 
     def is_(self, col: str, val: str) -> "_TableQuery":
-        self._params[col] = f"is.{val}"
-        return self
+        return self._add_filter(col, f"is.{val}")
 
     def in_(self, col: str, values: List[Any]) -> "_TableQuery":
-        def _fmt(v: Any) -> str:
-            if isinstance(v, str):
-                return f'"{v}"'
-            return str(v)
-
-        inner = ",".join(_fmt(v) for v in values)
-        self._params[col] = f"in.({inner})"
-        return self
+        return self._add_filter(col, f"in.{_in_list(values)}")
 
     def or_(self, expr: str) -> "_TableQuery":
         e = expr.strip()
         if not (e.startswith("(") and e.endswith(")")):
             e = f"({e})"
-        self._params["or"] = e
-        return self
+        return self._add_filter("or", e)
 
     def order(self, col: str, desc: bool = False) -> "_TableQuery":
         self._params["order"] = f"{col}.{'desc' if desc else 'asc'}"
@@ -106,16 +446,113 @@ class _TableQuery:
         self._params["limit"] = str(int(n))
         return self
 
-    def insert(self, payload: Union[Dict[str, Any], List[Dict[str, Any]]]) -> "_TableQuery":
-        self._method = "POST"
-        self._payload = payload
-        self._prefer = ["return=representation"]
+    def range(self, start: int, end: int) -> "_TableQuery":
+        """SDK의 .range(start, end)와 동일 (양끝 포함). offset/limit 파라미터로 변환합니다."""
+        self._params["offset"] = str(int(start))
+        self._params["limit"] = str(int(end) - int(start) + 1)
         return self
 
-    def update(self, payload: Dict[str, Any]) -> "_TableQuery":
-        self._method = "PATCH"
-        self._payload = payload
-        self._prefer = ["return=representation"]
+    def _clone(self) -> "_TableQuery":
+        q = type(self)(self._c, self._table)
+        q._method = self._method
+        q._params = dict(self._params)
+        q._filters = list(self._filters)
+        q._payload = self._payload
+        q._prefer = list(self._prefer)
+        q._on_conflict = self._on_conflict
+        return q
+
+    def _paging_base(self, key: Optional[str]) -> Tuple["_TableQuery", Optional[int], int]:
+        # 페이지네이션 기준 쿼리: 사용자 limit/offset은 떼어내 전체 상한/시작점으로만 사용합니다.
+        total_cap = int(self._params["limit"]) if "limit" in self._params else None
+        base_offset = int(self._params.get("offset") or 0)
+
+        base = self._clone()
+        base._params.pop("limit", None)
+        base._params.pop("offset", None)
+        base._set_count(None)  # 페이지마다 전체 건수를 다시 세지 않도록
+
+        if key:
+            cols = base._params.get("select", "*")
+            if cols.strip() != "*" and key not in [c.strip() for c in cols.split(",")]:
+                base._params["select"] = f"{cols},{key}"
+            base._params["order"] = f"{key}.asc"
+
+        return base, total_cap, base_offset
+
+    def _page_query(
+        self,
+        page_size: int,
+        key: Optional[str],
+        total_cap: Optional[int],
+        base_offset: int,
+        read: int,
+        last_key: Any,
+    ) -> "_TableQuery":
+        size = max(1, int(page_size))
+        if total_cap is not None:
+            size = min(size, total_cap - read)
+
+        q = self._clone()
+        if key:
+            if last_key is not None:
+                q.gt(key, last_key)
+            q.limit(size)
+        else:
+            q.range(base_offset + read, base_offset + read + size - 1)
+        return q
+
+    def iter_pages(self, page_size: int = DEFAULT_PAGE_SIZE, key: Optional[str] = None) -> Iterator[List[Dict[str, Any]]]:
+        """
+        SELECT 결과를 페이지(list) 단위로 지연 조회합니다. (max-rows 제한 우회)
+
+        - key 지정: keyset 페이지네이션 (key 오름차순 + key > 마지막 값)
+                    → 유니크 컬럼(id 등)을 권장. select에 key가 없으면 자동 추가합니다.
+        - key 없음: offset 페이지네이션 (기존 order 유지, 안정적인 정렬을 위해 order 지정 권장)
+
+        서버 max-rows가 page_size보다 작아도 빠짐없이 읽도록, 빈 페이지가 나올 때까지 진행합니다.
+        기존에 .limit(n)이 걸려 있으면 전체 n건까지만 읽습니다.
+        """
+        base, total_cap, base_offset = self._paging_base(key)
+        read = 0
+        last_key: Any = None
+
+        while total_cap is None or read < total_cap:
+            q = base._page_query(page_size, key, total_cap, base_offset, read, last_key)
+            rows = q.execute().data or []
+            if not rows:
+                return
+
+            read += len(rows)
+            if key:
+                last_key = rows[-1].get(key)
+            yield rows
+
+    def stream(self, page_size: int = DEFAULT_PAGE_SIZE, key: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """iter_pages()의 row 단위 버전. 메모리에는 한 페이지만 유지됩니다."""
+        for page in self.iter_pages(page_size=page_size, key=key):
+            yield from page
+
+    # 쓰기 메서드의 returning/count 인자는 SDK와 같습니다.
+    # - returning="minimal": 변경된 row를 응답으로 받지 않습니다. (결과 .data를 읽지 않는 쓰기에 사용)
+    # - count="exact": 영향받은 row 수를 .count로 받습니다. (returning="minimal"과 함께 사용 가능)
+
+    def insert(
+        self,
+        payload: Union[Dict[str, Any], List[Dict[str, Any]]],
+        count: Optional[str] = None,
+        returning: str = "representation",
+    ) -> "_TableQuery":
+        self._set_write("POST", payload, returning, count)
+        return self
+
+    def update(
+        self,
+        payload: Dict[str, Any],
+        count: Optional[str] = None,
+        returning: str = "representation",
+    ) -> "_TableQuery":
+        self._set_write("PATCH", payload, returning, count)
         return self
 
     def upsert(
@@ -123,24 +560,24 @@ class _TableQuery:
         payload: Union[Dict[str, Any], List[Dict[str, Any]]],
         on_conflict: Optional[str] = None,
         ignore_duplicates: bool = False,
+        count: Optional[str] = None,
+        returning: str = "representation",
     ) -> "_TableQuery":
-        self._method = "POST"
-        self._payload = payload
+        self._set_write("POST", payload, returning, count)
         resolution = "ignore-duplicates" if ignore_duplicates else "merge-duplicates"
-        self._prefer = ["return=representation", f"resolution={resolution}"]
+        self._prefer.append(f"resolution={resolution}")
         self._on_conflict = on_conflict
         return self
 
-    def delete(self) -> "_TableQuery":
-        self._method = "DELETE"
-        self._prefer = ["return=representation"]
+    def delete(self, count: Optional[str] = None, returning: str = "representation") -> "_TableQuery":
+        self._set_write("DELETE", None, returning, count)
         return self
 
     def execute(self) -> _ExecResult:
         return self._c._execute(
             table=self._table,
             method=self._method,
-            params=self._params,
+            params=self._query_params(),
             payload=self._payload,
             prefer=self._prefer,
             on_conflict=self._on_conflict,
@@ -148,25 +585,49 @@ class _TableQuery:
 
 
 class _RestSupabaseClient:
-    def __init__(self, url: str, key: str):
+    def __init__(
+        self,
+        url: str,
+        key: str,
+        pool_size: int = SUPABASE_POOL_SIZE,
+        keepalive: bool = SUPABASE_KEEPALIVE,
+        http2: bool = SUPABASE_HTTP2,
+        timeout: int = SUPABASE_TIMEOUT,
+        retry: Optional[_RetryPolicy] = None,
+        breaker: Optional[_CircuitBreaker] = None,
+    ):
         if not url or not key:
             raise RuntimeError("SUPABASE_URL / SUPABASE_KEY 환경변수가 필요합니다.")
         self._url = url.rstrip("/")
         self._key = key
-        self._requests = _require_requests()
+        self._http = _PooledHttp(pool_size=pool_size, keepalive=keepalive, http2=http2, timeout=timeout)
+        self._retry = retry or _RetryPolicy()
+        self._breaker = breaker or _breaker
 
     def table(self, name: str) -> _TableQuery:
         return _TableQuery(self, name)
 
-    def _execute(
+    def rpc(self, fn: str, params: Optional[Dict[str, Any]] = None) -> _TableQuery:
+        """
+        SDK의 supabase.rpc(fn, params)와 동일. POST /rest/v1/rpc/<fn> 으로 DB 함수를 호출합니다.
+        (함수 정의는 crawler/sql/*.sql)
+
+            rows = supabase.rpc("aggregate_signal_trends", {"p_since": since}).execute().data
+        """
+        q = self.table(f"rpc/{fn}")
+        q._method = "POST"
+        q._payload = params or {}
+        return q
+
+    def _prepare(
         self,
         table: str,
         method: str,
-        params: Dict[str, str],
-        payload: Any,
+        params: List[Tuple[str, str]],
         prefer: List[str],
         on_conflict: Optional[str],
-    ) -> _ExecResult:
+    ) -> Tuple[str, Dict[str, str], Optional[List[Tuple[str, str]]]]:
+        """요청 URL / 헤더 / 쿼리 파라미터를 만듭니다. (동기·비동기 클라이언트 공용)"""
         url = f"{self._url}/rest/v1/{table}"
 
         headers = {
@@ -179,39 +640,352 @@ class _RestSupabaseClient:
         if method in ("POST", "PATCH"):
             headers["Content-Type"] = "application/json"
 
-        qparams = dict(params) if params else {}
+        # 같은 키가 반복될 수 있으므로 (키, 값) 목록으로 전달합니다.
+        qparams = list(params) if params else []
         if on_conflict:
-            qparams["on_conflict"] = on_conflict
-
-        r = self._requests.request(
-            method=method,
-            url=url,
-            headers=headers,
-            params=qparams if qparams else None,
-            json=payload,
-            timeout=60,
-        )
-
+            qparams.append(("on_conflict", on_conflict))
+
+        return url, headers, (qparams if qparams else None)
+
+    @staticmethod
+    def _record(method: str, url: str, qparams: Any, r: Any, t0: float) -> None:
+        """요청 1건의 지연/용량을 db_metrics에 기록합니다. (r=None이면 네트워크 예외)"""
+        if not metrics.enabled:
+            return
+        latency_ms = (time.perf_counter() - t0) * 1000.0
+        if r is None:
+            record_http(method, url, qparams or [], 0, latency_ms, 0, 0)
+            return
+        req = getattr(r, "request", None)
+        body = getattr(req, "body", None) if req is not None else None  # requests
+        if body is None and req is not None:
+            body = getattr(req, "content", None)                         # httpx
+        record_http(method, url, qparams or [], r.status_code, latency_ms, len(r.content or b""), len(body or b""))
+
+    @staticmethod
+    def _parse_count(r: Any) -> Optional[int]:
+        # Content-Range: "0-24/3573" / "*/42" → 3573 / 42 (Prefer: count=... 일 때만 숫자)
+        total = (r.headers.get("Content-Range") or "").rpartition("/")[2]
+        return int(total) if total.isdigit() else None
+
+    @classmethod
+    def _to_result(cls, r: Any) -> _ExecResult:
+        """HTTP 응답(requests/httpx 공통)을 _ExecResult로 변환합니다."""
         if r.status_code >= 400:
-            raise RuntimeError(f"Supabase REST error {r.status_code}: {r.text[:500]}")
+            raise SupabaseRestError(r.status_code, r.text, _parse_retry_after(r.headers.get("Retry-After")))
 
+        count = cls._parse_count(r)
         if not r.text:
-            return _ExecResult(data=[])
+            return _ExecResult(data=[], count=count)
 
         try:
             data = r.json()
         except Exception:
             data = r.text
 
-        return _ExecResult(data=data)
+        return _ExecResult(data=data, count=count)
+
+    def _execute(
+        self,
+        table: str,
+        method: str,
+        params: List[Tuple[str, str]],
+        payload: Any,
+        prefer: List[str],
+        on_conflict: Optional[str],
+    ) -> _ExecResult:
+        url, headers, qparams = self._prepare(table, method, params, prefer, on_conflict)
+        replayable = _is_replayable(method, table, on_conflict)
+
+        attempt = 0
+        while True:
+            probe = self._breaker.before_request()
+            t0 = time.perf_counter()
+            try:
+                r = self._http.request(
+                    method=method,
+                    url=url,
+                    headers=headers,
+                    params=qparams,
+                    json=payload,
+                )
+            except Exception:
+                self._record(method, url, qparams, None, t0)
+                self._breaker.record(ok=False)
+                wait = self._retry.next_delay(attempt, replayable)
+                if wait is None:
+                    raise
+            else:
+                self._record(method, url, qparams, r, t0)
+                self._breaker.record(ok=r.status_code < 500)
+                wait = self._retry.next_delay(attempt, replayable, r)
+                if wait is None:
+                    return self._to_result(r)
+            finally:
+                if probe:
+                    self._breaker.end_probe()
+
+            attempt += 1
+            time.sleep(wait)
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """커넥션 풀 적중/미스 통계를 반환합니다."""
+        return self._http.stats()
+
+    def close(self) -> None:
+        self._http.close()
+
+
+class _AsyncTableQuery(_TableQuery):
+    """
+    _TableQuery의 비동기 버전. 빌더 메서드는 그대로 쓰고 execute()만 await 합니다.
+
+        rows = (await db.table("signals").select("id").eq("source", "dart").execute()).data
+        async for row in db.table("signals").select("id").stream(key="id"): ...
+    """
+
+    async def execute(self) -> _ExecResult:  # type: ignore[override]
+        return await self._c._execute(
+            table=self._table,
+            method=self._method,
+            params=self._query_params(),
+            payload=self._payload,
+            prefer=self._prefer,
+            on_conflict=self._on_conflict,
+        )
+
+    async def iter_pages(  # type: ignore[override]
+        self, page_size: int = DEFAULT_PAGE_SIZE, key: Optional[str] = None
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """_TableQuery.iter_pages()와 동일한 규칙의 비동기 제너레이터."""
+        base, total_cap, base_offset = self._paging_base(key)
+        read = 0
+        last_key: Any = None
+
+        while total_cap is None or read < total_cap:
+            q = base._page_query(page_size, key, total_cap, base_offset, read, last_key)
+            rows = (await q.execute()).data or []
+            if not rows:
+                return
+
+            read += len(rows)
+            if key:
+                last_key = rows[-1].get(key)
+            yield rows
+
+    async def stream(  # type: ignore[override]
+        self, page_size: int = DEFAULT_PAGE_SIZE, key: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        async for page in self.iter_pages(page_size=page_size, key=key):
+            for row in page:
+                yield row
+
+
+class _AsyncRestSupabaseClient(_RestSupabaseClient):
+    """
+    httpx.AsyncClient 기반 PostgREST 클라이언트. (asyncio 워커 전용)
+
+    - asyncio.to_thread + 동기 싱글톤 대신 코루틴으로 직접 요청합니다.
+      (기본 스레드풀 크기가 숨은 동시성 한도가 되는 문제 해소)
+    - max_concurrency: 이 클라이언트로 동시에 나가는 요청 수 상한 (Semaphore)
+    - AsyncClient는 이벤트 루프에 묶이므로 asyncio.run() 안에서
+      async_supabase_client()로 만들고 닫습니다.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        key: str,
+        max_concurrency: int = SUPABASE_ASYNC_CONCURRENCY,
+        pool_size: int = SUPABASE_POOL_SIZE,
+        keepalive: bool = SUPABASE_KEEPALIVE,
+        http2: bool = SUPABASE_HTTP2,
+        timeout: int = SUPABASE_TIMEOUT,
+        retry: Optional[_RetryPolicy] = None,
+        breaker: Optional[_CircuitBreaker] = None,
+    ):
+        if not url or not key:
+            raise RuntimeError("SUPABASE_URL / SUPABASE_KEY 환경변수가 필요합니다.")
+        import httpx  # type: ignore
+
+        self._url = url.rstrip("/")
+        self._key = key
+        self._sem = asyncio.Semaphore(max(1, int(max_concurrency)))
+        self._retry = retry or _RetryPolicy()
+        self._breaker = breaker or _breaker
+        if http2:
+            try:
+                import h2  # type: ignore  # noqa: F401
+            except Exception:
+                print("⚠️ SUPABASE_HTTP2=1 이지만 h2가 없어 HTTP/1.1로 연결합니다.")
+                http2 = False
+        self._client = httpx.AsyncClient(
+            http2=http2,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=pool_size,
+                max_keepalive_connections=pool_size if keepalive else 0,
+            ),
+        )
+
+    def table(self, name: str) -> _AsyncTableQuery:
+        return _AsyncTableQuery(self, name)
+
+    async def _execute(  # type: ignore[override]
+        self,
+        table: str,
+        method: str,
+        params: List[Tuple[str, str]],
+        payload: Any,
+        prefer: List[str],
+        on_conflict: Optional[str],
+    ) -> _ExecResult:
+        url, headers, qparams = self._prepare(table, method, params, prefer, on_conflict)
+        replayable = _is_replayable(method, table, on_conflict)
+
+        attempt = 0
+        while True:
+            probe = self._breaker.before_request()
+            try:
+                # 백오프 대기 중에는 세마포어를 잡지 않습니다. (다른 요청이 진행되도록)
+                async with self._sem:
+                    t0 = time.perf_counter()
+                    try:
+                        r = await self._client.request(
+                            method,
+                            url,
+                            headers=headers,
+                            params=qparams,
+                            json=payload,
+                        )
+                    except Exception:
+                        r = None
+                        self._record(method, url, qparams, None, t0)
+                        self._breaker.record(ok=False)
+                        wait = self._retry.next_delay(attempt, replayable)
+                        if wait is None:
+                            raise
+                if r is not None:
+                    self._record(method, url, qparams, r, t0)
+                    self._breaker.record(ok=r.status_code < 500)
+                    wait = self._retry.next_delay(attempt, replayable, r)
+                    if wait is None:
+                        return self._to_result(r)
+            finally:
+                # CancelledError(gather/wait_for 취소) 등으로 record() 없이 끝나도 half-open을 풉니다.
+                if probe:
+                    self._breaker.end_probe()
+
+            attempt += 1
+            await asyncio.sleep(wait)
+
+    def pool_stats(self) -> Dict[str, Any]:
+        return {}
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+@asynccontextmanager
+async def async_supabase_client(
+    max_concurrency: int = SUPABASE_ASYNC_CONCURRENCY,
+) -> AsyncIterator[_AsyncRestSupabaseClient]:
+    """
+    비동기 워커용 Supabase 클라이언트를 열고 종료 시 커넥션을 정리합니다.
+
+        async with async_supabase_client() as db:
+            await db.table("dart_disclosures").update({...}).eq("rcept_no", no).execute()
+    """
+    client = _AsyncRestSupabaseClient(SUPABASE_URL, SUPABASE_KEY, max_concurrency=max_concurrency)
+    try:
+        yield client
+    finally:
+        await client.aclose()
+
+
+def _instrument_sdk(client: Any) -> Any:
+    """
+    SDK 경로 계측 래퍼: postgrest가 쓰는 httpx.Client에 event hook을 걸어
+    REST 폴백과 동일한 항목(method/table/필터 형태/status/bytes/latency)을 기록합니다.
+    SDK 내부 구조가 달라 훅을 걸 수 없으면 계측 없이 그대로 사용합니다.
+    """
+    if not metrics.enabled:
+        return client
+    try:
+        session = client.postgrest.session
+
+        def _on_request(request):
+            request.extensions["_t0"] = time.perf_counter()
+
+        def _on_response(response):
+            response.read()
+            req = response.request
+            t0 = req.extensions.get("_t0", time.perf_counter())
+            record_http(
+                req.method,
+                str(req.url),
+                None,
+                response.status_code,
+                (time.perf_counter() - t0) * 1000.0,
+                len(response.content or b""),
+                len(req.content or b""),
+            )
+
+        session.event_hooks["request"].append(_on_request)
+        session.event_hooks["response"].append(_on_response)
+    except Exception:
+        pass
+    return client
 
 
 def _create_supabase_client():
     try:
         from supabase import create_client  # type: ignore
-        return create_client(SUPABASE_URL, SUPABASE_KEY)
+        return _instrument_sdk(create_client(SUPABASE_URL, SUPABASE_KEY))
     except Exception:
         return _RestSupabaseClient(SUPABASE_URL, SUPABASE_KEY)
 
 
-supabase = _create_supabase_client()
\ No newline at end of file
+supabase = _create_supabase_client()
+
+
+def stream_rows(
+    build_query: Callable[[], Any],
+    page_size: int = DEFAULT_PAGE_SIZE,
+    key: str = "id",
+) -> Iterator[Dict[str, Any]]:
+    """
+    SDK / REST 폴백 공통 스트리밍 조회 헬퍼.
+
+    build_query: 필터까지 걸린 SELECT 쿼리를 새로 만들어 반환하는 함수
+                 예) lambda: supabase.table("signals").select("id, company_name").gte("created_at", since)
+    key        : keyset 페이지네이션 기준 유니크 컬럼 (select에 포함되어야 함)
+
+    REST 폴백이면 _TableQuery.stream()을 그대로 사용하고,
+    SDK 쿼리 빌더면 order(key) + gt(key, 마지막 값) + limit(page_size)로 페이지를 이어 읽습니다.
+    """
+    q = build_query()
+    if isinstance(q, _TableQuery):
+        yield from q.stream(page_size=page_size, key=key)
+        return
+
+    last_key: Any = None
+    while True:
+        q = build_query().order(key)
+        if last_key is not None:
+            q = q.gt(key, last_key)
+        rows = q.limit(page_size).execute().data or []
+        if not rows:
+            return
+        yield from rows
+        last_key = rows[-1][key]
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """
+    현재 싱글톤의 커넥션 풀 통계를 반환합니다.
+    SDK 경로(내부 httpx 풀)는 통계를 노출하지 않으므로 빈 dict를 반환합니다.
+    """
+    if isinstance(supabase, _RestSupabaseClient):
+        return supabase.pool_stats()
+    return {}
@@ -0,0 +1,184 @@
+"""
+db_metrics.py
+
+- DB(PostgREST) 요청 단위 지연/용량 계측 전용 파일
+- 호출 1건마다 (method, table, 필터 형태, status)를 키로 카운터와 지연 히스토그램을 누적합니다.
+- 엔트리포인트(run_news_hourly.py, run_dart_daily.py) 종료 시 print_db_metrics()로 요약을 출력합니다.
+
+필터 형태(filter shape)는 값은 버리고 컬럼/연산자만 남긴 문자열입니다.
+    예) select=id&url=eq.https://...  →  "url=eq"
+        created_at=gte.X&created_at=lte.Y&order=id.asc&limit=1000  →  "created_at=gte,created_at=lte,limit,order"
+
+운영에서 켜두어도 되도록 호출당 작업은 dict 갱신 몇 번으로 제한합니다.
+SUPABASE_METRICS=0 이면 계측을 끕니다.
+"""
+
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from config import SUPABASE_METRICS
+
+# 지연 히스토그램 버킷 상한 (ms). 마지막 버킷은 그 이상 전부.
+LATENCY_BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+# 쿼리 파라미터 중 값이 아니라 이름만 의미 있는 키 (or/and 논리식은 값 안에 컬럼과 값이 섞여 있어 이름만 남김)
+_SHAPE_ONLY_KEYS = {"select", "order", "limit", "offset", "on_conflict", "columns", "or", "and"}
+
+
+def filter_shape(params: Optional[Iterable[Tuple[str, Any]]]) -> str:
+    """쿼리 파라미터에서 값을 제거하고 '컬럼=연산자' 형태만 남깁니다."""
+    if not params:
+        return ""
+    parts: List[str] = []
+    for k, v in params:
+        if k in _SHAPE_ONLY_KEYS:
+            parts.append(k)
+            continue
+        sv = str(v)
+        op = sv.split(".", 1)[0]
+        if op == "not":
+            op = ".".join(sv.split(".", 2)[:2])  # not.is / not.eq ...
+        parts.append(f"{k}={op}")
+    return ",".join(sorted(parts))
+
+
+class _Stat:
+    __slots__ = ("count", "errors", "total_ms", "max_ms", "bytes_in", "bytes_out", "buckets")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def percentile(self, q: float) -> float:
+        """히스토그램 버킷 기준 근사 백분위수 (버킷 상한값 반환)."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= target:
+                return float(LATENCY_BUCKETS_MS[i]) if i < len(LATENCY_BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+
+class DbMetrics:
+    """프로세스 내 DB 요청 계측 저장소. 스레드/코루틴에서 동시에 호출해도 안전합니다."""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._stats: Dict[Tuple[str, str, str, int], _Stat] = {}
+
+    def record(
+        self,
+        method: str,
+        table: str,
+        shape: str,
+        status: int,
+        latency_ms: float,
+        bytes_in: int,
+        bytes_out: int,
+    ) -> None:
+        if not self.enabled:
+            return
+        key = (method, table, shape, int(status))
+        idx = bisect_left(LATENCY_BUCKETS_MS, latency_ms)
+        with self._lock:
+            st = self._stats.get(key)
+            if st is None:
+                st = self._stats[key] = _Stat()
+            st.count += 1
+            if status >= 400 or status == 0:
+                st.errors += 1
+            st.total_ms += latency_ms
+            if latency_ms > st.max_ms:
+                st.max_ms = latency_ms
+            st.bytes_in += bytes_in
+            st.bytes_out += bytes_out
+            st.buckets[idx] += 1
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """누적 통계를 총 소요시간 내림차순 list[dict]로 반환합니다."""
+        with self._lock:
+            items = list(self._stats.items())
+        rows = []
+        for (method, table, shape, status), st in items:
+            rows.append({
+                "method":    method,
+                "table":     table,
+                "shape":     shape,
+                "status":    status,
+                "count":     st.count,
+                "errors":    st.errors,
+                "total_ms":  round(st.total_ms, 1),
+                "avg_ms":    round(st.total_ms / st.count, 1) if st.count else 0.0,
+                "p50_ms":    st.percentile(0.50),
+                "p95_ms":    st.percentile(0.95),
+                "max_ms":    round(st.max_ms, 1),
+                "bytes_in":  st.bytes_in,
+                "bytes_out": st.bytes_out,
+            })
+        rows.sort(key=lambda r: r["total_ms"], reverse=True)
+        return rows
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+metrics = DbMetrics(enabled=SUPABASE_METRICS)
+
+
+def record_http(method: str, url: str, params: Any, status: int, latency_ms: float, bytes_in: int, bytes_out: int) -> None:
+    """
+    REST URL(/rest/v1/<table> 또는 /rest/v1/rpc/<fn>)과 파라미터로부터 table / 필터 형태를 뽑아 기록합니다.
+    params가 None이면 URL 쿼리스트링을 사용합니다. (SDK 훅 경로)
+    """
+    if not metrics.enabled:
+        return
+    parts = urlsplit(url)
+    path = parts.path
+    table = path.split("/rest/v1/", 1)[-1] if "/rest/v1/" in path else path
+    if params is None:
+        pairs = parse_qsl(parts.query, keep_blank_values=True)
+    elif isinstance(params, dict):
+        pairs = list(params.items())
+    else:
+        pairs = list(params)
+    metrics.record(method, table, filter_shape(pairs), status, latency_ms, bytes_in, bytes_out)
+
+
+def print_db_metrics(top: int = 15, pool_stats: Optional[Dict[str, Any]] = None) -> None:
+    """엔트리포인트 종료 시 DB 요청 요약을 출력합니다. (총 소요시간 상위 top개)"""
+    rows = metrics.snapshot()
+    if not rows:
+        return
+
+    total_calls = sum(r["count"] for r in rows)
+    total_ms = sum(r["total_ms"] for r in rows)
+    total_in = sum(r["bytes_in"] for r in rows)
+    total_out = sum(r["bytes_out"] for r in rows)
+
+    print("\n" + "=" * 50)
+    print("[DB Metrics] PostgREST 요청 요약")
+    print(f"  총 요청 {total_calls}회 / 누적 {total_ms / 1000:.1f}s / 수신 {total_in / 1024:.1f}KB / 송신 {total_out / 1024:.1f}KB")
+    if pool_stats:
+        print(f"  커넥션 풀: {pool_stats}")
+    print("-" * 50)
+    for r in rows[:top]:
+        print(
+            f"  {r['method']:<6} {r['table']:<28} [{r['shape'] or '-'}] {r['status']} "
+            f"x{r['count']} | total={r['total_ms']:.0f}ms avg={r['avg_ms']:.0f}ms "
+            f"p95≤{r['p95_ms']:.0f}ms max={r['max_ms']:.0f}ms | in={r['bytes_in']}B out={r['bytes_out']}B"
+        )
+    print("=" * 50)
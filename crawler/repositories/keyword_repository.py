@@ -13,7 +13,7 @@ import json
 from pathlib import Path
 from typing import List, Dict, Tuple, Optional
 
-from .db import supabase
+from .db import supabase, stream_rows
 
 
 # =========================
@@ -48,6 +48,19 @@ def get_customers() -> List[Dict]:
     return result.data or []
 
 
+def get_client_names() -> set[str]:
+    """
+    고객사(managed_clients) 회사명 집합.
+    수집 주기 계산(services/crawl_scheduler.py)에서 고객사 키워드를 더 자주 검색하는 데 씁니다.
+    """
+    try:
+        rows = stream_rows(lambda: supabase.table("managed_clients").select("id, company_name"), key="id")
+        return {(r.get("company_name") or "").strip() for r in rows if r.get("company_name")}
+    except Exception as e:
+        print(f"⚠️ 고객사 목록 조회 실패 (고객사 가중치 없이 진행): {e}")
+        return set()
+
+
 # =========================
 # 추가: 모니터링 키워드 로딩 로직
 # =========================
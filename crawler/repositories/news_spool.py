@@ -0,0 +1,205 @@
+"""
+news_spool.py
+
+- 뉴스 수집 실행의 체크포인트 스풀 (로컬 디스크, JSONL 추가 기록)
+- 메타 저장 후 LLM 분석/시그널 저장이 끝나기 전에 프로세스가 죽어도
+  다음 실행이 분석하지 못한 기사부터 이어서 처리하도록 합니다.
+
+기록 종류 (한 줄 = JSON 1개):
+    stage : 메타 저장 직전 기사 (url, 제목/요약, 발행일, 키워드)
+    saved : 메타 저장 완료 → article_id
+    drop  : 이미 있던 기사라 이번 실행이 분석하지 않음
+    done  : LLM 분석 + 시그널 저장까지 완료
+
+기사 원문(제목/요약)은 DB에 저장하지 않는 정책에 맞춰:
+    - 파일 권한은 소유자만 읽기/쓰기(0600)
+    - stage 후 NEWS_SPOOL_TTL_HOURS가 지난 기사는 읽을 때 버림
+    - 남은 기사가 없으면 파일을 삭제
+NEWS_SPOOL=0 이면 스풀을 쓰지 않습니다.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Iterable
+
+from config import NEWS_SPOOL_ENABLED, NEWS_SPOOL_PATH, NEWS_SPOOL_TTL_HOURS
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class NewsSpool:
+    """run_crawler용 체크포인트 스풀. 스레드 안전합니다."""
+
+    def __init__(self, path: str = NEWS_SPOOL_PATH, ttl_hours: float = NEWS_SPOOL_TTL_HOURS, enabled: bool = NEWS_SPOOL_ENABLED):
+        self.enabled = enabled
+        self._path = path
+        self._ttl = timedelta(hours=ttl_hours)
+        self._lock = threading.Lock()
+        self._fh = None
+        self._live: dict[str, dict] = {}                   # url → 아직 끝나지 않은 기사 (stage + saved 정보)
+        self._analyzed: list[tuple[int, list[str]]] = []   # (시그널 writer 일련번호, url 목록) — flush 대기
+
+    # ── 읽기 / 정리 ──────────────────────────────────────────────
+
+    def load(self) -> list[dict]:
+        """
+        지난 실행이 끝내지 못한 기사를 반환하고, 파일을 남은 기사만으로 다시 씁니다.
+        반환 항목: {"url","title","description","published_at","keywords","article_id"(없을 수 있음)}
+        """
+        if not self.enabled:
+            return []
+
+        live: dict[str, dict] = {}
+        expired = 0
+        if os.path.exists(self._path):
+            cutoff = datetime.now(timezone.utc) - self._ttl
+            with open(self._path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        continue  # 기록 도중 죽어서 잘린 마지막 줄
+                    kind, url = rec.get("t"), rec.get("url")
+                    if kind == "stage":
+                        live[url] = rec
+                    elif kind == "saved" and url in live:
+                        live[url]["article_id"] = rec.get("article_id")
+                    elif kind in ("drop", "done"):
+                        live.pop(url, None)
+            for url in [u for u, r in live.items() if datetime.fromisoformat(r["ts"]) < cutoff]:
+                del live[url]
+                expired += 1
+
+        with self._lock:
+            self._live = live
+            self._rewrite()
+        if expired:
+            print(f"🗑️ 체크포인트 스풀: 보관 기간이 지난 기사 {expired}건 폐기")
+        return [dict(r) for r in live.values()]
+
+    def _rewrite(self) -> None:
+        # 남은 기사만 임시 파일에 쓰고 교체합니다. (lock 보유 상태에서 호출)
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+        if not self._live:
+            if os.path.exists(self._path):
+                os.remove(self._path)
+            return
+        tmp = f"{self._path}.tmp"
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            for rec in self._live.values():
+                stage = {k: v for k, v in rec.items() if k != "article_id"}
+                f.write(json.dumps(stage, ensure_ascii=False) + "\n")
+                if rec.get("article_id"):
+                    f.write(json.dumps({"t": "saved", "url": rec["url"], "article_id": rec["article_id"]}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self._path)
+
+    # ── 기록 ─────────────────────────────────────────────────────
+
+    def _append(self, records: Iterable[dict]) -> None:
+        lines = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records)
+        if not lines:
+            return
+        if self._fh is None:
+            fd = os.open(self._path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+            self._fh = os.fdopen(fd, "a", encoding="utf-8")
+        self._fh.write(lines)
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+
+    def stage(self, articles: Iterable[tuple[dict, list[str]]]) -> None:
+        """메타 저장 직전에 기사와 키워드를 기록합니다."""
+        if not self.enabled:
+            return
+        ts = _now_iso()
+        records = []
+        for article, keywords in articles:
+            rec = {
+                "t": "stage",
+                "url": article["url"],
+                "title": article.get("title", ""),
+                "description": article.get("description", ""),
+                "published_at": article["published_at"].isoformat(),
+                "keywords": list(keywords),
+                "ts": ts,
+            }
+            records.append(rec)
+        with self._lock:
+            for rec in records:
+                self._live[rec["url"]] = dict(rec)
+            self._append(records)
+
+    def saved(self, ids: dict[str, str]) -> None:
+        """메타 저장이 끝난 기사의 {url: article_id}를 기록합니다."""
+        if not self.enabled or not ids:
+            return
+        with self._lock:
+            for url, aid in ids.items():
+                if url in self._live:
+                    self._live[url]["article_id"] = aid
+            self._append({"t": "saved", "url": u, "article_id": a} for u, a in ids.items())
+
+    def drop(self, urls: Iterable[str]) -> None:
+        """이번 실행이 분석하지 않을 기사(이미 있던 기사 등)를 스풀에서 뺍니다."""
+        self._finish("drop", urls)
+
+    def _finish(self, kind: str, urls: Iterable[str]) -> None:
+        if not self.enabled:
+            return
+        urls = [u for u in urls if u]
+        if not urls:
+            return
+        with self._lock:
+            for u in urls:
+                self._live.pop(u, None)
+            self._append({"t": kind, "url": u} for u in urls)
+
+    def analyzed(self, urls: Iterable[str], seq: int) -> None:
+        """
+        LLM 분석이 끝난 기사. 시그널이 writer 버퍼에 남아 있을 수 있으므로
+        writer가 일련번호 seq까지 flush한 뒤(on_flushed)에 done으로 기록합니다.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self._analyzed.append((seq, list(urls)))
+
+    def on_flushed(self, seq: int, failed_article_ids: Iterable[str] = ()) -> None:
+        """
+        SignalWriter(on_flushed=...) 콜백 — seq까지 저장된 기사를 done으로 기록합니다.
+        시그널 저장에 실패한 기사(failed_article_ids)는 스풀에 남겨 다음 실행이 다시 분석합니다.
+        """
+        if not self.enabled:
+            return
+        failed = set(failed_article_ids)
+        with self._lock:
+            ready = [urls for s, urls in self._analyzed if s <= seq]
+            self._analyzed = [(s, urls) for s, urls in self._analyzed if s > seq]
+            if failed:
+                ready = [
+                    [u for u in urls if (self._live.get(u) or {}).get("article_id") not in failed]
+                    for urls in ready
+                ]
+        for urls in ready:
+            self._finish("done", urls)
+
+    def close(self) -> int:
+        """파일을 남은 기사만으로 정리하고, 남은 기사 수를 반환합니다. (0이면 파일 삭제)"""
+        if not self.enabled:
+            return 0
+        with self._lock:
+            try:
+                self._rewrite()
+            except OSError as e:
+                print(f"⚠️ 체크포인트 스풀 정리 실패: {e}")
+            return len(self._live)
@@ -0,0 +1,197 @@
+"""
+seen_url_filter.py
+
+- 이미 적재한 기사 URL의 로컬 Bloom filter (디스크 영속)
+- run_crawler 시작 시 읽고, 기사 저장 후 추가하고, 종료 시 저장합니다.
+
+판정 규칙:
+    - 필터에 있음   → 이미 적재한 기사로 보고 DB 조회 없이 건너뜀
+                      (오탐 확률 = SEEN_URL_FILTER_ERROR_RATE, 기본 0.01%)
+    - 필터에 없음   → 신규일 수 있음 → filter_new_urls()로 DB에서 확정
+      (다른 머신/실행이 넣은 URL은 필터에 없을 수 있으므로 DB 확인이 필요)
+
+재구성:
+    - 파일이 없거나 깨졌거나, 용량(capacity)을 넘었거나, SEEN_URL_FILTER_REBUILD=1 이면
+      articles 테이블의 url 전체를 스트리밍으로 읽어 새로 만듭니다.
+    - SEEN_URL_FILTER=0 이면 필터를 쓰지 않습니다. (모든 URL을 DB에서 확인)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import os
+import struct
+import threading
+from typing import Iterable, Optional
+
+from config import (
+    SEEN_URL_FILTER_ENABLED,
+    SEEN_URL_FILTER_PATH,
+    SEEN_URL_FILTER_CAPACITY,
+    SEEN_URL_FILTER_ERROR_RATE,
+    SEEN_URL_FILTER_REBUILD,
+)
+from .db import supabase, stream_rows
+from crawlers.canonical_url import canonical_url
+
+# 파일 헤더: magic(4) + version(1) + k(1) + m(8) + count(8) + capacity(8)
+_MAGIC = b"SURL"
+_VERSION = 2   # 2: 정규화 URL 키 (crawlers/canonical_url.py) — 이전 버전 파일은 재구성
+_HEADER = struct.Struct(">4sBBQQQ")
+
+
+class BloomFilter:
+    """고정 크기 Bloom filter. 해시는 blake2b 128bit를 둘로 나눈 이중 해싱을 사용합니다."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(1, int(capacity))
+        error_rate = min(max(float(error_rate), 1e-9), 0.5)
+        m = math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        self.m = max(8, m)
+        self.k = max(1, round(self.m / capacity * math.log(2)))
+        self.capacity = capacity
+        self.count = 0
+        self._bits = bytearray((self.m + 7) // 8)
+
+    def _positions(self, item: str) -> Iterable[int]:
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:], "big") | 1
+        m = self.m
+        return ((h1 + i * h2) % m for i in range(self.k))
+
+    def add(self, item: str) -> bool:
+        """추가하고, 새로 추가된 항목이면 True"""
+        added = False
+        for p in self._positions(item):
+            byte, bit = divmod(p, 8)
+            mask = 1 << bit
+            if not self._bits[byte] & mask:
+                self._bits[byte] |= mask
+                added = True
+        if added:
+            self.count += 1
+        return added
+
+    def __contains__(self, item: str) -> bool:
+        bits = self._bits
+        return all(bits[p >> 3] & (1 << (p & 7)) for p in self._positions(item))
+
+    def save(self, path: str) -> None:
+        # 임시 파일에 쓴 뒤 교체 → 저장 도중 죽어도 기존 파일은 온전함
+        tmp = f"{path}.tmp"
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(tmp, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, _VERSION, self.k, self.m, self.count, self.capacity))
+            f.write(self._bits)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "BloomFilter":
+        with open(path, "rb") as f:
+            magic, version, k, m, count, capacity = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != _MAGIC or version != _VERSION:
+                raise ValueError(f"지원하지 않는 필터 파일: {path}")
+            bits = bytearray(f.read())
+        if len(bits) != (m + 7) // 8:
+            raise ValueError(f"필터 파일 크기 불일치: {path}")
+        bf = cls.__new__(cls)
+        bf.m, bf.k, bf.count, bf.capacity, bf._bits = m, k, count, capacity, bits
+        return bf
+
+
+class SeenUrlFilter:
+    """run_crawler용 래퍼. 스레드 안전하며 변경이 있을 때만 저장합니다."""
+
+    def __init__(self, bloom: Optional[BloomFilter], path: str):
+        self._bloom = bloom
+        self._path = path
+        self._lock = threading.Lock()
+        self._dirty = False
+
+    @property
+    def enabled(self) -> bool:
+        return self._bloom is not None
+
+    def split(self, urls: Iterable[str]) -> tuple[list[str], list[str]]:
+        """(필터상 이미 본 URL, 신규일 수 있는 URL)로 나눕니다."""
+        if self._bloom is None:
+            return [], list(urls)
+        seen, maybe_new = [], []
+        with self._lock:
+            for u in urls:
+                (seen if u in self._bloom else maybe_new).append(u)
+        return seen, maybe_new
+
+    def add_many(self, urls: Iterable[str]) -> None:
+        if self._bloom is None:
+            return
+        with self._lock:
+            for u in urls:
+                if u and self._bloom.add(u):
+                    self._dirty = True
+
+    def save(self) -> None:
+        if self._bloom is None or not self._dirty:
+            return
+        with self._lock:
+            try:
+                self._bloom.save(self._path)
+                self._dirty = False
+            except Exception as e:
+                print(f"⚠️ seen-URL 필터 저장 실패: {e}")
+
+
+def rebuild_seen_url_filter(
+    path: str = SEEN_URL_FILTER_PATH,
+    capacity: int = SEEN_URL_FILTER_CAPACITY,
+    error_rate: float = SEEN_URL_FILTER_ERROR_RATE,
+) -> BloomFilter:
+    """articles.url 전체로 필터를 새로 만들어 저장합니다."""
+    # 건수만 먼저 세어 크기를 정하고, URL은 목록으로 모으지 않고 바로 필터에 넣습니다.
+    total = supabase.table("articles").select("id", count="exact", head=True).execute().count or 0
+    # 적재량이 용량의 절반을 넘으면 여유 있게 키웁니다. (오탐률 유지)
+    while total * 2 > capacity:
+        capacity *= 2
+    bf = BloomFilter(capacity, error_rate)
+    loaded = 0
+    for r in stream_rows(lambda: supabase.table("articles").select("id, url"), key="id"):
+        u = r.get("url")
+        if not u:
+            continue
+        loaded += 1
+        bf.add(u)
+        # 정규화 규칙이 생기기 전에 저장된 URL도 지금 형태(정규화 URL)로 조회되도록 함께 넣습니다.
+        key = canonical_url(u)
+        if key != u:
+            bf.add(key)
+    bf.save(path)
+    print(f"🧱 seen-URL 필터 재구성: {loaded}건 (capacity={capacity}, {len(bf._bits) / 1024 / 1024:.1f}MB)")
+    return bf
+
+
+def load_seen_url_filter(path: str = SEEN_URL_FILTER_PATH) -> SeenUrlFilter:
+    """디스크의 필터를 읽습니다. 없거나 쓸 수 없으면 articles에서 재구성합니다."""
+    if not SEEN_URL_FILTER_ENABLED:
+        return SeenUrlFilter(None, path)
+
+    bloom: Optional[BloomFilter] = None
+    if not SEEN_URL_FILTER_REBUILD and os.path.exists(path):
+        try:
+            bloom = BloomFilter.load(path)
+            if bloom.count > bloom.capacity:
+                print("⚠️ seen-URL 필터가 용량을 넘어 오탐률이 높아졌습니다. 재구성합니다.")
+                bloom = None
+        except Exception as e:
+            print(f"⚠️ seen-URL 필터 로드 실패 ({e}). 재구성합니다.")
+            bloom = None
+
+    if bloom is None:
+        try:
+            bloom = rebuild_seen_url_filter(path)
+        except Exception as e:
+            print(f"⚠️ seen-URL 필터 재구성 실패 — 이번 실행은 DB 조회만 사용합니다: {e}")
+            return SeenUrlFilter(None, path)
+
+    return SeenUrlFilter(bloom, path)
@@ -1,5 +1,16 @@
 from .db import supabase
 from datetime import datetime, timezone
+from typing import Iterable
+
+# in.(...) 한 번에 조회할 키워드 수
+KEYWORD_IN_CHUNK_SIZE = 100
+
+
+def _to_utc_naive(dt: datetime) -> datetime:
+    # 🔥 timezone 제거 (UTC naive로 통일)
+    if dt.tzinfo:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
 
 
 def get_last_crawled_at():
@@ -11,14 +22,8 @@ def get_last_crawled_at():
         .execute()
     )
 
-    if result.data:
-        dt = datetime.fromisoformat(result.data[0]["last_crawled_at"])
-
-        # 🔥 timezone 제거 (naive로 통일)
-        if dt.tzinfo:
-            dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
-
-        return dt
+    if result.data and result.data[0].get("last_crawled_at"):
+        return _to_utc_naive(datetime.fromisoformat(result.data[0]["last_crawled_at"]))
 
     return None
 
@@ -26,13 +31,99 @@ def get_last_crawled_at():
 def update_last_crawled_at(timestamp: datetime):
 
     # 🔥 timestamp도 UTC naive로 저장
-    if timestamp.tzinfo:
-        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    timestamp = _to_utc_naive(timestamp)
 
     (
         supabase
         .table("crawler_state")
-        .update({"last_crawled_at": timestamp.isoformat()})
+        .update({"last_crawled_at": timestamp.isoformat()}, returning="minimal")
         .eq("id", 1)
         .execute()
-    )
\ No newline at end of file
+    )
+
+
+def get_keyword_watermarks(queries: Iterable[str]) -> dict[str, datetime]:
+    """
+    검색 쿼리별 워터마크를 한꺼번에 읽습니다. (crawler_keyword_state, sql/crawler_keyword_state.sql)
+
+    반환값: {query: last_crawled_at(UTC naive)} — 행이 없는 쿼리는 빠집니다.
+    테이블이 아직 없으면 경고 후 빈 dict (→ 호출 측은 전역 워터마크 사용)
+    """
+    queries = list(dict.fromkeys(q for q in queries if q))
+    marks: dict[str, datetime] = {}
+    try:
+        for i in range(0, len(queries), KEYWORD_IN_CHUNK_SIZE):
+            result = (
+                supabase
+                .table("crawler_keyword_state")
+                .select("query, last_crawled_at")
+                .in_("query", queries[i:i + KEYWORD_IN_CHUNK_SIZE])
+                .execute()
+            )
+            for row in result.data or []:
+                if row.get("last_crawled_at"):
+                    marks[row["query"]] = _to_utc_naive(datetime.fromisoformat(row["last_crawled_at"]))
+    except Exception as e:
+        print(f"⚠️ 키워드별 워터마크 조회 실패 (전역 워터마크 사용): {e}")
+        return {}
+    return marks
+
+
+def update_keyword_watermarks(marks: dict[str, datetime]) -> None:
+    """검색 쿼리별 워터마크를 배열 upsert 1회로 저장합니다."""
+    if not marks:
+        return
+    now = datetime.now(timezone.utc).isoformat()
+    rows = [
+        {"query": q, "last_crawled_at": _to_utc_naive(ts).isoformat(), "updated_at": now}
+        for q, ts in marks.items()
+    ]
+    try:
+        (
+            supabase
+            .table("crawler_keyword_state")
+            .upsert(rows, on_conflict="query", returning="minimal")
+            .execute()
+        )
+    except Exception as e:
+        print(f"⚠️ 키워드별 워터마크 저장 실패: {e}")
+
+
+def get_query_stats(queries: Iterable[str]) -> dict[str, dict]:
+    """
+    검색 쿼리별 성과(crawler_query_stats)를 한꺼번에 읽습니다.
+
+    반환값: {query: row} — 행이 없는 쿼리는 빠집니다. 테이블이 없으면 경고 후 빈 dict
+    """
+    queries = list(dict.fromkeys(q for q in queries if q))
+    stats: dict[str, dict] = {}
+    try:
+        for i in range(0, len(queries), KEYWORD_IN_CHUNK_SIZE):
+            result = (
+                supabase
+                .table("crawler_query_stats")
+                .select("*")
+                .in_("query", queries[i:i + KEYWORD_IN_CHUNK_SIZE])
+                .execute()
+            )
+            for row in result.data or []:
+                stats[row["query"]] = row
+    except Exception as e:
+        print(f"⚠️ 쿼리별 성과 조회 실패: {e}")
+        return {}
+    return stats
+
+
+def upsert_query_stats(rows: list[dict]) -> None:
+    """검색 쿼리별 성과 row를 배열 upsert 1회로 저장합니다."""
+    if not rows:
+        return
+    try:
+        (
+            supabase
+            .table("crawler_query_stats")
+            .upsert(rows, on_conflict="query", returning="minimal")
+            .execute()
+        )
+    except Exception as e:
+        print(f"⚠️ 쿼리별 성과 저장 실패: {e}")
@@ -11,6 +11,8 @@ from workers.dart_classifier_worker import run as run_classifier
 from workers.dart_llm_worker import run as run_llm
 from score_main import run as run_scoring
 from workers.action_recommendation_worker import run_action_worker
+from repositories.db import get_pool_stats
+from repositories.db_metrics import print_db_metrics
 
 def run_all():
     print("\n" + "="*50)
@@ -46,3 +48,6 @@ if __name__ == "__main__":
     except Exception as e:
         print(f"\n[DART Daily] 오류 발생: {e}")
         sys.exit(1)
+    finally:
+        # 테이블/쿼리 패턴별 DB 요청 수·지연·용량 요약
+        print_db_metrics(pool_stats=get_pool_stats())
@@ -8,6 +8,8 @@ sys.path.insert(0, current_dir)
 from services.crawler_service import run_crawler
 from score_main import run as run_scoring
 from workers.action_recommendation_worker import run_action_worker
+from repositories.db import get_pool_stats
+from repositories.db_metrics import print_db_metrics
 
 if __name__ == "__main__":
     print("\n" + "="*50)
@@ -31,3 +33,6 @@ if __name__ == "__main__":
     except Exception as e:
         print(f"\n[News Pipeline] 실행 중 오류 발생: {e}")
         sys.exit(1)
+    finally:
+        # 테이블/쿼리 패턴별 DB 요청 수·지연·용량 요약
+        print_db_metrics(pool_stats=get_pool_stats())
@@ -5,7 +5,7 @@ scheduler_main.py — 메인 스케줄러
 
 ┌─────────────────────────────────────────────────────────────
 │  작업                           주기                         
-│  뉴스 크롤링 + LLM 분석         1시간마다                     
+│  뉴스 크롤링 + LLM 분석         쿼리별 검색 주기가 돌아올 때마다 
 │  DART 공시 수집/분류/LLM 분석   1일마다 (새벽 02:00 이후)     
 │  타겟 기업 탐색 (3개월 순회)    1일마다 (새벽 03:00 이후)     
 └─────────────────────────────────────────────────────────────
@@ -20,13 +20,16 @@ scheduler_main.py — 메인 스케줄러
     - 각 작업은 순차 실행입니다. 한 작업이 길어지면 다음 작업 시작이 늦어질 수 있습니다.
     - 작업 중 오류가 발생해도 스케줄러는 멈추지 않고 계속 실행됩니다.
     - DART 공시와 타겟 탐색은 하루에 한 번만 실행됩니다.
+    - 뉴스 검색 주기는 쿼리마다 다릅니다. (services/crawl_scheduler.py)
+      기사가 자주 나오는 쿼리, 고객사 키워드, 최근 시그널이 나온 쿼리일수록 자주 검색하며
+      전체 검색 횟수는 NEWS_CRAWL_BUDGET_PER_HOUR(시간당)를 넘지 않도록 나눕니다.
 """
 
 import sys
 import os
 import time
 import asyncio
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
@@ -34,9 +37,12 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 # ⚙️  실행 주기 설정
 # ──────────────────────────────────────────────────────────────────────────────
 
-# 뉴스 크롤링 주기 (초 단위)
-# 3600 = 1시간 / 1800 = 30분 / 7200 = 2시간
-NEWS_INTERVAL_SEC = 3600
+# 뉴스 크롤링 최소 간격 (초 단위)
+# 쿼리별 검색 주기는 run_crawler가 정하고, 여기서는 연달아 너무 자주 돌지 않도록 하한만 둡니다.
+NEWS_MIN_GAP_SEC = 60
+
+# 뉴스 크롤링이 실패했거나 다음 검색 시각을 알 수 없을 때 다시 시도할 간격 (초 단위)
+NEWS_RETRY_SEC = 600
 
 # DART 공시 파이프라인이 하루에 실행될 시각 (24시 기준 시간, 0~23)
 # 예: 2 → 새벽 02:00 이후 첫 스케줄 루프에서 실행
@@ -55,7 +61,7 @@ LOOP_SLEEP_SEC = 10
 # 내부 상태 추적 (프로세스 재시작 시 초기화됨)
 # ──────────────────────────────────────────────────────────────────────────────
 
-_last_news_run: datetime | None = None       # 뉴스 마지막 실행 시각
+_next_news_run: datetime | None = None       # 뉴스 다음 실행 시각 (UTC)
 _last_dart_run_date: str | None  = None      # DART 파이프라인 마지막 실행 날짜 (YYYY-MM-DD)
 _last_industry_run_date: str | None = None   # 타겟 탐색 마지막 실행 날짜 (YYYY-MM-DD)
 
@@ -68,12 +74,19 @@ def run_news_pipeline() -> None:
     """
     네이버 뉴스 크롤링 후 기사를 즉시 LLM으로 분석하여 signals 테이블에 저장합니다.
     crawler_service.py 의 run_crawler()가 전체 흐름을 담당합니다.
+    검색 주기가 지난 쿼리만 검색하고, 다음 쿼리의 검색 시각을 _next_news_run에 기록합니다.
 
     흐름:
         크롤링(naver_news.py) → DB 저장(articles) → LLM 분석 → signals 저장
     """
+    global _next_news_run
     from services.crawler_service import run_crawler
-    run_crawler()
+    next_due = run_crawler(scheduled=True)
+    earliest = datetime.now(timezone.utc) + timedelta(seconds=NEWS_MIN_GAP_SEC)
+    if next_due is None:
+        _next_news_run = datetime.now(timezone.utc) + timedelta(seconds=NEWS_RETRY_SEC)
+    else:
+        _next_news_run = max(next_due, earliest)
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -147,12 +160,11 @@ def run_industry_scan() -> None:
 def _should_run_news() -> bool:
     """
     뉴스 크롤링 실행 여부를 판단합니다.
-    한 번도 실행하지 않았거나, 마지막 실행 후 NEWS_INTERVAL_SEC 이상 지났으면 True.
+    한 번도 실행하지 않았거나, 다음 실행 시각(_next_news_run)이 지났으면 True.
     """
-    global _last_news_run
-    if _last_news_run is None:
+    if _next_news_run is None:
         return True
-    return (datetime.now() - _last_news_run).total_seconds() >= NEWS_INTERVAL_SEC
+    return datetime.now(timezone.utc) >= _next_news_run
 
 
 def _should_run_daily(last_date: str | None, target_hour: int) -> bool:
@@ -192,11 +204,11 @@ def _safe_run(name: str, fn) -> bool:
 # ──────────────────────────────────────────────────────────────────────────────
 
 def main() -> None:
-    global _last_news_run, _last_dart_run_date, _last_industry_run_date
+    global _next_news_run, _last_dart_run_date, _last_industry_run_date
 
     print("=" * 60)
     print("[스케줄러] 메인 스케줄러 시작")
-    print(f"  뉴스 크롤링    : {NEWS_INTERVAL_SEC // 60}분마다")
+    print("  뉴스 크롤링    : 쿼리별 검색 주기마다")
     print(f"  DART 파이프라인: 매일 {DART_PIPELINE_HOUR:02d}:00 이후")
     print(f"  타겟 기업 탐색 : 매일 {INDUSTRY_SCAN_HOUR:02d}:00 이후")
     print("  종료: Ctrl+C")
@@ -208,11 +220,13 @@ def main() -> None:
         # ── 뉴스 크롤링 ───────────────────────────────────────────
         if _should_run_news():
             print(f"\n[스케줄러] {now_str} — 뉴스 크롤링 시작")
-            # 에러 발생 시 10초 무한 재시도 폭탄을 방지하기 위해 성공 여부와 무관하게 마지막 실행 시각을 즉시 기록
-            _last_news_run = datetime.now()
+            # 에러 발생 시 10초 무한 재시도 폭탄을 방지하기 위해 실행 전에 재시도 시각을 먼저 기록
+            # (성공하면 run_news_pipeline이 다음 검색 시각으로 덮어씀)
+            _next_news_run = datetime.now(timezone.utc) + timedelta(seconds=NEWS_RETRY_SEC)
             success = _safe_run("뉴스 크롤링", run_news_pipeline)
             if success:
-                print(f"[스케줄러] 뉴스 크롤링 완료. 다음 실행: {NEWS_INTERVAL_SEC // 60}분 후")
+                wait_min = (_next_news_run - datetime.now(timezone.utc)).total_seconds() / 60
+                print(f"[스케줄러] 뉴스 크롤링 완료. 다음 실행: {max(0.0, wait_min):.0f}분 후")
 
         # ── DART 공시 파이프라인 (하루 1회) ──────────────────────
         if _should_run_daily(_last_dart_run_date, DART_PIPELINE_HOUR):
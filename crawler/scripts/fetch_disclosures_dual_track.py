@@ -19,7 +19,7 @@ import asyncio
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from repositories.db import supabase
+from repositories.db import supabase, async_supabase_client
 from services.dart_service import fetch_recent_disclosures
 from config import DART_API_KEY
 
@@ -73,22 +73,23 @@ def deduplicate(track_a: list[dict], track_b: list[dict]) -> list[dict]:
 
 # ── Step 2: 공시 적재 ────────────────────────────────────────────
 
-def insert_disclosures_safe(disclosures: list[dict]) -> int:
+async def insert_disclosures_safe(db, disclosures: list[dict]) -> int:
     """ON CONFLICT (rcept_no) DO NOTHING 방식으로 중복 없이 적재"""
     if not disclosures:
         return 0
-    result = (
-        supabase
+    result = await (
+        db
         .table("dart_disclosures")
-        .upsert(disclosures, on_conflict="rcept_no", ignore_duplicates=True)
+        .upsert(disclosures, on_conflict="rcept_no", ignore_duplicates=True, count="exact", returning="minimal")
         .execute()
     )
-    return len(result.data) if result.data else 0
+    # 신규 적재 건수만 필요하므로 row 대신 count를 받습니다. (중복으로 무시된 row는 제외)
+    return result.count or 0
 
 
 # ── Step 3: 트랙별 비동기 수집 함수 ──────────────────────────────
 
-async def fetch_track(companies: list[dict], source_role: str) -> tuple[int, int]:
+async def fetch_track(db, companies: list[dict], source_role: str) -> tuple[int, int]:
     """
     주어진 기업 목록의 공시를 비동기로 수집하여 dart_disclosures에 적재합니다.
 
@@ -118,7 +119,7 @@ async def fetch_track(companies: list[dict], source_role: str) -> tuple[int, int
             d["source_role"] = source_role
             d["scout_status"] = "PENDING"
 
-        saved = await asyncio.to_thread(insert_disclosures_safe, disclosures)
+        saved = await insert_disclosures_safe(db, disclosures)
 
         total_fetched += len(disclosures)
         total_saved   += saved
@@ -150,11 +151,12 @@ async def run_async():
         print("[fetch_dual_track] 수집 대상 없음. 종료합니다.")
         return
 
-    # 두 트랙 병렬 실행
-    (a_fetched, a_saved), (b_fetched, b_saved) = await asyncio.gather(
-        fetch_track(track_a, source_role="CLIENT"),
-        fetch_track(track_b, source_role="POTENTIAL"),
-    )
+    # 두 트랙 병렬 실행 (DB 적재는 비동기 클라이언트 하나를 공유)
+    async with async_supabase_client() as db:
+        (a_fetched, a_saved), (b_fetched, b_saved) = await asyncio.gather(
+            fetch_track(db, track_a, source_role="CLIENT"),
+            fetch_track(db, track_b, source_role="POTENTIAL"),
+        )
 
     print("\n" + "=" * 55)
     print("[fetch_dual_track] 완료")
@@ -0,0 +1,731 @@
+"""
+scripts/local_postgrest.py
+
+목적:
+- 성능 실험용 로컬 PostgREST 대체 서버 (SQLite 기반)
+- 라이브 Supabase 프로젝트를 건드리지 않고 뉴스/DART 파이프라인의 DB 구간을
+  오프라인에서 반복 측정할 수 있게 합니다.
+
+지원 범위 (repositories/db.py의 _TableQuery가 보내는 PostgREST 부분집합):
+- GET / POST / PATCH / DELETE / HEAD  /rest/v1/<table>
+- 필터: eq, neq, gt, gte, lt, lte, like, ilike, is, in, not.<op>, or=(...), and=(...)
+  (같은 컬럼 반복 파라미터 허용)
+- select(컬럼 목록), order(col.asc|desc[.nullsfirst|.nullslast], 콤마 다중), limit, offset, Range 헤더
+- Prefer: return=representation|minimal, resolution=merge-duplicates|ignore-duplicates, count=exact|planned|estimated
+- on_conflict 업서트 (SQLite ON CONFLICT ... DO UPDATE / DO NOTHING)
+- POST /rest/v1/rpc/<fn>: RPC_FUNCTIONS에 등록된 집계 함수 (crawler/sql/*.sql 의 SQLite 번역)
+
+테이블:
+- 크롤러가 쓰는 테이블을 SCHEMA에 미리 만들어 둡니다.
+- 스키마에 없는 컬럼이 들어오면 첫 값의 타입으로 컬럼을 자동 추가합니다.
+- dict/list 값은 JSON 텍스트로 저장했다가 조회 시 다시 JSON으로 돌려줍니다. (jsonb 흉내)
+
+실행:
+    crawler 디렉토리에서:
+    python scripts/local_postgrest.py --db local_supabase.sqlite --port 54321 [--latency-ms 20]
+
+    그리고 다른 터미널에서:
+    SUPABASE_URL=http://127.0.0.1:54321 SUPABASE_KEY=local.fake.key python run_news_hourly.py
+
+주의:
+- DB 구간만 대체합니다. 네이버/OpenAI/DART API는 각자의 엔드포인트로 나갑니다.
+  (OpenAI는 OPENAI_BASE_URL로 로컬 목 서버를 지정할 수 있습니다.)
+- --latency-ms 로 요청마다 인위적인 왕복 지연을 넣어 네트워크 조건을 흉내낼 수 있습니다.
+"""
+
+import sys
+import os
+import argparse
+import json
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+# ── 스키마 ──────────────────────────────────────────────────────
+# (테이블명 → (컬럼 정의 SQL, on_conflict 대상이 되는 유니크 컬럼 목록))
+# id는 uuid 문자열로 자동 생성합니다. (keyset 페이지네이션은 문자열 순서로 동작)
+
+SCHEMA: dict[str, tuple[str, list[list[str]]]] = {
+    "articles": ("""
+        id TEXT PRIMARY KEY, url TEXT, title TEXT, content TEXT, published_at TEXT,
+        content_hash TEXT, scout_status TEXT, raw_data TEXT, created_at TEXT
+    """, [["url"]]),
+    "article_duplicates": ("""
+        article_id TEXT PRIMARY KEY, representative_id TEXT, distance INTEGER, created_at TEXT
+    """, [["article_id"]]),
+    "crawler_state": ("""
+        id INTEGER PRIMARY KEY, last_crawled_at TEXT
+    """, []),
+    "crawler_keyword_state": ("""
+        query TEXT PRIMARY KEY, last_crawled_at TEXT, updated_at TEXT
+    """, [["query"]]),
+    "crawler_query_stats": ("""
+        query TEXT PRIMARY KEY, base_keyword TEXT, term TEXT, calls REAL, new_articles REAL,
+        signals REAL, confidence_sum REAL, last_called_at TEXT, last_signal_at TEXT, updated_at TEXT,
+        rate_events REAL, rate_hours REAL, poll_interval_min REAL
+    """, [["query"]]),
+    "signals": ("""
+        id TEXT PRIMARY KEY, event_hash TEXT, source TEXT, article_id TEXT, rcept_no TEXT,
+        company_name TEXT, company_role TEXT, event_type TEXT, impact_type TEXT,
+        impact_strength INTEGER, signal_category TEXT, industry_tag TEXT, trend_bucket TEXT,
+        severity_level INTEGER, confidence REAL, created_at TEXT
+    """, [["event_hash"]]),
+    "companies": ("""
+        id TEXT PRIMARY KEY, company_name TEXT, company_role TEXT, dart_corp_code TEXT,
+        dart_sync_status TEXT, created_at TEXT, updated_at TEXT
+    """, [["company_name"]]),
+    "managed_clients": ("""
+        id TEXT PRIMARY KEY, company_name TEXT, corp_code TEXT, created_at TEXT
+    """, []),
+    "customers": ("""
+        id TEXT PRIMARY KEY, name TEXT, created_at TEXT
+    """, []),
+    "keywords": ("""
+        id TEXT PRIMARY KEY, keyword TEXT, is_active INTEGER, created_at TEXT
+    """, []),
+    "dart_disclosures": ("""
+        id TEXT PRIMARY KEY, rcept_no TEXT, corp_code TEXT, corp_name TEXT, report_nm TEXT,
+        rcept_dt TEXT, url TEXT, source_role TEXT, scout_status TEXT, scout_result TEXT, created_at TEXT
+    """, [["rcept_no"]]),
+    "industry_targets": ("""
+        corp_code TEXT PRIMARY KEY, company_name TEXT, created_at TEXT
+    """, [["corp_code"]]),
+    "company_signal_daily": ("""
+        id TEXT PRIMARY KEY, company_name TEXT, date TEXT, risk_score_raw REAL, opp_score_raw REAL
+    """, [["company_name", "date"]]),
+    "company_signal_rolling": ("""
+        id TEXT PRIMARY KEY, company_name TEXT, risk_7d REAL, risk_30d REAL, opp_7d REAL,
+        opp_30d REAL, momentum_score REAL
+    """, [["company_name"]]),
+    "company_scores": ("""
+        id TEXT PRIMARY KEY, company_name TEXT, risk_score REAL, opportunity_score REAL,
+        risk_level TEXT, opportunity_level TEXT, risk_delta REAL, opportunity_delta REAL,
+        momentum_score REAL, updated_at TEXT
+    """, [["company_name"]]),
+    "daily_opportunity_reports": ("""
+        id TEXT PRIMARY KEY, report_date TEXT, summary TEXT, created_at TEXT
+    """, [["report_date"]]),
+    "action_recommendations": ("""
+        id TEXT PRIMARY KEY, company_name TEXT, actions TEXT, strategy_type TEXT, trigger_type TEXT,
+        confidence_score REAL, momentum_score REAL, updated_at TEXT
+    """, []),
+}
+
+# ── RPC 함수 (crawler/sql/rpc_aggregations.sql 의 SQLite 번역) ────────
+# 함수명 → (SQL, 파라미터 기본값). SQL은 :이름 바인딩을 사용합니다.
+
+_RAW = "CAST(impact_strength AS REAL) * CAST(severity_level AS REAL) * CAST(confidence AS REAL)"
+_RAW0 = "COALESCE(impact_strength, 0) * COALESCE(severity_level, 0) * COALESCE(confidence, 0) * 1.0"
+
+RPC_FUNCTIONS: dict[str, tuple[str, dict]] = {
+    "aggregate_company_signal_daily": (f"""
+        SELECT trim(company_name) AS company_name,
+               COALESCE(SUM(CASE WHEN lower(COALESCE(impact_type, '')) = 'risk' THEN {_RAW} END), 0.0) AS risk_score_raw,
+               COALESCE(SUM(CASE WHEN lower(COALESCE(impact_type, '')) <> 'risk' THEN {_RAW} END), 0.0) AS opp_score_raw,
+               COUNT(*) AS signal_count
+        FROM signals
+        WHERE created_at >= :p_start AND created_at < :p_end
+          AND trim(COALESCE(company_name, '')) <> ''
+          AND impact_strength IS NOT NULL AND severity_level IS NOT NULL AND confidence IS NOT NULL
+        GROUP BY trim(company_name)
+    """, {}),
+    "aggregate_signal_trends": (f"""
+        WITH base AS (
+            SELECT COALESCE(NULLIF(industry_tag, ''), 'General') AS industry_tag,
+                   COALESCE(NULLIF(trend_bucket, ''), 'Momentum') AS trend_bucket,
+                   COALESCE(NULLIF(signal_category, ''), 'Risk') AS signal_category,
+                   lower(COALESCE(impact_type, '')) = 'risk' AS is_risk,
+                   {_RAW0} AS raw,
+                   trim(COALESCE(company_name, '')) AS company_name,
+                   trim(COALESCE(event_type, '')) AS event_type,
+                   created_at
+            FROM signals
+            WHERE created_at >= :p_since
+        ),
+        grouped AS (
+            SELECT industry_tag, trend_bucket, signal_category,
+                   COUNT(*) AS count,
+                   COALESCE(SUM(CASE WHEN is_risk THEN raw END), 0.0) AS risk_raw_sum,
+                   COALESCE(SUM(CASE WHEN NOT is_risk THEN raw END), 0.0) AS opp_raw_sum
+            FROM base
+            GROUP BY industry_tag, trend_bucket, signal_category
+        )
+        SELECT g.*,
+               (SELECT json_group_array(ex) FROM (
+                    SELECT b.company_name || ': ' || b.event_type AS ex FROM base b
+                    WHERE b.industry_tag = g.industry_tag AND b.trend_bucket = g.trend_bucket
+                      AND b.signal_category = g.signal_category AND b.event_type <> ''
+                    ORDER BY b.created_at DESC LIMIT :p_examples)) AS examples
+        FROM grouped g
+        ORDER BY (g.risk_raw_sum + g.opp_raw_sum) DESC, g.count DESC
+        LIMIT max(:p_topn, 0)
+    """, {"p_topn": 10, "p_examples": 2}),
+}
+
+# 컬럼 종류 메타 (json/bool) — 조회 시 원래 타입으로 복원하기 위해 보관
+_META_DDL = "CREATE TABLE IF NOT EXISTS _pgrst_meta (tbl TEXT, col TEXT, kind TEXT, PRIMARY KEY (tbl, col))"
+
+_IDENT = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+class PgrstError(Exception):
+    def __init__(self, status: int, code: str, message: str):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+        self.message = message
+
+
+def _ident(name: str) -> str:
+    name = name.strip()
+    if not _IDENT.match(name):
+        raise PgrstError(400, "PGRST100", f"invalid identifier: {name}")
+    return f'"{name}"'
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).replace(tzinfo=None).isoformat()
+
+
+# ── 필터 파서 ───────────────────────────────────────────────────
+
+def _split_top(s: str) -> list[str]:
+    """괄호/따옴표 밖의 콤마로만 나눕니다."""
+    out, buf, depth, quoted = [], [], 0, False
+    for ch in s:
+        if ch == '"':
+            quoted = not quoted
+        elif not quoted and ch == "(":
+            depth += 1
+        elif not quoted and ch == ")":
+            depth -= 1
+        if ch == "," and depth == 0 and not quoted:
+            out.append("".join(buf))
+            buf = []
+            continue
+        buf.append(ch)
+    if buf:
+        out.append("".join(buf))
+    return [p for p in (x.strip() for x in out) if p]
+
+
+def _unquote(v: str) -> str:
+    v = v.strip()
+    if len(v) >= 2 and v[0] == '"' and v[-1] == '"':
+        return v[1:-1].replace('\\"', '"')
+    return v
+
+
+class _Filters:
+    """PostgREST 필터 표현식 → SQLite WHERE 절."""
+
+    def __init__(self, store: "SqliteStore", table: str):
+        self._store = store
+        self._table = table
+
+    def _value(self, col: str, v: str):
+        if self._store.kind(self._table, col) == "bool":
+            if v.lower() == "true":
+                return 1
+            if v.lower() == "false":
+                return 0
+        return v
+
+    def condition(self, col: str, expr: str) -> tuple[str, list]:
+        """col + 'op.value' (또는 'not.op.value') → (sql, args)"""
+        negate = False
+        if expr.startswith("not."):
+            negate = True
+            expr = expr[4:]
+        op, _, val = expr.partition(".")
+        c = _ident(col)
+        self._store.ensure_column(self._table, col, None)
+
+        if op in ("eq", "neq", "gt", "gte", "lt", "lte"):
+            sym = {"eq": "=", "neq": "<>", "gt": ">", "gte": ">=", "lt": "<", "lte": "<="}[op]
+            sql, args = f"{c} {sym} ?", [self._value(col, val)]
+        elif op in ("like", "ilike"):
+            pattern = val.replace("*", "%")
+            sql = f"{c} LIKE ?" if op == "ilike" else f"{c} GLOB ?"
+            args = [pattern if op == "ilike" else val]
+        elif op == "is":
+            v = val.lower()
+            if v == "null":
+                sql, args = f"{c} IS NULL", []
+            elif v in ("true", "false"):
+                sql, args = f"{c} = ?", [1 if v == "true" else 0]
+            else:
+                raise PgrstError(400, "PGRST100", f"invalid is value: {val}")
+        elif op == "in":
+            inner = val.strip()
+            if not (inner.startswith("(") and inner.endswith(")")):
+                raise PgrstError(400, "PGRST100", f"invalid in list: {val}")
+            items = [self._value(col, _unquote(x)) for x in _split_top(inner[1:-1])]
+            if not items:
+                sql, args = "0", []
+            else:
+                sql, args = f"{c} IN ({','.join('?' for _ in items)})", items
+        else:
+            raise PgrstError(400, "PGRST100", f"unsupported operator: {op}")
+
+        if negate:
+            sql = f"NOT ({sql})"
+        return sql, args
+
+    def logic(self, kind: str, body: str, negate: bool = False) -> tuple[str, list]:
+        """or=(...) / and=(...) 본문 → (sql, args). 중첩 and(...)/or(...) 지원."""
+        body = body.strip()
+        if not (body.startswith("(") and body.endswith(")")):
+            raise PgrstError(400, "PGRST100", f"invalid logic tree: {body}")
+        parts, args = [], []
+        for item in _split_top(body[1:-1]):
+            m = re.match(r"^(not\.)?(and|or)(\(.*\))$", item)
+            if m:
+                sql, a = self.logic(m.group(2), m.group(3), negate=bool(m.group(1)))
+            else:
+                col, _, expr = item.partition(".")
+                sql, a = self.condition(col, expr)
+            parts.append(f"({sql})")
+            args.extend(a)
+        joiner = " OR " if kind == "or" else " AND "
+        sql = joiner.join(parts) if parts else "1"
+        if negate:
+            sql = f"NOT ({sql})"
+        return sql, args
+
+
+# ── SQLite 저장소 ───────────────────────────────────────────────
+
+class SqliteStore:
+    def __init__(self, path: str):
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._lock = threading.RLock()
+        self._cols: dict[str, list[str]] = {}
+        self._kinds: dict[tuple[str, str], str] = {}
+        self._conflicts: dict[str, list[list[str]]] = {}
+        self._init_schema()
+
+    def _init_schema(self) -> None:
+        with self._lock:
+            self._conn.execute(_META_DDL)
+            for table, (cols, uniques) in SCHEMA.items():
+                self._conn.execute(f"CREATE TABLE IF NOT EXISTS {_ident(table)} ({cols})")
+                for u in uniques:
+                    self._unique_index(table, u)
+                self._conflicts[table] = uniques
+            self._conn.execute("INSERT OR IGNORE INTO crawler_state (id, last_crawled_at) VALUES (1, NULL)")
+            for row in self._conn.execute("SELECT tbl, col, kind FROM _pgrst_meta"):
+                self._kinds[(row["tbl"], row["col"])] = row["kind"]
+
+    def _unique_index(self, table: str, cols: list[str]) -> None:
+        name = f"ux_{table}_{'_'.join(cols)}"
+        self._conn.execute(
+            f"CREATE UNIQUE INDEX IF NOT EXISTS {_ident(name)} ON {_ident(table)} ({','.join(_ident(c) for c in cols)})"
+        )
+
+    def columns(self, table: str) -> list[str]:
+        if table not in self._cols:
+            rows = self._conn.execute(f"PRAGMA table_info({_ident(table)})").fetchall()
+            if not rows:
+                raise PgrstError(404, "42P01", f'relation "public.{table}" does not exist')
+            self._cols[table] = [r["name"] for r in rows]
+        return self._cols[table]
+
+    def kind(self, table: str, col: str) -> str | None:
+        return self._kinds.get((table, col))
+
+    def ensure_table(self, table: str) -> None:
+        _ident(table)
+        try:
+            self.columns(table)
+        except PgrstError:
+            # 스키마에 없는 테이블 → id 컬럼만 가진 테이블을 만들고 컬럼은 자동 추가
+            self._conn.execute(f"CREATE TABLE IF NOT EXISTS {_ident(table)} (id TEXT PRIMARY KEY, created_at TEXT)")
+            self._cols.pop(table, None)
+            self._conflicts.setdefault(table, [])
+
+    def ensure_column(self, table: str, col: str, sample) -> None:
+        if col in self.columns(table):
+            if sample is not None and self.kind(table, col) is None:
+                self._remember_kind(table, col, sample)
+            return
+        if isinstance(sample, bool):
+            sqltype = "INTEGER"
+        elif isinstance(sample, int):
+            sqltype = "INTEGER"
+        elif isinstance(sample, float):
+            sqltype = "REAL"
+        else:
+            sqltype = "TEXT"
+        self._conn.execute(f"ALTER TABLE {_ident(table)} ADD COLUMN {_ident(col)} {sqltype}")
+        self._cols.pop(table, None)
+        if sample is not None:
+            self._remember_kind(table, col, sample)
+
+    def _remember_kind(self, table: str, col: str, sample) -> None:
+        kind = "bool" if isinstance(sample, bool) else "json" if isinstance(sample, (dict, list)) else None
+        if kind:
+            self._kinds[(table, col)] = kind
+            self._conn.execute("INSERT OR REPLACE INTO _pgrst_meta (tbl, col, kind) VALUES (?, ?, ?)", (table, col, kind))
+
+    def _encode(self, v):
+        if isinstance(v, bool):
+            return 1 if v else 0
+        if isinstance(v, (dict, list)):
+            return json.dumps(v, ensure_ascii=False)
+        return v
+
+    def _decode_row(self, table: str, row: sqlite3.Row, cols: list[str]) -> dict:
+        out = {}
+        for c in cols:
+            v = row[c]
+            k = self.kind(table, c)
+            if v is not None and k == "json":
+                try:
+                    v = json.loads(v)
+                except Exception:
+                    pass
+            elif v is not None and k == "bool":
+                v = bool(v)
+            out[c] = v
+        return out
+
+    # ── 쿼리 구성 ──
+
+    def _where(self, table: str, filters: list[tuple[str, str]]) -> tuple[str, list]:
+        f = _Filters(self, table)
+        parts, args = [], []
+        for key, val in filters:
+            if key in ("or", "and"):
+                sql, a = f.logic(key, val)
+            elif key in ("not.or", "not.and"):
+                sql, a = f.logic(key[4:], val, negate=True)
+            else:
+                sql, a = f.condition(key, val)
+            parts.append(f"({sql})")
+            args.extend(a)
+        return (" WHERE " + " AND ".join(parts)) if parts else "", args
+
+    def _select_cols(self, table: str, select: str | None) -> list[str]:
+        cols = self.columns(table)
+        if not select or select.strip() == "*":
+            return cols
+        out = []
+        for c in _split_top(select):
+            c = c.split(":")[-1].strip()  # alias:col → col
+            if c == "*":
+                out.extend(cols)
+            elif c in cols:
+                out.append(c)
+            else:
+                raise PgrstError(400, "42703", f"column {table}.{c} does not exist")
+        return out
+
+    def _order(self, order: str | None) -> str:
+        if not order:
+            return ""
+        parts = []
+        for item in _split_top(order):
+            bits = item.split(".")
+            col = _ident(bits[0])
+            direction = "DESC" if "desc" in bits[1:] else "ASC"
+            nulls = " NULLS FIRST" if "nullsfirst" in bits[1:] else " NULLS LAST" if "nullslast" in bits[1:] else ""
+            parts.append(f"{col} {direction}{nulls}")
+        return " ORDER BY " + ", ".join(parts)
+
+    def select(self, table, filters, select, order, limit, offset, count: bool):
+        with self._lock:
+            cols = self._select_cols(table, select)
+            where, args = self._where(table, filters)
+            sql = f"SELECT {','.join(_ident(c) for c in cols)} FROM {_ident(table)}{where}{self._order(order)}"
+            if limit is not None or offset:
+                sql += f" LIMIT {int(limit) if limit is not None else -1} OFFSET {int(offset or 0)}"
+            rows = [self._decode_row(table, r, cols) for r in self._conn.execute(sql, args)]
+            total = None
+            if count:
+                total = self._conn.execute(f"SELECT COUNT(*) FROM {_ident(table)}{where}", args).fetchone()[0]
+            return rows, total
+
+    def insert(self, table, rows, on_conflict, resolution):
+        with self._lock:
+            self.ensure_table(table)
+            if not rows:
+                return []
+            for r in rows:
+                if not isinstance(r, dict):
+                    raise PgrstError(400, "PGRST102", "payload must be an object or array of objects")
+            keys = list(rows[0].keys())
+            if any(list(r.keys()) != keys and set(r.keys()) != set(keys) for r in rows):
+                raise PgrstError(400, "PGRST102", "All object keys must match")
+            for k in keys:
+                sample = next((r[k] for r in rows if r.get(k) is not None), None)
+                self.ensure_column(table, k, sample)
+            cols = self.columns(table)
+
+            # 기본값: id(uuid) / created_at
+            extra = []
+            if "id" in cols and "id" not in keys and self._conn.execute(
+                f"SELECT type FROM pragma_table_info('{table}') WHERE name='id'"
+            ).fetchone()[0].upper() == "TEXT":
+                extra.append("id")
+            if "created_at" in cols and "created_at" not in keys:
+                extra.append("created_at")
+            all_keys = keys + extra
+
+            conflict_cols = None
+            if on_conflict:
+                conflict_cols = [c.strip() for c in on_conflict.split(",") if c.strip()]
+                self._unique_index(table, conflict_cols)
+            elif resolution:
+                conflict_cols = [r["name"] for r in self._conn.execute(
+                    f"SELECT name FROM pragma_table_info('{table}') WHERE pk > 0 ORDER BY pk")]
+
+            sql = f"INSERT INTO {_ident(table)} ({','.join(_ident(k) for k in all_keys)}) VALUES ({','.join('?' for _ in all_keys)})"
+            if conflict_cols:
+                target = ",".join(_ident(c) for c in conflict_cols)
+                updates = [k for k in keys if k not in conflict_cols]
+                if resolution == "ignore-duplicates" or not updates:
+                    sql += f" ON CONFLICT ({target}) DO NOTHING"
+                else:
+                    sql += f" ON CONFLICT ({target}) DO UPDATE SET " + ", ".join(
+                        f"{_ident(k)}=excluded.{_ident(k)}" for k in updates
+                    )
+            sql += " RETURNING *"
+
+            out = []
+            self._conn.execute("BEGIN")
+            try:
+                for r in rows:
+                    vals = [self._encode(r.get(k)) for k in keys]
+                    for k in extra:
+                        vals.append(uuid.uuid4().hex if k == "id" else _now())
+                    cur = self._conn.execute(sql, vals)
+                    got = cur.fetchone()
+                    if got is not None:
+                        out.append(self._decode_row(table, got, self.columns(table)))
+                self._conn.execute("COMMIT")
+            except sqlite3.IntegrityError as e:
+                self._conn.execute("ROLLBACK")
+                raise PgrstError(409, "23505", f"duplicate key value violates unique constraint: {e}")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            return out
+
+    def rpc(self, fn: str, args: dict | None) -> list[dict]:
+        if fn not in RPC_FUNCTIONS:
+            raise PgrstError(404, "PGRST202", f"Could not find the function public.{fn}")
+        sql, defaults = RPC_FUNCTIONS[fn]
+        params = {**defaults, **(args or {})}
+        with self._lock:
+            try:
+                cur = self._conn.execute(sql, params)
+            except sqlite3.ProgrammingError as e:
+                raise PgrstError(400, "PGRST202", f"invalid arguments for {fn}: {e}")
+            rows = [dict(r) for r in cur.fetchall()]
+        for r in rows:
+            if isinstance(r.get("examples"), str):
+                r["examples"] = json.loads(r["examples"])
+        return rows
+
+    def update(self, table, filters, payload):
+        with self._lock:
+            if not isinstance(payload, dict) or not payload:
+                raise PgrstError(400, "PGRST102", "PATCH payload must be a non-empty object")
+            for k, v in payload.items():
+                self.ensure_column(table, k, v)
+            where, args = self._where(table, filters)
+            sets = ", ".join(f"{_ident(k)}=?" for k in payload)
+            vals = [self._encode(v) for v in payload.values()]
+            try:
+                cur = self._conn.execute(f"UPDATE {_ident(table)} SET {sets}{where} RETURNING *", vals + args)
+            except sqlite3.IntegrityError as e:
+                raise PgrstError(409, "23505", f"duplicate key value violates unique constraint: {e}")
+            cols = self.columns(table)
+            return [self._decode_row(table, r, cols) for r in cur.fetchall()]
+
+    def delete(self, table, filters):
+        with self._lock:
+            where, args = self._where(table, filters)
+            cur = self._conn.execute(f"DELETE FROM {_ident(table)}{where} RETURNING *", args)
+            cols = self.columns(table)
+            return [self._decode_row(table, r, cols) for r in cur.fetchall()]
+
+
+# ── HTTP 핸들러 ────────────────────────────────────────────────
+
+_RESERVED = {"select", "order", "limit", "offset", "on_conflict", "columns"}
+
+
+class PostgrestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive (커넥션 풀 효과 측정용)
+    store: SqliteStore = None  # type: ignore[assignment]
+    latency_ms: float = 0.0
+    verbose: bool = False
+
+    def log_message(self, fmt, *args):
+        if self.verbose:
+            super().log_message(fmt, *args)
+
+    def _prefer(self) -> dict[str, str]:
+        out = {}
+        for part in (self.headers.get("Prefer") or "").split(","):
+            k, _, v = part.strip().partition("=")
+            if k:
+                out[k] = v
+        return out
+
+    def _send(self, status: int, body=None, headers: dict | None = None, head_only: bool = False) -> None:
+        raw = b"" if body is None else json.dumps(body, ensure_ascii=False, default=str).encode("utf-8")
+        self.send_response(status)
+        if body is not None:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.send_header("Content-Length", "0" if head_only else str(len(raw)))
+        self.end_headers()
+        if raw and not head_only:
+            self.wfile.write(raw)
+
+    def _read_json(self):
+        n = int(self.headers.get("Content-Length") or 0)
+        if not n:
+            return None
+        try:
+            return json.loads(self.rfile.read(n).decode("utf-8"))
+        except Exception:
+            raise PgrstError(400, "PGRST102", "invalid JSON body")
+
+    def _route(self) -> tuple[str, list[tuple[str, str]], dict[str, str]]:
+        parts = urlsplit(self.path)
+        if not parts.path.startswith("/rest/v1/"):
+            raise PgrstError(404, "PGRST125", f"invalid path: {parts.path}")
+        table = parts.path[len("/rest/v1/"):].strip("/")
+        filters, reserved = [], {}
+        for k, v in parse_qsl(parts.query, keep_blank_values=True):
+            if k in _RESERVED:
+                reserved[k] = v
+            else:
+                filters.append((k, v))
+        return table, filters, reserved
+
+    def _handle(self, method: str) -> None:
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000.0)
+        try:
+            table, filters, reserved = self._route()
+            prefer = self._prefer()
+            if table.startswith("rpc/"):
+                args = self._read_json() if method == "POST" else dict(filters)
+                self._send(200, self.store.rpc(table[4:], args))
+                return
+            ret = prefer.get("return", "minimal" if method in ("POST", "PATCH", "DELETE") else "representation")
+            store = self.store
+
+            if method in ("GET", "HEAD"):
+                store.columns(table)
+                limit, offset = reserved.get("limit"), reserved.get("offset")
+                rng = self.headers.get("Range")
+                if rng and "-" in rng:
+                    a, _, b = rng.partition("-")
+                    offset = int(a)
+                    if b:
+                        limit = int(b) - int(a) + 1
+                want_count = prefer.get("count") in ("exact", "planned", "estimated")
+                rows, total = store.select(
+                    table, filters, reserved.get("select"), reserved.get("order"),
+                    limit, offset, want_count,
+                )
+                start = int(offset or 0)
+                cr = f"{start}-{start + len(rows) - 1}" if rows else "*"
+                headers = {"Content-Range": f"{cr}/{total if total is not None else '*'}"}
+                self._send(200, rows, headers, head_only=(method == "HEAD"))
+                return
+
+            if method == "POST":
+                payload = self._read_json()
+                rows = payload if isinstance(payload, list) else [payload] if payload is not None else []
+                out = store.insert(table, rows, reserved.get("on_conflict"), prefer.get("resolution"))
+                status = 201
+            elif method == "PATCH":
+                out = store.update(table, filters, self._read_json())
+                status = 200
+            else:
+                out = store.delete(table, filters)
+                status = 200
+
+            headers = {"Content-Range": f"*/{len(out)}"}
+            if ret == "representation":
+                self._send(status, out, headers)
+            else:
+                self._send(204 if status == 200 else status, None, headers)
+
+        except PgrstError as e:
+            self._send(e.status, {"code": e.code, "message": e.message, "details": None, "hint": None})
+        except Exception as e:
+            self._send(500, {"code": "XX000", "message": str(e), "details": None, "hint": None})
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_HEAD(self):
+        self._handle("HEAD")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_PATCH(self):
+        self._handle("PATCH")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+
+def serve(db_path: str, host: str = "127.0.0.1", port: int = 54321, latency_ms: float = 0.0, verbose: bool = False):
+    """서버를 만들어 반환합니다. (serve_forever는 호출 측에서 실행)"""
+    handler = type("BoundPostgrestHandler", (PostgrestHandler,), {
+        "store": SqliteStore(db_path),
+        "latency_ms": float(latency_ms),
+        "verbose": verbose,
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite 기반 로컬 PostgREST 대체 서버")
+    parser.add_argument("--db", default="local_supabase.sqlite", help="SQLite 파일 경로 (:memory: 가능)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=54321)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="요청마다 추가할 인위적 지연 (ms)")
+    parser.add_argument("--verbose", action="store_true", help="요청 로그 출력")
+    args = parser.parse_args()
+
+    server = serve(args.db, args.host, args.port, args.latency_ms, args.verbose)
+    print("=" * 55)
+    print("[local_postgrest] 로컬 PostgREST 서버 시작")
+    print(f"  DB       : {args.db}")
+    print(f"  URL      : http://{args.host}:{args.port}  (SUPABASE_URL로 지정)")
+    print(f"  지연 주입: {args.latency_ms}ms")
+    print("  종료: Ctrl+C")
+    print("=" * 55)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n[local_postgrest] 종료합니다.")
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
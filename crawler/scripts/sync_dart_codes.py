@@ -56,14 +56,14 @@ def update_dart_code_success(company_id: str, corp_code: str):
     supabase.table("companies").update({
         "dart_corp_code": corp_code,
         "dart_sync_status": "SUCCESS"
-    }).eq("id", company_id).execute()
+    }, returning="minimal").eq("id", company_id).execute()
 
 
 def update_dart_code_not_found(company_id: str):
     """매핑 실패: dart_corp_code는 NULL 유지, 상태를 NOT_FOUND로 업데이트."""
     supabase.table("companies").update({
         "dart_sync_status": "NOT_FOUND"
-    }).eq("id", company_id).execute()
+    }, returning="minimal").eq("id", company_id).execute()
 
 
 # ==============================
@@ -112,6 +112,7 @@ def record_to_industry_targets(corp_code: str, corp_name: str, ksic_code: str):
         },
         on_conflict="corp_code",
         ignore_duplicates=False,  # 기존 데이터 업데이트를 위해 False로 변경
+        returning="minimal",
     ).execute()
 
 
@@ -122,10 +123,14 @@ def cleanup_stale_targets():
     """
     try:
         threshold_date = (datetime.now(timezone.utc) - timedelta(days=180)).isoformat()
-        res = supabase.table("industry_targets").delete().lt("updated_at", threshold_date).execute()
-        
-        # supabase client response handling logic for postgrest-py
-        deleted_count = len(res.data) if hasattr(res, 'data') and res.data else 0
+        # 삭제된 row는 내려받지 않고 건수(count)만 받습니다.
+        res = (
+            supabase.table("industry_targets")
+            .delete(count="exact", returning="minimal")
+            .lt("updated_at", threshold_date)
+            .execute()
+        )
+        deleted_count = res.count or 0
         print(f"[cleanup] 오랫동안 갱신되지 않은 더미 기업 {deleted_count}개를 DB에서 삭제했습니다.")
     except Exception as e:
         print(f"  ⚠️  [cleanup] 만료 데이터 삭제 중 오류 발생: {e}")
@@ -27,7 +27,7 @@ import os
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from repositories.db import supabase
+from repositories.db import supabase, stream_rows
 
 
 import re
@@ -52,13 +52,17 @@ def _normalize_company_name(name: str) -> str:
 def load_industry_targets() -> dict[str, dict]:
     """
     industry_targets 테이블의 모든 기업을 조회합니다.
+    (PostgREST max-rows 제한에 잘리지 않도록 corp_code 기준으로 페이지 단위 조회)
     Returns:
         dict: { corp_code: {"company_name": str, "corp_code": str} }
     """
-    result = supabase.table("industry_targets").select("corp_code, company_name").execute()
+    rows = stream_rows(
+        lambda: supabase.table("industry_targets").select("corp_code, company_name"),
+        key="corp_code",
+    )
     return {
         row["corp_code"]: {"company_name": row["company_name"], "corp_code": row["corp_code"]}
-        for row in (result.data or [])
+        for row in rows
     }
 
 
@@ -84,10 +88,12 @@ def sync_potential_companies(targets: dict[str, dict]) -> tuple[int, int, int]:
     # companies 테이블에서 타겟 company_name 목록에 해당하는 기업을 한 번에 조회
     # (부분 일치 검색을 위해 전체 companies를 가져와서 정규화 기반 매핑 시도)
     print("  DB에서 companies 전체 목록 로드 및 정규화 매핑 준비 중...")
-    result = supabase.table("companies").select("id, company_name, dart_corp_code, company_role").execute()
-    all_companies = result.data or []
+    all_companies = stream_rows(
+        lambda: supabase.table("companies").select("id, company_name, dart_corp_code, company_role"),
+        key="id",
+    )
 
-    # companies 결과를 정규화된 company_name 기준으로 인덱싱
+    # companies 결과를 정규화된 company_name 기준으로 인덱싱 (페이지 단위로 읽으며 바로 적재)
     company_map = {_normalize_company_name(row["company_name"]): row for row in all_companies}
 
     for corp_code, target_info in targets.items():
@@ -113,14 +119,14 @@ def sync_potential_companies(targets: dict[str, dict]) -> tuple[int, int, int]:
             if not company.get("dart_corp_code"):
                 supabase.table("companies").update({
                     "dart_corp_code": corp_code
-                }).eq("id", company["id"]).execute()
+                }, returning="minimal").eq("id", company["id"]).execute()
             continue
 
         # POTENTIAL로 업데이트 + dart_corp_code 복사
         supabase.table("companies").update({
             "company_role":   "POTENTIAL",
             "dart_corp_code": corp_code,  # industry_targets 의 corp_code 를 복사
-        }).eq("id", company["id"]).execute()
+        }, returning="minimal").eq("id", company["id"]).execute()
 
         print(f"  ♻️  POTENTIAL 업데이트 + corp_code 복사: {corp_name} ({corp_code})")
         updated += 1
@@ -2,64 +2,57 @@
 services/article_service.py — 기사 메타 저장 서비스
 
 역할:
-    - URL 중복 검사 후 신규 기사만 articles 테이블에 등록합니다.
+    - 기사 여러 건을 save_articles_bulk()로 배열 INSERT 1회에 저장합니다. (이미 있는 URL은 무시)
     - 저작권/API 약관 준수를 위해 기사 제목과 본문은 DB에 저장하지 않습니다.
       (분석은 메모리에서 즉석으로 처리하며, DB에는 URL과 발행일만 남깁니다.)
     - scout_status를 'done'으로 설정합니다. (크롤링 즉시 분석하므로 pending 단계 없음)
 """
 
 import hashlib
-from repositories.article_repository import article_exists, insert_article
+from crawlers.canonical_url import canonical_url
+from repositories.article_repository import insert_articles_bulk
 
 
 def generate_hash(url: str, published_at_iso: str) -> str:
     """
     중복 기사 판별을 위한 해시값을 생성합니다.
-    URL과 발행 시각을 결합하여 SHA-256으로 변환합니다.
+    정규화 URL과 발행 시각을 결합하여 SHA-256으로 변환합니다.
+    (추적 파라미터나 네이버 경로만 다른 같은 기사가 같은 해시를 갖도록)
     """
-    base = f"{url}|{published_at_iso}"
+    base = f"{canonical_url(url)}|{published_at_iso}"
     return hashlib.sha256(base.encode("utf-8")).hexdigest()
 
 
-def process_article(article: dict):
-    """
-    기사 1건을 처리하여 articles 테이블에 메타 정보만 저장합니다.
-
-    처리 흐름:
-        1) URL이 없으면 None 반환 (유효하지 않은 기사)
-        2) 이미 수집한 URL이면 None 반환 (중복 기사)
-        3) 신규 기사이면 URL, 발행일, content_hash만 INSERT
-           - title, content는 빈 문자열로 저장 (DB NOT NULL 제약 대응)
-           - 기사 원문은 즉석 분석 후 메모리에서 바로 버립니다.
-
-    반환값:
-        성공: DB에 저장된 기사 row dict (id 포함)
-        실패 또는 중복: None
-    """
-    url = article.get("url")
-    if not url:
-        return None
-
-    # 이미 수집된 URL이면 건너뜁니다.
-    if article_exists(url):
-        return None
-
+def build_article_row(article: dict) -> dict:
+    """수집 기사 1건 → articles 테이블 row (메타 정보만)"""
+    url = canonical_url(article["url"])
     published_at_iso = article["published_at"].isoformat()
     content_hash = generate_hash(url, published_at_iso)
 
-    data = {
+    raw_data = {"source": "naver_search_api"}  # 수집 출처 기록 (추후 확장 가능)
+    if article.get("original_url"):
+        raw_data["original_url"] = article["original_url"]  # 언론사 원문 URL (url은 정규화된 대표 URL)
+
+    return {
         "title":        "",                      # 제목은 DB에 저장하지 않습니다. (저작권 보호)
         "content":      "",                      # 본문은 DB에 저장하지 않습니다. (저작권 보호)
         "url":          url,
         "published_at": published_at_iso,
         "content_hash": content_hash,
         "scout_status": "done",                  # 크롤링과 동시에 분석이 끝나므로 'done'으로 바로 저장
-        "raw_data": {
-            "source": "naver_search_api",        # 수집 출처 기록 (추후 확장 가능)
-        }
+        "raw_data":     raw_data,
     }
 
-    result = insert_article(data)
-    if getattr(result, "data", None):
-        return result.data[0]
-    return None
\ No newline at end of file
+
+def save_articles_bulk(articles: list[dict]) -> dict[str, dict]:
+    """
+    기사 여러 건의 메타 정보를 한 번의 요청으로 저장합니다. (url 충돌 시 무시)
+
+    반환값: {정규화 url: DB에 저장된 기사 row dict (id 포함)}
+        이미 저장된 URL은 포함되지 않습니다. 겹치는 두 실행이 같은 기사를 동시에
+        저장하려 해도 한쪽만 row를 돌려받으므로 같은 기사를 두 번 분석하지 않습니다.
+    """
+    rows = [build_article_row(a) for a in articles if a.get("url")]
+    if not rows:
+        return {}
+    return insert_articles_bulk(rows)
@@ -9,17 +9,29 @@ from __future__ import annotations
 
 from datetime import datetime, timedelta
 import hashlib
+import random
 import re
 import json
+import time
 
-from config import OPENAI_API_KEY
+from config import OPENAI_API_KEY, OPENAI_RPM, OPENAI_TPM, OPENAI_RETRY_MAX
+import openai
 from openai import OpenAI
 
+from llm.rate_limiter import TokenRateLimiter, estimate_tokens
 from repositories.db import supabase
 
 # API 키는 config 패키지(.env) 에서만 로드합니다.
 client = OpenAI(api_key=OPENAI_API_KEY)
 
+# 묶음 분석 호출은 프로세스 전체가 하나의 RPM/TPM 제한기를 공유합니다.
+# 재시도는 SDK 대신 여기서 직접 하여 429를 제한기에 반영합니다.
+_batch_client = client.with_options(max_retries=0)
+_llm_limiter = TokenRateLimiter(OPENAI_RPM, OPENAI_TPM)
+
+BATCH_MODEL = "gpt-4o-mini"
+BATCH_OUTPUT_TOKENS_EST = 2000  # 묶음(15건) 응답 토큰 추정치 — 실제 사용량으로 사후 보정
+
 # -----------------------------
 # 저장/승격 기준
 # -----------------------------
@@ -216,7 +228,7 @@ def upsert_general_company(company_name: str) -> None:
         "updated_at":       now,
     }
     try:
-        supabase.table("companies").insert(payload).execute()
+        supabase.table("companies").insert(payload, returning="minimal").execute()
         print(f"  🏢 신규 기업 GENERAL 등록: {company_name}")
     except Exception:
         # 스키마 제약 오류 등 예외 발생 시 최소 필드만으로 재시도합니다.
@@ -225,20 +237,19 @@ def upsert_general_company(company_name: str) -> None:
             "company_role": ROLE_GENERAL,
             "created_at":   now,
         }
-        supabase.table("companies").insert(minimal).execute()
+        supabase.table("companies").insert(minimal, returning="minimal").execute()
 
 
-def upsert_signal(
+def build_signal_row(
     article_id: str | None,
     sig: dict,
     source: str = "news",
     rcept_no: str | None = None,
     company_role: str | None = None,
-) -> None:
+) -> dict:
     """
-    시그널 1건을 signals 테이블에 저장합니다.
+    시그널 1건을 signals 테이블 row(dict)로 변환합니다.
 
-    - event_hash가 같은 시그널이 이미 있으면 덮어쓰지 않습니다. (UPSERT)
     - 뉴스 시그널: article_id 채우고, rcept_no = NULL
     - DART 시그널: rcept_no 채우고, article_id = NULL, company_role은 source_role에서 전달
     - company_role이 None이면 뉴스 출신으로 판단하여 role을 조회해 채웁니다.
@@ -273,7 +284,24 @@ def upsert_signal(
     if rcept_no:
         data["rcept_no"] = rcept_no
 
-    supabase.table("signals").upsert(data, on_conflict="event_hash").execute()
+    return data
+
+
+def upsert_signal(
+    article_id: str | None,
+    sig: dict,
+    source: str = "news",
+    rcept_no: str | None = None,
+    company_role: str | None = None,
+) -> None:
+    """
+    시그널 1건을 signals 테이블에 저장합니다.
+
+    - event_hash가 같은 시그널이 이미 있으면 덮어쓰지 않습니다. (UPSERT)
+    - row 구성 규칙은 build_signal_row()를 따릅니다.
+    """
+    data = build_signal_row(article_id, sig, source=source, rcept_no=rcept_no, company_role=company_role)
+    supabase.table("signals").upsert(data, on_conflict="event_hash", returning="minimal").execute()
 
 
 def _build_batch_prompt(items: list[dict]) -> str:
@@ -327,38 +355,91 @@ def _build_batch_prompt(items: list[dict]) -> str:
 """.strip()
 
 
+def _retry_after_sec(e: Exception) -> float | None:
+    """429 응답의 retry-after-ms / retry-after 헤더(초)를 읽습니다."""
+    headers = getattr(getattr(e, "response", None), "headers", None) or {}
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000.0
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except (TypeError, ValueError):
+        pass
+    return None
+
+
 def extract_signals_batch(items: list[dict]) -> dict:
     """
     returns: {"results":[{"article_id":..., "signals":[...]} ...]}
+
+    여러 스레드에서 동시에 호출해도 _llm_limiter가 RPM/TPM을 지킵니다.
+    429는 제한기 속도를 낮추고 재시도, 연결 오류/5xx는 지수 백오프로 재시도합니다.
     """
     prompt = _build_batch_prompt(items)
-    resp = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {"role": "system", "content": "Return ONLY valid JSON."},
-            {"role": "user", "content": prompt}
-        ],
-        temperature=0.2,
-        response_format={"type": "json_object"},
-    )
-    return json.loads(resp.choices[0].message.content)
-
-
-def analyze_batch(items: list[dict]) -> dict:
+    messages = [
+        {"role": "system", "content": "Return ONLY valid JSON."},
+        {"role": "user", "content": prompt}
+    ]
+    estimated = estimate_tokens(prompt) + BATCH_OUTPUT_TOKENS_EST
+
+    for attempt in range(OPENAI_RETRY_MAX + 1):
+        _llm_limiter.acquire(estimated)
+        try:
+            resp = _batch_client.chat.completions.create(
+                model=BATCH_MODEL,
+                messages=messages,
+                temperature=0.2,
+                response_format={"type": "json_object"},
+            )
+        except openai.RateLimitError as e:
+            _llm_limiter.settle(estimated, 0)  # 거절된 요청은 토큰을 쓰지 않음
+            if getattr(e, "code", None) == "insufficient_quota" or attempt >= OPENAI_RETRY_MAX:
+                raise
+            delay = _llm_limiter.on_rate_limited(_retry_after_sec(e))
+            print(f"⏳ OpenAI 429 — {delay:.1f}초 대기 후 재시도 ({attempt + 1}/{OPENAI_RETRY_MAX}, 속도 {_llm_limiter.factor:.0%})")
+            continue
+        except (openai.APIConnectionError, openai.InternalServerError) as e:
+            _llm_limiter.settle(estimated, 0)
+            if attempt >= OPENAI_RETRY_MAX:
+                raise
+            delay = random.uniform(0, min(30.0, 2 ** attempt))
+            print(f"⚠️ OpenAI 일시 오류 — {delay:.1f}초 후 재시도 ({attempt + 1}/{OPENAI_RETRY_MAX}): {e}")
+            time.sleep(delay)
+            continue
+
+        usage = getattr(resp, "usage", None)
+        _llm_limiter.settle(estimated, getattr(usage, "total_tokens", None) or estimated)
+        _llm_limiter.on_success()
+        return json.loads(resp.choices[0].message.content)
+
+
+def analyze_batch(items: list[dict], writer=None) -> dict:
     """
     items: [{"article_id","title","description","url"}] (<=15개)
     DB에 텍스트 저장 X. 여기서만 사용하고 버림.
 
-    반환: {"signals_saved": N, "general_registered": M, "articles": len}
+    writer: services.signal_writer.SignalWriter (선택)
+        - 없으면 이 배치 전용 writer를 만들어 끝에서 배열 upsert 1회로 저장합니다.
+        - 넘기면 호출 측 writer에 적재만 하고 flush 시점은 호출 측이 정합니다.
+
+    반환: {"signals_saved": N, "general_registered": M, "articles": len, "signals_failed": F,
+           "by_article": {article_id: [저장 대상 시그널의 confidence, ...]}}
     ※ general_registered는 GENERAL로 등록된 기업 수를 의미합니다.
+    ※ by_article은 검색 쿼리별 성과 집계(run_crawler)에 씁니다.
     """
-    out = {"signals_saved": 0, "general_registered": 0, "articles": len(items)}
+    from services.signal_writer import SignalWriter  # 순환 import 방지
+
+    out = {"signals_saved": 0, "general_registered": 0, "articles": len(items), "signals_failed": 0, "by_article": {}}
 
     parsed = extract_signals_batch(items) or {}
     results = parsed.get("results", []) or []
 
     by_id = {r.get("article_id"): (r.get("signals") or []) for r in results}
 
+    own_writer = writer is None
+    if own_writer:
+        writer = SignalWriter()
+
     for it in items:
         aid = it["article_id"]
         signals = by_id.get(aid, []) or []
@@ -367,9 +448,10 @@ def analyze_batch(items: list[dict]) -> dict:
             if float(sig.get("confidence", 1)) < CONF_SIGNAL_SAVE:
                 continue
 
-            # 1) signals 저장 (중복은 event_hash로 방지)
-            upsert_signal(aid, sig, source="news")
+            # 1) signals 버퍼에 적재 (중복은 event_hash로 방지)
+            writer.add(aid, sig, source="news")
             out["signals_saved"] += 1
+            out["by_article"].setdefault(aid, []).append(float(sig.get("confidence", 1)))
 
             # 2) GENERAL 등록: 1차 필터 (긍정이면 즉시 등록)
             cname = sig.get("company_name", "")
@@ -377,4 +459,11 @@ def analyze_batch(items: list[dict]) -> dict:
                 upsert_general_company(cname)
                 out["general_registered"] += 1
 
-    return out
\ No newline at end of file
+    if own_writer:
+        res = writer.close()
+        out["signals_saved"] = res.saved
+        out["signals_failed"] = len(res.failed)
+        for row, err in res.failed:
+            print(f"  ❌ 시그널 저장 실패: {row.get('company_name')} / {row.get('event_type')} → {err[:200]}")
+
+    return out
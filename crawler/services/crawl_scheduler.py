@@ -0,0 +1,176 @@
+"""
+services/crawl_scheduler.py — 키워드(검색 쿼리)별 수집 주기
+
+역할:
+    - 쿼리마다 기사 발행 빈도(시간당 기사 수)를 추정합니다.
+      검색할 때마다 "지난 검색 이후 새로 나온 기사 수 / 지난 검색 이후 경과 시간"을 감쇠 누적합니다.
+      (처음 검색한 쿼리는 받은 기사들의 published_at 간격으로 추정)
+    - 전체 검색 예산(시간당 NEWS_CRAWL_BUDGET_PER_HOUR회)을 쿼리별 검색 주기로 나눕니다.
+      기사 지연(발행 → 수집)의 가중 합이 가장 작아지도록, 검색 빈도를 sqrt(가중치 × 발행 빈도)에 비례하게 둡니다.
+    - 가중치: 고객사(managed_clients) 키워드 CLIENT_WEIGHT배,
+              최근 HOT_SIGNAL_HOURS 안에 시그널이 나온 쿼리 HOT_WEIGHT배,
+              확장 쿼리 EXPANSION_WEIGHT배
+    - 주기는 NEWS_MIN_INTERVAL_MIN ~ NEWS_MAX_INTERVAL_MIN 범위로 자릅니다.
+
+상태는 crawler_query_stats(rate_events, rate_hours, poll_interval_min)에 저장합니다.
+"""
+
+from __future__ import annotations
+
+import math
+from datetime import datetime, timedelta, timezone
+from typing import Iterable
+
+from config import NEWS_CRAWL_BUDGET_PER_HOUR, NEWS_MIN_INTERVAL_MIN, NEWS_MAX_INTERVAL_MIN
+
+RATE_DECAY = 0.9            # 검색할 때마다 이전 관측(기사 수, 시간)에 곱하는 값
+RATE_PRIOR_EVENTS = 1.0     # 관측이 적은 쿼리의 발행 빈도 사전값: 1건 / RATE_PRIOR_HOURS시간
+RATE_PRIOR_HOURS = 24.0
+
+CLIENT_WEIGHT = 4.0
+HOT_WEIGHT = 3.0
+HOT_SIGNAL_HOURS = 24
+EXPANSION_WEIGHT = 0.5
+
+
+def _parse_ts(value) -> datetime | None:
+    if not value:
+        return None
+    ts = datetime.fromisoformat(str(value))
+    return ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
+
+
+def publish_rate(row: dict | None) -> float:
+    """시간당 기사 수 추정값"""
+    row = row or {}
+    events = float(row.get("rate_events") or 0) + RATE_PRIOR_EVENTS
+    hours = float(row.get("rate_hours") or 0) + RATE_PRIOR_HOURS
+    return events / hours
+
+
+def observe(
+    prev: dict | None,
+    new_times: list[datetime],
+    window_start: datetime | None,
+    now: datetime,
+) -> dict:
+    """
+    이번 검색 관측을 반영한 {"rate_events", "rate_hours"}를 반환합니다.
+
+    new_times   : 이번에 받은 기사 중 워터마크 이후 기사의 발행 시각 (UTC naive)
+    window_start: 관측 구간 시작 — 지난 검색 시각, 없으면 워터마크 (UTC naive)
+                  둘 다 없으면(첫 검색) 받은 기사들의 발행 간격으로 추정합니다.
+    """
+    prev = prev or {}
+    events, hours = 0.0, 0.0
+    now_naive = now.astimezone(timezone.utc).replace(tzinfo=None)
+    if window_start is not None:
+        events = float(len(new_times))
+        hours = max(0.0, (now_naive - window_start).total_seconds() / 3600)
+    elif len(new_times) >= 2:
+        events = float(len(new_times) - 1)
+        hours = (max(new_times) - min(new_times)).total_seconds() / 3600
+    return {
+        "rate_events": float(prev.get("rate_events") or 0) * RATE_DECAY + events,
+        "rate_hours":  float(prev.get("rate_hours") or 0) * RATE_DECAY + hours,
+    }
+
+
+def query_weights(
+    queries: Iterable[str],
+    origins: dict[str, tuple[str, str | None]],
+    stats: dict[str, dict],
+    client_names: set[str],
+    now: datetime,
+) -> dict[str, float]:
+    weights = {}
+    for q in queries:
+        base, term = origins.get(q, (q, None))
+        w = 1.0
+        if base in client_names:
+            w *= CLIENT_WEIGHT
+        last_signal = _parse_ts((stats.get(q) or {}).get("last_signal_at"))
+        if last_signal is not None and now - last_signal < timedelta(hours=HOT_SIGNAL_HOURS):
+            w *= HOT_WEIGHT
+        if term is not None:
+            w *= EXPANSION_WEIGHT
+        weights[q] = w
+    return weights
+
+
+def plan_intervals(
+    queries: Iterable[str],
+    stats: dict[str, dict],
+    weights: dict[str, float],
+    budget_per_hour: float = NEWS_CRAWL_BUDGET_PER_HOUR,
+    min_interval_min: float = NEWS_MIN_INTERVAL_MIN,
+    max_interval_min: float = NEWS_MAX_INTERVAL_MIN,
+) -> dict[str, float]:
+    """
+    쿼리별 검색 주기(분)를 정합니다.
+
+    시간당 검색 횟수 f_i ∝ sqrt(w_i × λ_i), Σ f_i = budget_per_hour.
+    범위를 벗어난 쿼리는 경계값으로 고정하고 남은 예산을 나머지에 다시 나눕니다.
+    """
+    queries = list(dict.fromkeys(queries))
+    if not queries:
+        return {}
+    f_min = 60.0 / max_interval_min
+    f_max = 60.0 / min_interval_min
+    score = {q: math.sqrt(weights.get(q, 1.0) * publish_rate(stats.get(q))) for q in queries}
+
+    freq: dict[str, float] = {}
+    free = set(queries)
+    budget = float(budget_per_hour)
+    for _ in range(len(queries)):
+        total = sum(score[q] for q in free)
+        if not free or total <= 0:
+            break
+        clamped = False
+        for q in list(free):
+            f = budget * score[q] / total
+            if f < f_min or f > f_max:
+                freq[q] = f_min if f < f_min else f_max
+                free.discard(q)
+                clamped = True
+        if not clamped:
+            for q in free:
+                freq[q] = budget * score[q] / total
+            break
+        budget = max(0.0, float(budget_per_hour) - sum(freq.values()))
+    for q in free:
+        freq.setdefault(q, f_min)
+
+    return {q: 60.0 / freq[q] for q in queries}
+
+
+def due_queries(
+    queries: Iterable[str],
+    stats: dict[str, dict],
+    intervals: dict[str, float],
+    now: datetime,
+) -> list[str]:
+    """마지막 검색 후 주기가 지난 쿼리 (한 번도 검색하지 않은 쿼리 포함)"""
+    out = []
+    for q in queries:
+        last = _parse_ts((stats.get(q) or {}).get("last_called_at"))
+        if last is None or now - last >= timedelta(minutes=intervals.get(q, 0)):
+            out.append(q)
+    return out
+
+
+def next_due_at(
+    queries: Iterable[str],
+    stats: dict[str, dict],
+    intervals: dict[str, float],
+) -> datetime | None:
+    """다음으로 검색 주기가 돌아오는 시각 (UTC)"""
+    soonest = None
+    for q in queries:
+        last = _parse_ts((stats.get(q) or {}).get("last_called_at"))
+        if last is None:
+            continue
+        at = last + timedelta(minutes=intervals.get(q, 0))
+        if soonest is None or at < soonest:
+            soonest = at
+    return soonest
@@ -5,22 +5,64 @@ services/crawler_service.py — 뉴스 수집 & 즉석 분석 서비스
     1. DB에서 모니터링 키워드 목록을 읽어옵니다.
     2. 키워드마다 네이버 뉴스 API를 호출하여 기사를 수집합니다.
     3. 이전에 수집한 기사는 걸러내고, 새 기사만 DB에 메타(URL, 발행일)를 저장합니다.
+       (키워드별 수집 결과의 URL을 in_ 조회 몇 번으로 한꺼번에 중복 확인합니다.)
        ※ 기사의 제목/본문은 저작권 보호를 위해 DB에 저장하지 않습니다.
     4. 수집된 기사 원문(제목/요약)을 메모리에서 즉시 LLM으로 분석하여
        시그널(signals)과 잠재 기업 정보를 DB에 저장합니다.
+
+파이프라인 (단계마다 동시에 진행):
+    [검색] fetch_many 스레드 풀
+      → [중복 확인/메타 저장] run_crawler 메인 스레드
+      → (대기열, 최대 ARTICLE_QUEUE_MAX건)
+      → [LLM 분석] 분석 스레드 — 15건이 모이거나 LLM_BATCH_LINGER_SEC가 지나면 묶음을 만들어
+                  최대 OPENAI_CONCURRENCY개를 동시에 분석 (RPM/TPM 제한은 batch_signal_service가 담당)
+      → [시그널 저장] BackgroundSignalWriter 스레드 — 배열 upsert
+    대기열이 가득 차면 앞 단계가 기다리므로, 기사 원문이 메모리에 무한정 쌓이지 않습니다.
+
+유사 기사 묶기 (services/near_duplicate.py):
+    여러 매체에 전재된 같은 기사는 대표 1건만 LLM 분석하고,
+    나머지는 article_duplicates에 대표 기사와 함께 기록합니다. (signal_articles 뷰로 시그널과 연결)
+
+체크포인트 (repositories/news_spool.py):
+    메타 저장 직전 기사를 스풀에 기록하고, 시그널 저장까지 끝나면 done으로 표시합니다.
+    실행이 중간에 죽으면 다음 실행이 시작할 때 남은 기사부터 다시 분석합니다.
+
+수집 주기 (services/crawl_scheduler.py):
+    run_crawler(scheduled=True)는 쿼리별 검색 주기가 지난 쿼리만 검색하고,
+    다음 주기가 돌아오는 시각을 반환합니다. (scheduler_main이 그 시각에 다시 호출)
 """
 
 import sys
 import os
+import queue
+import threading
+import time
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from datetime import timezone
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from config import OPENAI_CONCURRENCY
 from crawlers.naver_news import NaverNewsCrawler
-from services.article_service import process_article
+from crawlers.canonical_url import canonical_url
+from services.article_service import save_articles_bulk
+from repositories.article_repository import filter_new_urls, get_article_ids_by_url, insert_article_duplicates
+from repositories.seen_url_filter import load_seen_url_filter
+from repositories.news_spool import NewsSpool
 from services.batch_signal_service import analyze_batch
+from services.signal_writer import BackgroundSignalWriter
+from services.near_duplicate import near_dup_index, fingerprint
+from services.query_planner import expansion_query, plan_expansions, merge_query_stats
+from services.crawl_scheduler import observe, publish_rate, query_weights, plan_intervals, due_queries, next_due_at
 
-from repositories.keyword_repository import get_monitoring_keywords
-from repositories.state_repository import get_last_crawled_at, update_last_crawled_at
+from repositories.keyword_repository import get_monitoring_keywords, get_client_names
+from repositories.state_repository import (
+    get_last_crawled_at,
+    update_last_crawled_at,
+    get_keyword_watermarks,
+    update_keyword_watermarks,
+    get_query_stats,
+    upsert_query_stats,
+)
 
 # ─── 키워드 확장 설정 ────────────────────────────────────────────────
 # True로 켜면 각 키워드에 EXPAND_TERMS를 조합한 확장 쿼리도 함께 검색합니다.
@@ -29,6 +71,8 @@ from repositories.state_repository import get_last_crawled_at, update_last_crawl
 #
 # ⚠️ 주의: 키워드 N개 × EXPAND_TERMS M개 = 최대 N×(M+1)회 API 호출
 #     네이버 뉴스 API 일일 제한(25,000회)을 고려해서 켜세요.
+#     → 모든 조합을 매번 검색하지 않고, 쿼리별 성과(신규 기사/시그널)로 고른 확장 쿼리만
+#       실행당 최대 EXPAND_QUERY_BUDGET개 검색합니다. (services/query_planner.py)
 #
 # ✅ 추천 사용 시점:
 #     - 특정 키워드로 뉴스가 너무 안 잡힐 때
@@ -37,32 +81,185 @@ USE_EXPANDED_KEYWORDS = False
 EXPAND_TERMS = ["바이알", "앰플", "유리용기", "세척", "탈알칼리", "제약", "화장품"]
 
 
-def _build_keywords(base_rows: list[dict]) -> list[dict]:
-    """키워드 확장 함수. USE_EXPANDED_KEYWORDS가 False면 원본 그대로 반환합니다."""
-    if not USE_EXPANDED_KEYWORDS:
-        return base_rows
-    out = []
+# ─── 수집 → 분석 파이프라인 설정 ─────────────────────────────────────
+LLM_BATCH_SIZE = 15                      # LLM 1회 호출에 묶는 기사 수
+LLM_BATCH_LINGER_SEC = 2.0               # 묶음이 덜 찼어도 첫 기사가 이 시간(초) 기다렸으면 분석 시작
+ARTICLE_QUEUE_MAX = LLM_BATCH_SIZE * 4   # 메타 저장 → LLM 분석 대기열 상한 (가득 차면 수집 단계가 대기)
+
+_STOP = object()  # 대기열 종료 표시
+
+
+def _query_origins(base_rows: list[dict]) -> dict[str, tuple[str, str | None]]:
+    """검색 후보 쿼리 → (원본 키워드, 확장어 또는 None). 확장이 꺼져 있으면 원본 키워드만."""
+    origins: dict[str, tuple[str, str | None]] = {}
     for r in base_rows:
         kw = (r.get("keyword") or "").strip()
-        if not kw:
+        if kw:
+            origins[kw] = (kw, None)
+    if USE_EXPANDED_KEYWORDS:
+        for kw in list(origins):
+            for t in EXPAND_TERMS:
+                origins.setdefault(expansion_query(kw, t), (kw, t))
+    return origins
+
+
+def _build_keywords(base_rows: list[dict], query_stats: dict[str, dict] | None = None) -> list[dict]:
+    """
+    키워드 확장 함수. USE_EXPANDED_KEYWORDS가 False면 원본 그대로 반환합니다.
+    켜져 있으면 쿼리별 성과(query_stats)로 고른 확장 쿼리만 원본 뒤에 붙입니다.
+    """
+    if not USE_EXPANDED_KEYWORDS:
+        return base_rows
+    base = list(dict.fromkeys(k for k in ((r.get("keyword") or "").strip() for r in base_rows) if k))
+    expansions, counts = plan_expansions(base, EXPAND_TERMS, query_stats or {})
+    print(f"📌 확장 쿼리 {len(expansions)}개 선택 (후보 {len(base) * len(EXPAND_TERMS)}개) | "
+          f"유지={counts['productive']}, 탐색={counts['explore']}, 저빈도={counts['marginal']}, "
+          f"재확인={counts['dead']}, 생략={counts['skipped']}")
+    return [{"keyword": kw} for kw in base] + [{"keyword": q} for q in expansions]
+
+
+def _iter_batches(q: queue.Queue, batch_size: int, linger_sec: float):
+    """대기열에서 기사를 꺼내 batch_size건이 모이거나 첫 기사 이후 linger_sec이 지나면 묶음으로 내보냅니다."""
+    batch: list[dict] = []
+    deadline = None
+    while True:
+        timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+        try:
+            item = q.get(timeout=timeout)
+        except queue.Empty:
+            item = None  # linger 만료
+
+        if item is _STOP:
+            if batch:
+                yield batch
+            return
+        if item is not None:
+            if not batch:
+                deadline = time.monotonic() + linger_sec
+            batch.append(item)
+
+        if batch and (len(batch) >= batch_size or time.monotonic() >= deadline):
+            yield batch
+            batch, deadline = [], None
+
+
+def _analysis_stage(q: queue.Queue, writer: BackgroundSignalWriter, spool: NewsSpool, stats: dict) -> None:
+    """
+    LLM 분석 단계 (전용 스레드). 묶음을 최대 OPENAI_CONCURRENCY개까지 동시에 분석합니다.
+    시그널은 writer에 적재만 하고 저장은 writer 스레드가 합니다.
+    분석이 끝난 묶음은 스풀에 알리고, 실패한 묶음은 스풀에 남겨 다음 실행에서 다시 분석합니다.
+    """
+    concurrency = max(1, OPENAI_CONCURRENCY)
+    slots = threading.BoundedSemaphore(concurrency)  # 분석 중인 묶음 수 상한 → 대기열 backpressure 유지
+    stats_lock = threading.Lock()
+
+    def analyze_one(chunk: list[dict]) -> None:
+        try:
+            print(f"🧠 기사 묶음(Bulk) LLM 분석 시작: {len(chunk)}건")
+            res = analyze_batch(chunk, writer=writer)
+            spool.analyzed((c["url"] for c in chunk), writer.added)
+            with stats_lock:
+                stats["analyzed"] += res.get("articles", 0)
+                stats["general_registered"] += res.get("general_registered", 0)
+                stats["by_article"].update(res.get("by_article") or {})
+            print(f"✅ 묶음 분석 완료: signals={res.get('signals_saved', 0)}, general_registered={res.get('general_registered', 0)}")
+        except Exception as e:
+            with stats_lock:
+                stats["failed_batches"] += 1
+            print(f"❌ 묶음 분석 중 오류 발생: {e}")
+        finally:
+            slots.release()
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="llm") as pool:
+        for chunk in _iter_batches(q, LLM_BATCH_SIZE, LLM_BATCH_LINGER_SEC):
+            slots.acquire()
+            pool.submit(analyze_one, chunk)
+
+
+def _resolve_spooled(pending: list[dict]) -> dict[str, str]:
+    """스풀 기사의 {url: article_id} — DB에서 찾고, 없으면 지금 저장합니다."""
+    found = get_article_ids_by_url(p["url"] for p in pending)
+    missing = [p for p in pending if p["url"] not in found]
+    if missing:
+        saved_rows = save_articles_bulk([
+            {"url": p["url"], "published_at": datetime.fromisoformat(p["published_at"])} for p in missing
+        ])
+        found.update((url, row["id"]) for url, row in saved_rows.items())
+    return found
+
+
+def _resume_spool(spool: NewsSpool, article_queue: queue.Queue) -> int:
+    """
+    지난 실행이 분석하지 못한 기사를 분석 대기열에 다시 넣습니다. 넣은 기사 수를 반환합니다.
+    메타 저장 결과를 기록하기 전에 죽은 기사는 DB에서 id를 찾고, 없으면 지금 저장합니다.
+    """
+    pending = spool.load()
+    if not pending:
+        return 0
+
+    unsaved = [p for p in pending if not p.get("article_id")]
+    if unsaved:
+        try:
+            found = _resolve_spooled(unsaved)
+        except Exception as e:
+            # 한 건이 DB에서 거부돼도 실행 전체가 멈추지 않도록 한 건씩 다시 시도하고,
+            # 그래도 실패하는 기사는 아래 drop으로 스풀에서 뺍니다.
+            print(f"⚠️ 체크포인트 스풀 기사 일괄 확인 실패 — 한 건씩 다시 시도합니다: {e}")
+            found = {}
+            for p in unsaved:
+                try:
+                    found.update(_resolve_spooled([p]))
+                except Exception as e:
+                    print(f"  ❌ 스풀 기사 제외 ({p['url']}): {e}")
+        spool.saved(found)
+        spool.drop(p["url"] for p in unsaved if p["url"] not in found)
+        for p in unsaved:
+            p["article_id"] = found.get(p["url"])
+
+    resumed = 0
+    for p in pending:
+        if not p.get("article_id"):
             continue
-        out.append({"keyword": kw})
-        for t in EXPAND_TERMS:
-            out.append({"keyword": f"{kw} {t}"})
-    return out
+        if near_dup_index is not None:
+            # 이어서 분석하는 기사도 대표로 등록해 이번 실행의 전재 기사와 묶이게 합니다.
+            near_dup_index.match_or_add(p["article_id"], fingerprint(p.get("title", ""), p.get("description", "")))
+        article_queue.put({
+            "article_id": p["article_id"],
+            "title": p.get("title", ""),
+            "description": p.get("description", ""),
+            "url": p["url"],
+            "keywords": p.get("keywords") or [],
+        })
+        resumed += 1
+    return resumed
 
 
-def run_crawler():
+def _naive_utc(value) -> datetime | None:
+    if not value:
+        return None
+    ts = value if isinstance(value, datetime) else datetime.fromisoformat(str(value))
+    return ts.astimezone(timezone.utc).replace(tzinfo=None) if ts.tzinfo else ts
+
+
+def run_crawler(scheduled: bool = False) -> datetime | None:
     """
     뉴스 크롤러 메인 실행 함수.
 
     실행 흐름:
         1) DB에서 모니터링 키워드 로드
-        2) 각 키워드로 네이버 뉴스 API 검색 (최대 30건/키워드)
-        3) 이미 수집했던 시각 이전 기사는 건너뜀
-        4) 새 기사 → DB에 메타(URL, 발행일)만 저장
-        5) 기사 원문(메모리)으로 LLM 즉석 분석 → signals, companies 업데이트
-        6) 이번 수집에서 가장 최신 기사 시각을 DB에 기록 (다음 실행 시 기준점)
+        2) 각 키워드로 네이버 뉴스 API 검색 (여러 키워드 동시 검색)
+           - 이전 수집 시각(워터마크) 이후 기사가 끝날 때까지 100건씩 페이지 이동
+        3) 이미 수집했던 시각 이전 기사는 건너뜀 (키워드마다 자기 워터마크 기준)
+        4) 새 기사 → DB에 메타(URL, 발행일)만 저장 → 분석 대기열에 넣음
+        5) 분석 스레드가 기사 원문(메모리)을 15건씩 LLM 분석 → signals, companies 업데이트
+           (수집이 끝나기를 기다리지 않고 4)와 동시에 진행)
+           - 지난 실행이 분석하지 못한 기사(체크포인트 스풀)를 먼저 이어서 분석
+        6) 키워드별로 이번에 본 가장 최신 기사 시각을 DB에 기록 (다음 실행 시 기준점)
+           - 전역 crawler_state에는 전체 최신 시각을 기록 (워터마크가 없는 키워드의 기준점)
+        7) 쿼리별 발행 빈도를 갱신하고 검색 주기를 다시 나눔 (crawl_scheduler)
+
+    scheduled=True면 2)에서 검색 주기가 지난 쿼리만 검색합니다.
+    반환값: 다음으로 검색 주기가 돌아오는 시각 (UTC, 알 수 없으면 None)
     """
     print("🚀 크롤링 시작")
 
@@ -70,84 +267,279 @@ def run_crawler():
 
     # DB (또는 JSON)에서 키워드 목록과 출처를 가져옵니다.
     keywords, source = get_monitoring_keywords(return_source=True)
-    keywords = _build_keywords(keywords)
+    # 쿼리별 성과 — 확장 쿼리 선별에 쓰고, 실행 끝에 이번 성과를 더해 저장합니다.
+    query_origins = _query_origins(keywords)
+    query_stats = get_query_stats(query_origins)
+    keywords = _build_keywords(keywords, query_stats)
 
     print(f"📌 키워드 소스: {source}")
     print(f"📌 키워드 개수: {len(keywords)}")
 
+    keyword_list = [k for k in ((kw.get("keyword") or "").strip() for kw in keywords) if k]
+    all_queries = keyword_list
+
+    # 쿼리별 검색 주기 — 발행 빈도와 가중치(고객사/최근 시그널)로 검색 예산을 나눕니다.
+    run_started = datetime.now(timezone.utc)
+    client_names = get_client_names()
+    intervals = plan_intervals(
+        all_queries, query_stats, query_weights(all_queries, query_origins, query_stats, client_names, run_started)
+    )
+    if scheduled:
+        keyword_list = due_queries(all_queries, query_stats, intervals, run_started)
+        print(f"📌 검색 주기가 지난 쿼리: {len(keyword_list)}/{len(all_queries)}개")
+
     # 직전 크롤링이 완료된 시각 — 이 시각보다 오래된 기사는 중복이므로 건너뜁니다.
+    # 키워드별 워터마크가 있으면 그 값을, 없으면 전역 값을 기준으로 삼습니다.
     last_crawled_at = get_last_crawled_at()
-    print(f"📌 이전 마지막 수집 시간: {last_crawled_at}")
+    keyword_marks = get_keyword_watermarks(keyword_list)
+    watermarks = {k: keyword_marks.get(k, last_crawled_at) for k in keyword_list}
+    watermarks = {k: v for k, v in watermarks.items() if v is not None}
+    print(f"📌 이전 마지막 수집 시간: {last_crawled_at} (키워드별 워터마크 {len(keyword_marks)}개)")
+
+    # 워터마크 이후 예상 신규 기사 수 — 기사가 드문 키워드는 크롤러가 OR 쿼리로 묶어 검색합니다.
+    now_naive = _naive_utc(run_started)
+    expected = {
+        k: publish_rate(query_stats.get(k)) * max(0.0, (now_naive - mark).total_seconds() / 3600)
+        for k, mark in watermarks.items()
+    }
+
+    # 이미 적재한 URL 로컬 필터 — 필터에 있는 URL은 DB 조회 없이 건너뜁니다.
+    seen_filter = load_seen_url_filter()
+    filter_skipped_total = 0  # 로컬 필터로 DB 조회를 생략한 기사 수
 
     newest_article_time = None  # 이번 실행에서 수집된 기사 중 가장 최신 시각
+    newest_by_keyword: dict[str, datetime] = {}  # 키워드별로 이번에 본 가장 최신 기사 시각
+    failed_queries: set[str] = set()  # 검색이 실패한 쿼리 — 다음 실행에서 바로 다시 검색
+    observed: dict[str, list[datetime]] = {}  # 키워드별로 이번에 받은 워터마크 이후 기사 발행 시각 (발행 빈도 추정용)
 
     fetched_total  = 0  # API로 가져온 기사 수 (중복 포함)
-    analyzed_total = 0  # 실제 분석 진행한 기사 수 (신규 기사만)
-    signals_total  = 0  # LLM이 추출해서 저장한 시그널 수
-    promoted_total = 0  # 이번 실행에서 GENERAL로 등록된 신규 기업 수
+    # 분석 단계 통계 (분석 스레드만 갱신, 종료 후 읽음)
+    # - analyzed: 실제 분석 진행한 기사 수 (신규 기사만)
+    # - general_registered: 이번 실행에서 GENERAL로 등록된 신규 기업 수
+    # - failed_batches: LLM 호출이 끝내 실패한 묶음 수
+    # - by_article: {article_id: [저장된 시그널 confidence, ...]} (쿼리별 성과 집계용)
+    analysis_stats = {"analyzed": 0, "general_registered": 0, "failed_batches": 0, "by_article": {}}
 
-    # 벌크 처리를 위해 새 기사들을 모아둘 리스트
-    pending_articles = []
+    # 메타 저장이 끝난 새 기사 → LLM 분석 단계로 넘기는 대기열
+    article_queue: queue.Queue = queue.Queue(maxsize=ARTICLE_QUEUE_MAX)
+    spool = NewsSpool()
+    signal_writer = BackgroundSignalWriter(on_flushed=spool.on_flushed)
+    analyzer = threading.Thread(
+        target=_analysis_stage,
+        args=(article_queue, signal_writer, spool, analysis_stats),
+        name="llm-analysis",
+        daemon=True,
+    )
+    analyzer.start()
 
-    for kw in keywords:
-        keyword = (kw.get("keyword") or "").strip()
-        if not keyword:
-            continue
+    # 이번 실행에서 이미 본 기사 (정규화 URL → 이 기사가 걸린 키워드 목록)
+    # 여러 키워드에 같은 기사가 걸려도 DB 저장/LLM 분석은 한 번만 하고, 키워드 귀속만 누적합니다.
+    seen_articles: dict[str, list[str]] = {}
+    dup_hits_total = 0  # 다른 키워드에서 이미 본 기사라 건너뛴 횟수
+    near_dup_total = 0  # 유사(전재) 기사라 LLM 분석을 생략한 기사 수
+    # 이번 실행에서 새로 저장한 기사 → 이 기사가 걸린 쿼리 목록 (seen_articles와 같은 list 참조)
+    article_queries: dict[str, list[str]] = {}
+
+    try:
+        resumed = _resume_spool(spool, article_queue)
+        if resumed:
+            print(f"♻️ 지난 실행에서 분석하지 못한 기사 {resumed}건을 이어서 분석합니다.")
+
+        # 키워드 검색은 동시에 진행하고(동시 요청 수/초당 요청 수 제한), 끝나는 순서대로 처리합니다.
+        # 키워드별 워터마크를 넘겨 그 이후 기사에 닿을 때까지만 페이지를 읽습니다.
+        for keyword, articles in crawler.fetch_many(keyword_list, since=watermarks, expected=expected):
+            if articles is None:
+                # 검색 실패 → 이번 실행에서 검색하지 않은 것으로 봅니다. (성과/발행 빈도/검색 시각 갱신 안 함)
+                failed_queries.add(keyword)
+                continue
+            print(f"🔎 키워드 검색: {keyword} ({len(articles)}건)")
+            fetched_total += len(articles)
+
+            keyword_mark = watermarks.get(keyword)
+            keyword_newest = None
+            candidates = []
+            keyword_times = observed.setdefault(keyword, [])
+            for article in articles:
+                article_time = article["published_at"]
 
-        print(f"🔎 키워드 검색: {keyword}")
+                # 모든 시간은 UTC 기준(timezone 없는 naive datetime)으로 통일합니다.
+                if article_time.tzinfo:
+                    article_time = article_time.astimezone(timezone.utc).replace(tzinfo=None)
 
-        articles = crawler.fetch_articles(keyword)
-        fetched_total += len(articles)
+                # 이 키워드의 이전 수집 기준 시각보다 오래된 기사는 이미 처리된 것이므로 건너뜁니다.
+                if keyword_mark and article_time <= keyword_mark:
+                    continue
+                keyword_times.append(article_time)
 
-        for article in articles:
-            article_time = article["published_at"]
+                if keyword_newest is None or article_time > keyword_newest:
+                    keyword_newest = article_time
 
-            # 모든 시간은 UTC 기준(timezone 없는 naive datetime)으로 통일합니다.
-            if article_time.tzinfo:
-                article_time = article_time.astimezone(timezone.utc).replace(tzinfo=None)
+                # URL이 없거나 이번 실행에서 이미 본 기사는 건너뜁니다. (키워드 귀속만 추가)
+                url_key = canonical_url(article.get("url") or "")
+                if not url_key:
+                    continue
+                # 이후 단계(로컬 필터, DB 중복 확인/저장, 스풀)는 모두 정규화 URL을 키로 씁니다.
+                article = {**article, "url": url_key}
+                matched = seen_articles.get(url_key)
+                if matched is not None:
+                    if keyword not in matched:
+                        matched.append(keyword)
+                    dup_hits_total += 1
+                    continue
+                seen_articles[url_key] = [keyword]
+                candidates.append((article, article_time))
 
-            # 이전 수집 기준 시각보다 오래된 기사는 이미 처리된 것이므로 건너뜁니다.
-            if last_crawled_at and article_time <= last_crawled_at:
+            # 이 키워드가 이번에 본 가장 최신 기사 시각 → 다음 실행의 워터마크
+            # 검색 결과가 API 한도에 잘렸으면 읽지 못한 구간이 있으므로, 가져온 가장 오래된 기사 시각까지만 옮깁니다.
+            if getattr(articles, "truncated", False) and keyword_times:
+                keyword_newest = min(keyword_times)
+                print(f"⚠️ {keyword}: 결과가 잘려 워터마크를 가져온 가장 오래된 기사 시각({keyword_newest})까지만 옮깁니다.")
+            if keyword_newest is not None:
+                newest_by_keyword[keyword] = keyword_newest
+
+            if not candidates:
                 continue
 
-            # DB에 URL, 발행일 등 메타 정보만 저장합니다. (제목/요약은 저장 안 함)
-            saved_row = process_article(article)
-            if not saved_row:
-                # URL이 없거나 이미 DB에 있는 기사면 None 반환 → 건너뜁니다.
+            # 로컬 필터에 있는 URL은 이미 적재한 기사 → DB 확인 없이 제외합니다.
+            known, maybe_new = seen_filter.split(a["url"] for a, _ in candidates)
+            filter_skipped_total += len(known)
+
+            # 신규일 수 있는 URL만 한꺼번에 DB와 대조합니다. (기사마다 GET 하지 않음)
+            # 정규화 이전에는 네이버 link 원본을 url로 저장했으므로 그 형태로도 확인합니다.
+            raw_links = {a["url"]: [a["link"]] for a, _ in candidates if a.get("link")}
+            new_urls = filter_new_urls(maybe_new, aliases=raw_links) if maybe_new else set()
+            seen_filter.add_many(u for u in maybe_new if u not in new_urls)  # DB에 이미 있던 URL도 기억
+            candidates = [(a, t) for a, t in candidates if a["url"] in new_urls]
+            if not candidates:
                 continue
 
-            # 이번 실행에서 처리한 기사 중 가장 최신 발행 시각을 갱신합니다.
-            if newest_article_time is None or article_time > newest_article_time:
-                newest_article_time = article_time
+            # 저장 전에 스풀에 먼저 기록합니다. (저장 직후 죽어도 다음 실행이 이어서 분석)
+            spool.stage((a, seen_articles[a["url"]]) for a, _ in candidates)
 
-            # 벌크 처리를 위해 리스트에 적재
-            pending_articles.append({
-                "article_id": saved_row["id"],
-                "title": article.get("title", ""),
-                "description": article.get("description", ""),
-                "url": article.get("url", "")
-            })
+            # DB에 URL, 발행일 등 메타 정보만 한 번에 저장합니다. (제목/요약은 저장 안 함)
+            try:
+                saved_rows = save_articles_bulk([a for a, _ in candidates])
+            except Exception as e:
+                # 실제로는 저장됐을 수도 있으므로 스풀에 남겨 두고 다음 실행이 DB를 확인하게 합니다.
+                print(f"❌ 기사 메타 일괄 저장 실패 ({keyword}): {e}")
+                newest_by_keyword.pop(keyword, None)  # 저장 못 한 기사를 다음 실행에서 다시 가져오도록
+                continue
 
-    # 모아둔 기사들을 15개 단위(BATCH_SIZE)로 묶어서 LLM Bulk 처리
-    BATCH_SIZE = 15
-    for i in range(0, len(pending_articles), BATCH_SIZE):
-        chunk = pending_articles[i:i + BATCH_SIZE]
-        print(f"🧠 기사 묶음(Bulk) LLM 분석 시작: {len(chunk)}건")
+            spool.saved({url: row["id"] for url, row in saved_rows.items()})
+            spool.drop(a["url"] for a, _ in candidates if a["url"] not in saved_rows)
+            seen_filter.add_many(saved_rows.keys())
 
-        try:
-            stats = analyze_batch(chunk)
-            analyzed_total += stats.get("articles", 0)
-            signals_total  += stats.get("signals_saved", 0)
-            promoted_total += stats.get("general_registered", 0)
-            print(f"✅ 묶음 분석 완료: signals={stats.get('signals_saved', 0)}, general_registered={stats.get('general_registered', 0)}")
-        except Exception as e:
-            print(f"❌ 묶음 분석 중 오류 발생: {e}")
+            to_analyze = []
+            duplicates = []  # (article_id, 대표 article_id, 거리, url)
+            for article, article_time in candidates:
+                saved_row = saved_rows.get(article["url"])
+                if not saved_row:
+                    # 그 사이 다른 실행이 먼저 저장한 기사 → 건너뜁니다.
+                    continue
+
+                # 이번 실행에서 처리한 기사 중 가장 최신 발행 시각을 갱신합니다.
+                if newest_article_time is None or article_time > newest_article_time:
+                    newest_article_time = article_time
+
+                item = {
+                    "article_id": saved_row["id"],
+                    "title": article.get("title", ""),
+                    "description": article.get("description", ""),
+                    "url": article.get("url", ""),
+                    "keywords": seen_articles[article["url"]],
+                }
+                article_queries[item["article_id"]] = item["keywords"]
+
+                # 최근 본 기사와 거의 같은 전재 기사 → 대표 기사의 분석 결과를 공유합니다.
+                if near_dup_index is not None:
+                    match = near_dup_index.match_or_add(
+                        item["article_id"], fingerprint(item["title"], item["description"])
+                    )
+                    if match is not None:
+                        duplicates.append((item, match))
+                        continue
+                to_analyze.append(item)
+
+            if duplicates:
+                try:
+                    insert_article_duplicates([
+                        {"article_id": item["article_id"], "representative_id": rep_id, "distance": dist}
+                        for item, (rep_id, dist) in duplicates
+                    ])
+                    spool.drop(item["url"] for item, _ in duplicates)
+                    near_dup_total += len(duplicates)
+                except Exception as e:
+                    # 묶음을 기록하지 못하면 시그널과 연결이 끊기므로 그냥 분석합니다.
+                    print(f"⚠️ 유사 기사 묶음 저장 실패 ({keyword}) — 개별 분석합니다: {e}")
+                    to_analyze.extend(item for item, _ in duplicates)
+
+            # 분석 대기열에 적재 (가득 차 있으면 분석 단계가 따라잡을 때까지 대기)
+            # keywords는 seen_articles의 목록을 그대로 참조하므로 뒤에 걸린 키워드도 반영됩니다.
+            for item in to_analyze:
+                article_queue.put(item)
+
+    finally:
+        # 남은 기사까지 분석을 마치고 시그널 저장을 끝냅니다.
+        article_queue.put(_STOP)
+        analyzer.join()
+        signal_result = signal_writer.close()
+        spool_left = spool.close()
+
+    seen_filter.save()
+    if spool_left:
+        print(f"⚠️ 분석하지 못한 기사 {spool_left}건 — 체크포인트에 남겨 다음 실행에서 이어서 분석합니다.")
+
+    for row, err in signal_result.failed:
+        print(f"  ❌ 시그널 저장 실패: {row.get('company_name')} / {row.get('event_type')} → {err[:200]}")
+
+    # 쿼리별 성과 저장 — 새 기사/시그널을 그 기사가 걸린 모든 쿼리에 귀속시킵니다.
+    run_yield: dict[str, dict] = {}
+    for aid, queries in article_queries.items():
+        confs = analysis_stats["by_article"].get(aid, [])
+        for q in set(queries):
+            y = run_yield.setdefault(q, {"new_articles": 0, "signals": 0, "confidence_sum": 0.0})
+            y["new_articles"] += 1
+            y["signals"] += len(confs)
+            y["confidence_sum"] += sum(confs)
+    # 검색이 실패한 쿼리는 빼서 0건 검색으로 기록되지 않게 합니다. (검색 시각도 그대로 → 다음 실행에서 다시 검색)
+    called = [q for q in keyword_list if q in observed]
+    if failed_queries:
+        print(f"⚠️ 검색 실패 쿼리 {len(failed_queries)}개 — 성과/발행 빈도에 반영하지 않습니다.")
+    stats_rows = merge_query_stats(query_stats, called, run_yield, query_origins)
+
+    # 발행 빈도 갱신 — 관측 구간은 지난 검색 이후 (처음이면 워터마크 이후)
+    for row in stats_rows:
+        q = row["query"]
+        prev = query_stats.get(q) or {}
+        window_start = _naive_utc(prev.get("last_called_at")) or watermarks.get(q)
+        row.update(observe(prev, observed[q], window_start, run_started))
+
+    # 갱신된 발행 빈도로 검색 주기를 다시 나눕니다.
+    merged_stats = {**query_stats, **{row["query"]: row for row in stats_rows}}
+    intervals = plan_intervals(
+        all_queries, merged_stats, query_weights(all_queries, query_origins, merged_stats, client_names, run_started)
+    )
+    for row in stats_rows:
+        row["poll_interval_min"] = round(intervals.get(row["query"], 0), 2)
+    upsert_query_stats(stats_rows)
+    next_run_at = next_due_at(all_queries, merged_stats, intervals)
 
     # 마지막 수집 시각을 DB에 저장합니다. 다음 실행 시 이 시각 이후 기사만 수집합니다.
-    if newest_article_time:
+    if newest_by_keyword:
+        print(f"🕒 키워드별 워터마크 업데이트: {len(newest_by_keyword)}개")
+        update_keyword_watermarks(newest_by_keyword)
+    # 전역 값은 뒤로 가지 않게 합니다. (키워드별 기준이라 이번 최신 기사가 이전 전역 값보다 오래될 수 있음)
+    if newest_article_time and (last_crawled_at is None or newest_article_time > last_crawled_at):
         print(f"🕒 마지막 수집 시간 업데이트: {newest_article_time}")
         update_last_crawled_at(newest_article_time)
 
     print("✅ 크롤링 종료")
-    print(f"📊 통계 | fetched={fetched_total}, analyzed={analyzed_total}, "
-          f"signals_saved={signals_total}, general_registered={promoted_total}")
\ No newline at end of file
+    print(f"📊 통계 | fetched={fetched_total}, analyzed={analysis_stats['analyzed']}, "
+          f"signals_saved={signal_result.saved}, general_registered={analysis_stats['general_registered']}, "
+          f"failed_batches={analysis_stats['failed_batches']}, "
+          f"cross_keyword_dups={dup_hits_total}, near_dups={near_dup_total}, filter_skipped={filter_skipped_total}")
+    if intervals:
+        fastest = min(intervals.values())
+        slowest = max(intervals.values())
+        print(f"⏱️ 검색 주기 {fastest:.0f}~{slowest:.0f}분 (쿼리 {len(intervals)}개) | 다음 검색: {next_run_at}")
+    return next_run_at
\ No newline at end of file
@@ -2,8 +2,9 @@
 services/instant_signal_service.py — DART / 구형 단건 분석 호환 레이어
 
 역할:
-    - dart_llm_worker, dart_scout_worker 가 사용하는 upsert_signal / upsert_general_company /
-      should_promote_to_potential 을 batch_signal_service 에서 re-export 합니다.
+    - upsert_signal / upsert_general_company / should_promote_to_potential 등을
+      batch_signal_service 에서 re-export 합니다.
+      (DART 워커 dart_llm_worker, dart_scout_worker 는 시그널 저장에 services/signal_writer.AsyncSignalWriter 를 사용)
     - 중복 구현을 없애고 batch_signal_service 를 단일 진실 공급원으로 사용합니다.
 
 Note:
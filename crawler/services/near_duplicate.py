@@ -0,0 +1,147 @@
+"""
+services/near_duplicate.py — 유사(전재) 기사 묶기
+
+역할:
+    - 같은 통신사 기사가 여러 매체에 제목만 조금 바뀌어 실리면 URL이 달라 URL 중복 제거를 통과합니다.
+    - 제목+요약을 정규화한 뒤 SimHash(64bit)로 지문을 만들고,
+      해밍 거리 NEAR_DUP_MAX_DISTANCE 이하인 기사를 같은 묶음(cluster)으로 봅니다.
+    - 묶음마다 처음 본 기사(대표)만 LLM 분석하고, 나머지(멤버)는 article_duplicates에
+      대표 기사 id와 함께 기록합니다. (signal_articles 뷰로 멤버 기사도 시그널과 연결)
+
+인덱스:
+    - 프로세스 메모리에 최근 NEAR_DUP_WINDOW_HOURS 동안 본 기사 지문을 보관합니다.
+      (scheduler_main처럼 한 프로세스에서 여러 번 실행하면 이전 실행 기사와도 묶임)
+    - 해밍 거리 k 이하를 찾기 위해 지문을 k+1개 구간으로 나눠 구간 값마다 색인합니다.
+      (거리 k 이하인 두 지문은 적어도 한 구간이 완전히 같음 → 후보만 비교)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from config import NEAR_DUP_ENABLED, NEAR_DUP_MAX_DISTANCE, NEAR_DUP_WINDOW_HOURS
+
+SIMHASH_BITS = 64
+SHINGLE_SIZE = 3        # 글자 3-gram (한국어는 띄어쓰기가 매체마다 달라 공백을 지우고 글자 단위로 자름)
+MIN_TEXT_LEN = 20       # 정규화 후 이보다 짧은 기사는 묶지 않음 (짧은 문장은 우연히 가까워지기 쉬움)
+
+# 매체마다 붙였다 뗐다 하는 말머리/꼬리
+_BRACKETS = re.compile(r"\[[^\]]*\]|【[^】]*】|\([^)]*\)|<[^>]*>")
+_EMAIL = re.compile(r"\S+@\S+")
+_NON_WORD = re.compile(r"[^0-9a-z가-힣]+")
+
+
+def normalize_text(title: str, description: str) -> str:
+    """제목+요약 → 말머리/괄호/기호/공백을 지운 소문자 문자열"""
+    text = f"{title or ''} {description or ''}".lower()
+    text = _BRACKETS.sub(" ", text)
+    text = _EMAIL.sub(" ", text)
+    return _NON_WORD.sub("", text)
+
+
+def simhash(text: str) -> int:
+    """글자 3-gram(빈도 가중) SimHash 64bit"""
+    weights: dict[str, int] = {}
+    for i in range(max(1, len(text) - SHINGLE_SIZE + 1)):
+        sh = text[i:i + SHINGLE_SIZE]
+        weights[sh] = weights.get(sh, 0) + 1
+
+    v = [0] * SIMHASH_BITS
+    for sh, w in weights.items():
+        h = int.from_bytes(hashlib.blake2b(sh.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(SIMHASH_BITS):
+            if h >> bit & 1:
+                v[bit] += w
+            else:
+                v[bit] -= w
+
+    out = 0
+    for bit in range(SIMHASH_BITS):
+        if v[bit] > 0:
+            out |= 1 << bit
+    return out
+
+
+def fingerprint(title: str, description: str) -> Optional[int]:
+    """기사 지문. 텍스트가 너무 짧으면 None (묶지 않음)"""
+    text = normalize_text(title, description)
+    if len(text) < MIN_TEXT_LEN:
+        return None
+    return simhash(text)
+
+
+def _band_masks(max_distance: int) -> list[tuple[int, int]]:
+    # 64bit를 max_distance+1개 구간으로 나눈 (shift, mask) 목록
+    bands = max_distance + 1
+    base, extra = divmod(SIMHASH_BITS, bands)
+    out, shift = [], 0
+    for i in range(bands):
+        width = base + (1 if i < extra else 0)
+        out.append((shift, (1 << width) - 1))
+        shift += width
+    return out
+
+
+class NearDuplicateIndex:
+    """최근 기사 지문 색인. 스레드 안전합니다."""
+
+    def __init__(self, max_distance: int = NEAR_DUP_MAX_DISTANCE, window_hours: float = NEAR_DUP_WINDOW_HOURS):
+        self.max_distance = max(0, min(int(max_distance), SIMHASH_BITS // 4))
+        self._window_sec = float(window_hours) * 3600
+        self._bands = _band_masks(self.max_distance)
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[int, float]] = OrderedDict()  # 대표 article_id → (지문, 등록 시각)
+        self._buckets: dict[tuple[int, int], set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _keys(self, fp: int):
+        return [(i, (fp >> shift) & mask) for i, (shift, mask) in enumerate(self._bands)]
+
+    def _prune(self, now: float) -> None:
+        while self._entries:
+            aid, (fp, added_at) = next(iter(self._entries.items()))
+            if now - added_at <= self._window_sec:
+                break
+            self._entries.popitem(last=False)
+            for key in self._keys(fp):
+                bucket = self._buckets.get(key)
+                if bucket is not None:
+                    bucket.discard(aid)
+                    if not bucket:
+                        del self._buckets[key]
+
+    def match_or_add(self, article_id: str, fp: Optional[int]) -> Optional[tuple[str, int]]:
+        """
+        가까운 대표 기사가 있으면 (대표 article_id, 해밍 거리)를 반환합니다.
+        없으면 이 기사를 새 대표로 등록하고 None을 반환합니다.
+        """
+        if fp is None:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            self._prune(now)
+            best: Optional[tuple[str, int]] = None
+            keys = self._keys(fp)
+            for key in keys:
+                for cand in self._buckets.get(key, ()):
+                    dist = bin(self._entries[cand][0] ^ fp).count("1")
+                    if dist <= self.max_distance and (best is None or dist < best[1]):
+                        best = (cand, dist)
+            if best is not None:
+                return best
+
+            self._entries[article_id] = (fp, now)
+            for key in keys:
+                self._buckets.setdefault(key, set()).add(article_id)
+            return None
+
+
+# 프로세스 전역 색인 — 같은 프로세스의 이후 실행도 최근 기사와 묶을 수 있도록 공유합니다.
+near_dup_index: Optional[NearDuplicateIndex] = NearDuplicateIndex() if NEAR_DUP_ENABLED else None
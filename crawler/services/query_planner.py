@@ -0,0 +1,139 @@
+"""
+services/query_planner.py — 확장 검색 쿼리 선별
+
+역할:
+    - USE_EXPANDED_KEYWORDS가 켜져 있으면 키워드 N개 × 확장어 M개 조합을 모두 검색하는 대신,
+      쿼리별 성과(crawler_query_stats)를 보고 검색할 확장 쿼리만 고릅니다.
+    - 실행이 끝나면 이번에 검색한 쿼리의 성과(신규 기사 수, 시그널 수, confidence 합)를 감쇠 누적해 저장합니다.
+
+확장 쿼리 등급 (원본 키워드는 항상 검색):
+    explore    : 검색 횟수가 EXPAND_MIN_TRIALS 미만 → 성과를 모르므로 검색
+    productive : 검색 1회당 confidence 가중 시그널이 EXPAND_MIN_SCORE 이상 → 매 실행 검색
+    marginal   : 시그널은 부족하지만 검색 1회당 신규 기사가 EXPAND_MIN_NEW_RATE 이상
+                 → EXPAND_MARGINAL_HOURS 간격으로만 검색
+    dead       : 그 외 → EXPAND_PROBE_HOURS 간격으로 한 번씩만 다시 확인
+    등급 순서(productive는 점수 순)대로 EXPAND_QUERY_BUDGET개까지만 검색합니다.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Iterable
+
+from config import EXPAND_QUERY_BUDGET
+
+QUERY_STATS_DECAY = 0.98      # 검색할 때마다 이전 성과에 곱하는 값 (약 35회 검색이면 예전 성과 비중이 절반)
+
+EXPAND_MIN_TRIALS = 3         # 이 횟수까지는 성과와 상관없이 검색 (탐색)
+EXPAND_MIN_SCORE = 0.05       # 검색 1회당 confidence 가중 시그널 수 — 이 이상이면 유지
+EXPAND_MIN_NEW_RATE = 0.5     # 검색 1회당 신규 기사 수 — 이 이상이면 가끔 검색
+EXPAND_MARGINAL_HOURS = 6     # marginal 쿼리 검색 간격
+EXPAND_PROBE_HOURS = 24 * 7   # dead 쿼리 재확인 간격
+
+_TIER_ORDER = {"productive": 0, "explore": 1, "marginal": 2, "dead": 3}
+
+
+def expansion_query(keyword: str, term: str) -> str:
+    return f"{keyword} {term}"
+
+
+def _parse_ts(value) -> datetime | None:
+    if not value:
+        return None
+    ts = datetime.fromisoformat(str(value))
+    return ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
+
+
+def _tier(row: dict | None) -> tuple[str, float]:
+    """(등급, 점수) — 점수는 검색 1회당 confidence 가중 시그널 수"""
+    if not row or float(row.get("calls") or 0) < EXPAND_MIN_TRIALS:
+        return "explore", 0.0
+    calls = float(row["calls"])
+    score = float(row.get("confidence_sum") or 0) / calls
+    if score >= EXPAND_MIN_SCORE:
+        return "productive", score
+    if float(row.get("new_articles") or 0) / calls >= EXPAND_MIN_NEW_RATE:
+        return "marginal", score
+    return "dead", score
+
+
+def plan_expansions(
+    keywords: Iterable[str],
+    terms: Iterable[str],
+    stats: dict[str, dict],
+    budget: int = EXPAND_QUERY_BUDGET,
+    now: datetime | None = None,
+) -> tuple[list[str], dict[str, int]]:
+    """
+    이번 실행에서 검색할 확장 쿼리를 고릅니다.
+
+    반환값: (확장 쿼리 목록, 등급별 선택 수 + "skipped")
+    """
+    now = now or datetime.now(timezone.utc)
+    picked: list[tuple[int, float, str]] = []
+    skipped = 0
+    terms = list(terms)
+
+    for kw in keywords:
+        for term in terms:
+            q = expansion_query(kw, term)
+            row = stats.get(q)
+            tier, score = _tier(row)
+
+            # marginal/dead 쿼리는 마지막 검색 후 일정 시간이 지났을 때만 다시 검색합니다.
+            wait_hours = {"marginal": EXPAND_MARGINAL_HOURS, "dead": EXPAND_PROBE_HOURS}.get(tier)
+            if wait_hours is not None:
+                last = _parse_ts(row.get("last_called_at"))
+                if last is not None and now - last < timedelta(hours=wait_hours):
+                    skipped += 1
+                    continue
+
+            picked.append((_TIER_ORDER[tier], -score, q))
+
+    picked.sort()
+    budget = max(0, int(budget))
+    selected = picked[:budget]
+    skipped += len(picked) - len(selected)
+
+    counts = {name: 0 for name in _TIER_ORDER}
+    inverse = {v: k for k, v in _TIER_ORDER.items()}
+    for order, _, _ in selected:
+        counts[inverse[order]] += 1
+    counts["skipped"] = skipped
+    return [q for _, _, q in selected], counts
+
+
+def merge_query_stats(
+    previous: dict[str, dict],
+    called: Iterable[str],
+    run_yield: dict[str, dict],
+    origins: dict[str, tuple[str, str | None]],
+    now: datetime | None = None,
+) -> list[dict]:
+    """
+    이번 실행에서 검색한 쿼리의 성과를 이전 값과 감쇠 누적한 crawler_query_stats row 목록을 만듭니다.
+
+    run_yield: {query: {"new_articles": n, "signals": n, "confidence_sum": x}}
+    origins  : {query: (원본 키워드, 확장어 또는 None)}
+    """
+    now = now or datetime.now(timezone.utc)
+    now_iso = now.isoformat()
+    rows = []
+    for q in dict.fromkeys(called):
+        prev = previous.get(q) or {}
+        got = run_yield.get(q) or {}
+        base, term = origins.get(q, (q, None))
+        row = {
+            "query":          q,
+            "base_keyword":   base,
+            "term":           term,
+            "calls":          float(prev.get("calls") or 0) * QUERY_STATS_DECAY + 1,
+            "new_articles":   float(prev.get("new_articles") or 0) * QUERY_STATS_DECAY + got.get("new_articles", 0),
+            "signals":        float(prev.get("signals") or 0) * QUERY_STATS_DECAY + got.get("signals", 0),
+            "confidence_sum": float(prev.get("confidence_sum") or 0) * QUERY_STATS_DECAY + got.get("confidence_sum", 0.0),
+            "last_called_at": now_iso,
+            "last_signal_at": now_iso if got.get("signals") else prev.get("last_signal_at"),
+            "updated_at":     now_iso,
+        }
+        rows.append(row)
+    return rows
@@ -0,0 +1,290 @@
+"""
+services/signal_writer.py — signals 쓰기 버퍼 (write-coalescing)
+
+역할:
+    - upsert_signal()은 시그널 1건마다 POST 1회를 보냅니다.
+      이 모듈은 시그널 row를 모아두었다가 event_hash 기준 배열 upsert 1회로 저장합니다.
+    - 다음 중 하나가 되면 flush 합니다.
+        1) 버퍼 row 수가 FLUSH_MAX_ROWS 이상
+        2) 가장 오래된 row가 FLUSH_MAX_WAIT_SEC 이상 대기
+        3) flush()/close() 호출 또는 with 블록 종료 (실행 종료 시점)
+
+주의:
+    - PostgREST는 한 payload 안에 같은 on_conflict 키가 두 번 나오면 요청 전체를 거부합니다.
+      그래서 flush 전에 event_hash 중복을 제거합니다. (나중에 들어온 row 우선 = 순차 upsert와 동일한 결과)
+    - 배열 upsert는 모든 row의 키 집합이 같아야 하므로, 키 구성이 같은 row끼리 묶어(_group_by_keys)
+      묶음마다 배열 upsert 1회로 저장합니다. (빠진 컬럼을 None으로 채우면 기존 값을 NULL로 덮어씀)
+    - 배열 upsert가 실패하면 row 단위로 다시 저장하여 실패 row를 개별 보고합니다.
+
+사용 예:
+    with SignalWriter() as writer:
+        writer.add(article_id, sig, source="news")
+
+    async with AsyncSignalWriter(db) as writer:
+        await writer.add(None, sig, source="dart", rcept_no=rcept_no, company_role=role)
+
+    with BackgroundSignalWriter() as writer:   # flush를 전용 스레드가 담당 (add는 적재만)
+        writer.add(article_id, sig, source="news")
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass, field
+
+from repositories.db import supabase
+from services.batch_signal_service import build_signal_row, get_company_role
+
+# ──────────────────────────────────────────────────────────────────────────────
+# ⚙️  flush 기준
+# ──────────────────────────────────────────────────────────────────────────────
+
+FLUSH_MAX_ROWS = 200       # 이 개수만큼 모이면 즉시 flush (payload 크기 제한 고려)
+FLUSH_MAX_WAIT_SEC = 5.0   # 가장 오래된 row가 이 시간(초) 이상 대기하면 flush
+BACKLOG_MAX_ROWS = 1000    # BackgroundSignalWriter: 버퍼가 이만큼 차면 add()가 flush를 기다림 (backpressure)
+
+
+@dataclass
+class FlushResult:
+    saved: int = 0                                   # 저장 성공 row 수
+    deduped: int = 0                                 # event_hash 중복으로 합쳐진 row 수
+    failed: list[tuple[dict, str]] = field(default_factory=list)  # (row, 오류 메시지)
+
+    def merge(self, other: "FlushResult") -> None:
+        self.saved += other.saved
+        self.deduped += other.deduped
+        self.failed.extend(other.failed)
+
+
+class _SignalBuffer:
+    """동기/비동기 writer 공용 버퍼 (event_hash 기준 dedupe + flush 시점 판단)."""
+
+    def __init__(self, max_rows: int, max_wait_sec: float):
+        self._max_rows = max(1, int(max_rows))
+        self._max_wait_sec = float(max_wait_sec)
+        self._rows: dict[str, dict] = {}
+        self._deduped = 0
+        self._oldest_at: float | None = None
+        self.added = 0  # 지금까지 적재한 row 수 (flush 완료 지점 추적용 일련번호)
+        self.total = FlushResult()
+
+    def _put(self, row: dict) -> None:
+        key = row["event_hash"]
+        if key in self._rows:
+            self._deduped += 1
+            # dict 순서 유지를 위해 삭제 후 재삽입 (나중 row 우선)
+            del self._rows[key]
+        self._rows[key] = row
+        self.added += 1
+        if self._oldest_at is None:
+            self._oldest_at = time.monotonic()
+
+    def _due(self) -> bool:
+        if not self._rows:
+            return False
+        if len(self._rows) >= self._max_rows:
+            return True
+        return self._oldest_at is not None and (time.monotonic() - self._oldest_at) >= self._max_wait_sec
+
+    def _take(self) -> tuple[list[list[dict]], int]:
+        # 반환한 묶음들은 일련번호 self.added까지의 row를 모두 포함합니다.
+        rows = list(self._rows.values())
+        deduped = self._deduped
+        self._rows = {}
+        self._deduped = 0
+        self._oldest_at = None
+        return _group_by_keys(rows), deduped
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+
+def _group_by_keys(rows: list[dict]) -> list[list[dict]]:
+    # PostgREST 배열 insert는 모든 객체의 키가 같아야 합니다. (PGRST102)
+    # 빠진 키를 None으로 채우면 merge-duplicates upsert가 기존 컬럼 값을 NULL로 덮어쓰므로,
+    # 키 구성이 같은 row끼리 묶어 묶음마다 따로 upsert합니다.
+    groups: dict[frozenset, list[dict]] = {}
+    for r in rows:
+        groups.setdefault(frozenset(r), []).append(r)
+    return list(groups.values())
+
+
+class SignalWriter(_SignalBuffer):
+    """
+    동기 코드(analyze_batch, signal_scout_worker)용 signals 쓰기 버퍼. 스레드 안전.
+
+    on_flushed: flush가 끝날 때마다 on_flushed(seq, failed_article_ids)를 호출합니다.
+                seq는 이번 flush로 처리가 끝난 마지막 row의 일련번호(added)이고,
+                failed_article_ids는 그중 저장에 실패한 row의 article_id 집합입니다.
+    """
+
+    def __init__(self, max_rows: int = FLUSH_MAX_ROWS, max_wait_sec: float = FLUSH_MAX_WAIT_SEC, db=None, on_flushed=None):
+        super().__init__(max_rows, max_wait_sec)
+        self._db = db or supabase
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # flush 완료 순서 = 일련번호 순서가 되도록 flush는 하나씩
+        self._on_flushed = on_flushed
+
+    def add(
+        self,
+        article_id: str | None,
+        sig: dict,
+        source: str = "news",
+        rcept_no: str | None = None,
+        company_role: str | None = None,
+    ) -> None:
+        """upsert_signal()과 같은 인자로 row를 버퍼에 담습니다."""
+        row = build_signal_row(article_id, sig, source=source, rcept_no=rcept_no, company_role=company_role)
+        self.add_row(row)
+
+    def add_row(self, row: dict) -> None:
+        with self._lock:
+            self._put(row)
+            due = self._due()
+        if due:
+            self.flush()
+
+    def flush(self) -> FlushResult:
+        with self._flush_lock:
+            with self._lock:
+                seq = self.added
+                groups, deduped = self._take()
+            res = FlushResult(deduped=deduped)
+            for rows in groups:
+                try:
+                    self._db.table("signals").upsert(rows, on_conflict="event_hash", returning="minimal").execute()
+                    res.saved += len(rows)
+                except Exception:
+                    # 배열 upsert 실패 → row 단위로 재시도하여 실패 row만 골라냅니다.
+                    for row in rows:
+                        try:
+                            self._db.table("signals").upsert(row, on_conflict="event_hash", returning="minimal").execute()
+                            res.saved += 1
+                        except Exception as e:
+                            res.failed.append((row, str(e)))
+            with self._lock:
+                self.total.merge(res)
+            if self._on_flushed is not None:
+                self._on_flushed(seq, {row.get("article_id") for row, _ in res.failed if row.get("article_id")})
+        return res
+
+    def close(self) -> FlushResult:
+        self.flush()
+        return self.total
+
+    def __enter__(self) -> "SignalWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class BackgroundSignalWriter(SignalWriter):
+    """
+    flush를 전용 스레드에서 수행하는 SignalWriter.
+
+    add()는 버퍼에 적재만 하고 바로 돌아오므로, 호출 측(LLM 분석 단계)이 DB 저장을 기다리지 않습니다.
+    버퍼가 backlog_max_rows 이상 쌓이면 flush가 따라잡을 때까지 add()가 대기합니다.
+    """
+
+    def __init__(
+        self,
+        max_rows: int = FLUSH_MAX_ROWS,
+        max_wait_sec: float = FLUSH_MAX_WAIT_SEC,
+        db=None,
+        backlog_max_rows: int = BACKLOG_MAX_ROWS,
+        on_flushed=None,
+    ):
+        super().__init__(max_rows, max_wait_sec, db=db, on_flushed=on_flushed)
+        self._backlog_max_rows = max(self._max_rows, int(backlog_max_rows))
+        self._cond = threading.Condition(self._lock)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="signal-writer", daemon=True)
+        self._thread.start()
+
+    def add_row(self, row: dict) -> None:
+        with self._cond:
+            while len(self._rows) >= self._backlog_max_rows and not self._closed:
+                self._cond.wait(0.5)
+            self._put(row)
+            self._cond.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._closed and not self._due():
+                    # 다음 시간 기준 flush 시점까지 (버퍼가 비었으면 새 row가 들어올 때까지) 대기
+                    timeout = None
+                    if self._oldest_at is not None:
+                        timeout = max(0.0, self._max_wait_sec - (time.monotonic() - self._oldest_at))
+                    self._cond.wait(timeout)
+                closed = self._closed
+            self.flush()
+            with self._cond:
+                self._cond.notify_all()  # backpressure로 대기 중인 add()를 깨움
+            if closed:
+                return
+
+    def close(self) -> FlushResult:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+        return self.total
+
+
+class AsyncSignalWriter(_SignalBuffer):
+    """비동기 워커(dart_llm_worker, dart_scout_worker)용 signals 쓰기 버퍼."""
+
+    def __init__(self, db, max_rows: int = FLUSH_MAX_ROWS, max_wait_sec: float = FLUSH_MAX_WAIT_SEC):
+        super().__init__(max_rows, max_wait_sec)
+        self._db = db
+
+    async def add(
+        self,
+        article_id: str | None,
+        sig: dict,
+        source: str = "news",
+        rcept_no: str | None = None,
+        company_role: str | None = None,
+    ) -> None:
+        if company_role is None:
+            # role 조회는 동기 싱글톤을 쓰므로 스레드로 분리합니다.
+            company_role = await asyncio.to_thread(get_company_role, sig.get("company_name", ""))
+        row = build_signal_row(article_id, sig, source=source, rcept_no=rcept_no, company_role=company_role)
+        await self.add_row(row)
+
+    async def add_row(self, row: dict) -> None:
+        self._put(row)
+        if self._due():
+            await self.flush()
+
+    async def flush(self) -> FlushResult:
+        # _take()와 await 사이에 다른 코루틴이 끼어들지 않으므로 버퍼 교체는 원자적입니다.
+        groups, deduped = self._take()
+        res = FlushResult(deduped=deduped)
+        for rows in groups:
+            try:
+                await self._db.table("signals").upsert(rows, on_conflict="event_hash", returning="minimal").execute()
+                res.saved += len(rows)
+            except Exception:
+                for row in rows:
+                    try:
+                        await self._db.table("signals").upsert(row, on_conflict="event_hash", returning="minimal").execute()
+                        res.saved += 1
+                    except Exception as e:
+                        res.failed.append((row, str(e)))
+        self.total.merge(res)
+        return res
+
+    async def close(self) -> FlushResult:
+        await self.flush()
+        return self.total
+
+    async def __aenter__(self) -> "AsyncSignalWriter":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
@@ -0,0 +1,30 @@
+-- crawler/sql/article_duplicates.sql
+--
+-- 유사(전재) 기사 묶음
+-- - run_crawler는 묶음마다 대표 기사만 LLM 분석하고, 나머지 멤버 기사를 여기에 대표 기사 id와 함께 기록합니다.
+-- - 시그널은 대표 기사(signals.article_id)에만 저장되므로, 멤버 기사까지 포함한 연결은
+--   signal_articles 뷰로 조회합니다.
+--
+-- 적용: Supabase SQL Editor에서 이 파일을 실행 (재실행 가능)
+
+create table if not exists public.article_duplicates (
+    article_id        uuid primary key references public.articles(id) on delete cascade,  -- 멤버 기사
+    representative_id uuid not null references public.articles(id) on delete cascade,    -- 대표 기사 (LLM 분석 대상)
+    distance          smallint not null,           -- SimHash 해밍 거리 (0 ~ NEAR_DUP_MAX_DISTANCE)
+    created_at        timestamptz not null default now()
+);
+
+create index if not exists article_duplicates_representative_idx
+    on public.article_duplicates (representative_id);
+
+-- 시그널 ↔ 기사 연결 (대표 기사 + 같은 묶음의 멤버 기사)
+create or replace view public.signal_articles as
+select s.event_hash, s.article_id, true as is_representative
+from public.signals s
+where s.article_id is not null
+union all
+select s.event_hash, d.article_id, false as is_representative
+from public.signals s
+join public.article_duplicates d on d.representative_id = s.article_id;
+
+notify pgrst, 'reload schema';
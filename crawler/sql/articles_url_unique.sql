@@ -0,0 +1,37 @@
+-- crawler/sql/articles_url_unique.sql
+--
+-- articles.url 유니크 인덱스
+-- - save_articles_bulk(insert_articles_bulk)는 upsert(on_conflict="url", ignore_duplicates=True)로
+--   이미 있는 URL을 건너뜁니다. PostgREST의 on_conflict는 해당 컬럼에 유니크 제약/인덱스가 있어야 하며,
+--   없으면 42P10 오류로 모든 기사 저장이 실패합니다.
+-- - 기존 데이터에 같은 URL이 여러 번 저장돼 있으면 인덱스를 만들 수 없으므로 먼저 정리합니다.
+--   (URL마다 가장 먼저 저장된 row만 남기고, 나머지를 가리키던 signals.article_id는 남는 row로 옮김)
+--
+-- 적용: Supabase SQL Editor에서 이 파일을 실행 (재실행 가능)
+
+begin;
+
+create temporary table articles_url_dups on commit drop as
+select id, keep_id
+from (
+    select id,
+           first_value(id) over (partition by url order by created_at nulls last, id) as keep_id
+    from public.articles
+    where url is not null
+) t
+where id <> keep_id;
+
+update public.signals s
+set article_id = d.keep_id
+from articles_url_dups d
+where s.article_id = d.id;
+
+delete from public.articles a
+using articles_url_dups d
+where a.id = d.id;
+
+create unique index if not exists articles_url_key on public.articles (url);
+
+commit;
+
+notify pgrst, 'reload schema';
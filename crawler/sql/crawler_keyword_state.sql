@@ -0,0 +1,38 @@
+-- crawler/sql/crawler_keyword_state.sql
+--
+-- 키워드(검색 쿼리)별 수집 워터마크
+-- - crawler_state(id=1)의 전역 last_crawled_at 하나 대신 쿼리마다 마지막으로 본 기사 시각을 보관합니다.
+-- - run_crawler가 실행 시작 시 한 번에 읽고(in 조회), 종료 시 한 번에 upsert 합니다.
+-- - 행이 없는 쿼리는 전역 crawler_state.last_crawled_at을 기준으로 삼습니다. (기존 동작과 동일)
+--
+-- 적용: Supabase SQL Editor에서 이 파일을 실행 (재실행 가능)
+
+create table if not exists public.crawler_keyword_state (
+    query           text primary key,          -- 네이버 검색 쿼리 (확장 쿼리 포함)
+    last_crawled_at timestamp not null,        -- 이 쿼리로 수집한 가장 최신 기사 발행 시각 (UTC naive)
+    updated_at      timestamptz not null default now()
+);
+
+-- 검색 쿼리별 성과 (services/query_planner.py)
+-- - 검색할 때마다 이전 값에 QUERY_STATS_DECAY를 곱하고 이번 실행 값을 더한 감쇠 누적값입니다. (최근 성과 위주)
+-- - 확장 쿼리("키워드 확장어")는 이 성과로 계속 검색할지 / 가끔만 검색할지 / 뺄지를 정합니다.
+create table if not exists public.crawler_query_stats (
+    query          text primary key,              -- 네이버 검색 쿼리
+    base_keyword   text,                          -- 원본 모니터링 키워드
+    term           text,                          -- 확장어 (원본 키워드 자체면 NULL)
+    calls          double precision not null default 0,  -- 검색 실행 횟수 (감쇠 누적)
+    new_articles   double precision not null default 0,  -- 신규 기사 수 (감쇠 누적)
+    signals        double precision not null default 0,  -- 저장된 시그널 수 (감쇠 누적)
+    confidence_sum double precision not null default 0,  -- 저장된 시그널 confidence 합 (감쇠 누적)
+    last_called_at timestamptz,                   -- 마지막 검색 시각
+    last_signal_at timestamptz,                   -- 마지막으로 시그널이 나온 시각
+    updated_at     timestamptz not null default now()
+);
+
+-- 쿼리별 발행 빈도 / 검색 주기 (services/crawl_scheduler.py)
+-- 발행 빈도(시간당 기사 수) ≈ rate_events / rate_hours (둘 다 검색할 때마다 감쇠 누적)
+alter table public.crawler_query_stats add column if not exists rate_events       double precision not null default 0;
+alter table public.crawler_query_stats add column if not exists rate_hours        double precision not null default 0;
+alter table public.crawler_query_stats add column if not exists poll_interval_min double precision;  -- 마지막으로 정한 검색 주기 (분)
+
+notify pgrst, 'reload schema';
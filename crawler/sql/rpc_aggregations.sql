@@ -0,0 +1,106 @@
+-- crawler/sql/rpc_aggregations.sql
+--
+-- 서버 측 집계 함수 (PostgREST RPC: POST /rest/v1/rpc/<함수명>)
+-- - score_batch_worker / daily_radar_report_worker가 signals 원본 row를 내려받아
+--   파이썬에서 group by 하던 것을 DB 안에서 처리하고 집계 결과만 돌려받습니다.
+-- - 함수가 아직 배포되지 않았으면 워커는 기존 파이썬 집계로 폴백합니다.
+--
+-- 적용: Supabase SQL Editor에서 이 파일을 실행 (재실행 가능)
+-- 점수 규칙은 파이썬 구현과 동일합니다.
+--   raw = impact_strength * severity_level * confidence
+--   impact_type = 'risk'(대소문자 무시) → risk, 그 외 → opp
+
+
+-- 1) 회사별 일간 raw 점수 합계 (company_signal_daily 입력)
+--    구간: p_start <= created_at < p_end
+--    파이썬 _accumulate_daily와 같이 회사명이 비었거나 점수 컬럼이 NULL인 row는 제외합니다.
+create or replace function public.aggregate_company_signal_daily(
+    p_start timestamptz,
+    p_end   timestamptz
+)
+returns table (
+    company_name   text,
+    risk_score_raw double precision,
+    opp_score_raw  double precision,
+    signal_count   integer
+)
+language sql
+stable
+as $$
+    select
+        btrim(s.company_name)                                            as company_name,
+        coalesce(sum(s.impact_strength::float8 * s.severity_level::float8 * s.confidence::float8)
+                 filter (where lower(coalesce(s.impact_type, '')) = 'risk'), 0)  as risk_score_raw,
+        coalesce(sum(s.impact_strength::float8 * s.severity_level::float8 * s.confidence::float8)
+                 filter (where lower(coalesce(s.impact_type, '')) <> 'risk'), 0) as opp_score_raw,
+        count(*)::integer                                                as signal_count
+    from public.signals s
+    where s.created_at >= p_start
+      and s.created_at <  p_end
+      and btrim(coalesce(s.company_name, '')) <> ''
+      and s.impact_strength is not null
+      and s.severity_level  is not null
+      and s.confidence      is not null
+    group by btrim(s.company_name)
+$$;
+
+
+-- 2) 트렌드 집계 (industry_tag, trend_bucket, signal_category) — 데일리 리포트용
+--    구간: created_at >= p_since
+--    정렬: (risk+opp) raw 총합, count 내림차순 상위 p_topn개
+--    examples: '회사: 이벤트' 최대 p_examples개 (최신순)
+create or replace function public.aggregate_signal_trends(
+    p_since    timestamptz,
+    p_topn     integer default 10,
+    p_examples integer default 2
+)
+returns table (
+    industry_tag    text,
+    trend_bucket    text,
+    signal_category text,
+    count           integer,
+    risk_raw_sum    double precision,
+    opp_raw_sum     double precision,
+    examples        text[]
+)
+language sql
+stable
+as $$
+    with base as (
+        select
+            coalesce(nullif(s.industry_tag, ''), 'General')     as industry_tag,
+            coalesce(nullif(s.trend_bucket, ''), 'Momentum')    as trend_bucket,
+            coalesce(nullif(s.signal_category, ''), 'Risk')     as signal_category,
+            lower(coalesce(s.impact_type, '')) = 'risk'         as is_risk,
+            coalesce(s.impact_strength, 0)::float8
+              * coalesce(s.severity_level, 0)::float8
+              * coalesce(s.confidence, 0)::float8               as raw,
+            btrim(coalesce(s.company_name, ''))                 as company_name,
+            btrim(coalesce(s.event_type, ''))                   as event_type,
+            s.created_at
+        from public.signals s
+        where s.created_at >= p_since
+    )
+    select
+        b.industry_tag,
+        b.trend_bucket,
+        b.signal_category,
+        count(*)::integer                                     as count,
+        coalesce(sum(b.raw) filter (where b.is_risk), 0)      as risk_raw_sum,
+        coalesce(sum(b.raw) filter (where not b.is_risk), 0)  as opp_raw_sum,
+        coalesce(
+            (array_agg(b.company_name || ': ' || b.event_type order by b.created_at desc)
+                filter (where b.event_type <> ''))[1:p_examples],
+            '{}'
+        )                                                     as examples
+    from base b
+    group by b.industry_tag, b.trend_bucket, b.signal_category
+    order by (coalesce(sum(b.raw) filter (where b.is_risk), 0)
+              + coalesce(sum(b.raw) filter (where not b.is_risk), 0)) desc,
+             count(*) desc
+    limit greatest(p_topn, 0)
+$$;
+
+
+-- PostgREST 스키마 캐시 갱신 (새 함수 노출)
+notify pgrst, 'reload schema';
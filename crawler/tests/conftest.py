@@ -0,0 +1,18 @@
+"""
+tests/conftest.py — crawler 폴더를 import 경로에 추가합니다.
+
+repositories/db.py 등은 import 시점에 설정을 읽으므로 더미 값을 넣어 둡니다.
+(테스트는 실제 Supabase/OpenAI에 연결하지 않고 전송 계층을 가짜로 바꿔 씁니다.)
+
+실행 방법:
+    crawler 폴더에서:  python -m pytest -q tests
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:9")
+os.environ.setdefault("SUPABASE_KEY", "test-key")
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
@@ -0,0 +1,93 @@
+"""crawlers/canonical_url.py — 정규화 규칙 표 테스트"""
+
+import pytest
+
+from crawlers.canonical_url import canonical_url, pick_article_url
+
+NAVER = "https://n.news.naver.com/mnews/article/001/0014000000"
+
+
+@pytest.mark.parametrize("url", [
+    "https://news.naver.com/main/read.naver?mode=LSD&mid=sec&sid1=101&oid=001&aid=0014000000",
+    "https://n.news.naver.com/article/001/0014000000?sid=101",
+    "https://m.news.naver.com/read.naver?oid=001&aid=0014000000",
+    "https://n.news.naver.com/mnews/article/001/0014000000?sid=101#comment",
+])
+def test_naver_news_variants_collapse(url):
+    assert canonical_url(url) == NAVER
+
+
+def test_naver_host_without_article_id_is_kept():
+    assert canonical_url("https://news.naver.com/main/list.naver?sid1=101") == \
+        "https://news.naver.com/main/list.naver?sid1=101"
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("https://sports.news.naver.com/news?oid=1&aid=2&sid=3", "https://sports.news.naver.com/news?aid=2&oid=1"),
+    ("https://v.daum.net/v/20261018?f=o", "https://v.daum.net/v/20261018"),
+    ("https://www.yna.co.kr/view/AKR1?input=1195m", "https://www.yna.co.kr/view/AKR1"),
+])
+def test_host_rules(url, expected):
+    assert canonical_url(url) == expected
+
+
+def test_path_rule_keeps_only_article_id():
+    url = "http://www.example.co.kr/news/articleView.html?idxno=123&utm_source=naver&replyAll="
+    assert canonical_url(url) == "http://www.example.co.kr/news/articleView.html?idxno=123"
+
+
+@pytest.mark.parametrize("url", [
+    "https://www.news1.kr/view.php?idx=111",
+    "https://www.example.com/news/articleView.html?num=1",
+])
+def test_path_rule_skipped_when_id_param_differs(url):
+    # 규칙의 id 파라미터가 없으면 다른 이름의 id를 지우지 않습니다.
+    assert canonical_url(url) == url
+
+
+def test_path_rule_does_not_merge_distinct_articles():
+    a = canonical_url("https://www.news1.kr/view.php?idx=111&utm_medium=x")
+    b = canonical_url("https://www.news1.kr/view.php?idx=222")
+    assert a == "https://www.news1.kr/view.php?idx=111"
+    assert a != b
+
+
+def test_generic_tracking_strip_and_notation():
+    url = "https://Example.com:443/a?b=2&a=1&fbclid=xx&utm_medium=y#top"
+    assert canonical_url(url) == "https://example.com/a?a=1&b=2"
+
+
+def test_non_default_port_kept():
+    assert canonical_url("http://example.com:8080/a") == "http://example.com:8080/a"
+
+
+@pytest.mark.parametrize("url", [
+    "https://news.naver.com/main/read.naver?oid=001&aid=0014000000",
+    "https://www.news1.kr/view.php?idx=111",
+    "http://www.example.co.kr/news/articleView.html?idxno=123&utm_source=naver",
+    "https://Example.com:443/a?b=2&a=1",
+    "not a url",
+])
+def test_idempotent(url):
+    once = canonical_url(url)
+    assert canonical_url(once) == once
+
+
+def test_empty():
+    assert canonical_url("") == ""
+    assert canonical_url(None) == ""
+
+
+def test_pick_article_url_prefers_naver_hosted():
+    assert pick_article_url(
+        "https://n.news.naver.com/mnews/article/001/0014000000?sid=101",
+        "https://www.yna.co.kr/view/AKR1?input=1195m",
+    ) == NAVER
+
+
+def test_pick_article_url_falls_back_to_original():
+    assert pick_article_url(
+        "https://www.example.com/a?utm_source=naver",
+        "https://www.example.com/a?utm_source=naver&id=7",
+    ) == "https://www.example.com/a?id=7"
+    assert pick_article_url("https://www.example.com/a", "") == "https://www.example.com/a"
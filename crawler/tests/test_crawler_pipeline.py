@@ -0,0 +1,101 @@
+"""services/crawler_service.py — 수집 → LLM 분석 파이프라인 (묶음 만들기 / backpressure) 테스트"""
+
+import queue
+import threading
+import time
+
+from services import crawler_service
+from services.crawler_service import LLM_BATCH_LINGER_SEC, LLM_BATCH_SIZE, _STOP, _iter_batches
+
+
+def _items(n, start=0):
+    return [{"article_id": f"a{i}", "url": f"u{i}"} for i in range(start, start + n)]
+
+
+def test_full_batch_is_yielded_without_waiting_for_linger():
+    q = queue.Queue()
+    for item in _items(LLM_BATCH_SIZE + 1):
+        q.put(item)
+
+    t0 = time.monotonic()
+    batch = next(_iter_batches(q, LLM_BATCH_SIZE, LLM_BATCH_LINGER_SEC))
+
+    assert len(batch) == LLM_BATCH_SIZE == 15
+    assert time.monotonic() - t0 < LLM_BATCH_LINGER_SEC / 2
+
+
+def test_partial_batch_is_yielded_after_linger():
+    q = queue.Queue()
+    for item in _items(3):
+        q.put(item)
+
+    t0 = time.monotonic()
+    batch = next(_iter_batches(q, LLM_BATCH_SIZE, 0.2))
+
+    assert [b["url"] for b in batch] == ["u0", "u1", "u2"]
+    assert time.monotonic() - t0 >= 0.2
+
+
+def test_stop_flushes_remaining_items():
+    q = queue.Queue()
+    for item in _items(LLM_BATCH_SIZE * 2 + 1):
+        q.put(item)
+    q.put(_STOP)
+
+    sizes = [len(b) for b in _iter_batches(q, LLM_BATCH_SIZE, LLM_BATCH_LINGER_SEC)]
+    assert sizes == [15, 15, 1]
+
+
+class _FakeWriter:
+    added = 0
+
+
+class _FakeSpool:
+    def __init__(self):
+        self.analyzed_urls = []
+
+    def analyzed(self, urls, seq):
+        self.analyzed_urls.extend(urls)
+
+
+def test_full_queue_blocks_producer_until_analysis_catches_up(monkeypatch):
+    release = threading.Event()
+
+    def slow_analyze(chunk, writer=None):
+        release.wait(5)
+        return {"articles": len(chunk)}
+
+    monkeypatch.setattr(crawler_service, "OPENAI_CONCURRENCY", 1)
+    monkeypatch.setattr(crawler_service, "LLM_BATCH_SIZE", 2)
+    monkeypatch.setattr(crawler_service, "LLM_BATCH_LINGER_SEC", 0.05)
+    monkeypatch.setattr(crawler_service, "analyze_batch", slow_analyze)
+
+    q = queue.Queue(maxsize=2)
+    spool = _FakeSpool()
+    stats = {"analyzed": 0, "general_registered": 0, "failed_batches": 0, "by_article": {}}
+    stage = threading.Thread(target=crawler_service._analysis_stage, args=(q, _FakeWriter(), spool, stats))
+    stage.start()
+
+    put = []
+
+    def produce():
+        for item in _items(10):
+            q.put(item)
+            put.append(item)
+
+    producer = threading.Thread(target=produce)
+    producer.start()
+    time.sleep(0.5)
+
+    # 분석 중 1묶음(2) + 분석 자리를 기다리는 묶음(2) + 가득 찬 대기열(2)까지만 받고 수집 단계는 대기
+    assert producer.is_alive()
+    assert len(put) <= 6
+
+    release.set()
+    producer.join(5)
+    q.put(_STOP)
+    stage.join(5)
+
+    assert not producer.is_alive() and not stage.is_alive()
+    assert stats["analyzed"] == 10
+    assert sorted(spool.analyzed_urls) == sorted(f"u{i}" for i in range(10))
@@ -0,0 +1,141 @@
+"""repositories/db.py — 재시도(_RetryPolicy) / 서킷 브레이커(_CircuitBreaker) 테스트 (가짜 전송 계층)"""
+
+import json
+
+import pytest
+
+from repositories.db import (
+    CircuitOpenError,
+    SupabaseRestError,
+    _CircuitBreaker,
+    _is_replayable,
+    _RestSupabaseClient,
+    _RetryPolicy,
+)
+
+
+class FakeResponse:
+    def __init__(self, status_code, text="[]", headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.content = text.encode()
+        self.headers = headers or {}
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class FakeHttp:
+    """_PooledHttp 대신 쓰는 전송 계층. outcomes를 앞에서부터 하나씩 돌려줍니다. (예외면 raise)"""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = []
+
+    def request(self, method, url, headers, params, json):
+        self.calls.append(method)
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+
+def _client(*outcomes, max_retries=2, threshold=3, cooldown_sec=60.0):
+    client = _RestSupabaseClient(
+        "http://127.0.0.1:9",
+        "test-key",
+        retry=_RetryPolicy(max_retries=max_retries, base_sec=0, max_sec=0),
+        breaker=_CircuitBreaker(threshold=threshold, cooldown_sec=cooldown_sec),
+    )
+    client._http = FakeHttp(*outcomes)
+    return client
+
+
+@pytest.mark.parametrize("method, table, on_conflict, expected", [
+    ("GET", "articles", None, True),
+    ("HEAD", "articles", None, True),
+    ("PATCH", "articles", None, True),
+    ("DELETE", "articles", None, True),
+    ("POST", "signals", "event_hash", True),
+    ("POST", "articles", None, False),           # 단순 insert는 중복 위험
+    ("POST", "rpc/aggregate", "id", False),      # rpc는 on_conflict가 있어도 재전송하지 않음
+])
+def test_is_replayable(method, table, on_conflict, expected):
+    assert _is_replayable(method, table, on_conflict) is expected
+
+
+def test_get_is_retried_until_success():
+    client = _client(FakeResponse(503), FakeResponse(200, '[{"id": 1}]'))
+
+    result = client.table("articles").select("id").execute()
+
+    assert result.data == [{"id": 1}]
+    assert client._http.calls == ["GET", "GET"]
+
+
+def test_post_without_on_conflict_is_not_retried():
+    client = _client(FakeResponse(503), FakeResponse(201))
+
+    with pytest.raises(SupabaseRestError):
+        client.table("articles").insert({"url": "u"}).execute()
+    assert client._http.calls == ["POST"]
+
+
+def test_post_without_on_conflict_network_error_is_not_retried():
+    client = _client(ConnectionError("reset"), FakeResponse(201))
+
+    with pytest.raises(ConnectionError):
+        client.table("articles").insert({"url": "u"}).execute()
+    assert client._http.calls == ["POST"]
+
+
+def test_upsert_with_on_conflict_is_retried():
+    client = _client(FakeResponse(503), FakeResponse(201))
+
+    client.table("signals").upsert({"event_hash": "h"}, on_conflict="event_hash").execute()
+    assert client._http.calls == ["POST", "POST"]
+
+
+def test_breaker_opens_after_threshold():
+    client = _client(*[FakeResponse(503)] * 3, max_retries=0, threshold=3)
+
+    for _ in range(3):
+        with pytest.raises(SupabaseRestError):
+            client.table("articles").select("id").execute()
+    assert client._breaker.state == "open"
+
+    # OPEN 동안은 요청을 보내지 않고 즉시 실패
+    with pytest.raises(CircuitOpenError):
+        client.table("articles").select("id").execute()
+    assert len(client._http.calls) == 3
+
+
+def test_breaker_4xx_does_not_count_as_failure():
+    client = _client(*[FakeResponse(400, '{"message": "bad"}')] * 3, max_retries=0, threshold=2)
+
+    for _ in range(3):
+        with pytest.raises(SupabaseRestError):
+            client.table("articles").select("id").execute()
+    assert client._breaker.state == "closed"
+
+
+def test_probe_without_outcome_frees_half_open_slot():
+    client = _client(
+        FakeResponse(503),           # 1) OPEN
+        KeyboardInterrupt(),         # 2) 시험 요청이 결과 기록 없이 중단
+        FakeResponse(200),           # 3) 다음 시험 요청 → CLOSED
+        max_retries=0, threshold=1, cooldown_sec=0,
+    )
+
+    with pytest.raises(SupabaseRestError):
+        client.table("articles").select("id").execute()
+    assert client._breaker.state == "open"
+
+    with pytest.raises(KeyboardInterrupt):
+        client.table("articles").select("id").execute()
+    # end_probe()가 half-open 자리를 풀어 다음 요청이 다시 시험할 수 있어야 함
+    assert client._breaker.state == "open"
+
+    client.table("articles").select("id").execute()
+    assert client._breaker.state == "closed"
+    assert len(client._http.calls) == 3
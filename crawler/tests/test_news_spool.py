@@ -0,0 +1,93 @@
+"""repositories/news_spool.py — 체크포인트 스풀 재개 / 시그널 저장 실패 기사 보존 테스트"""
+
+from datetime import datetime, timezone
+
+from repositories.news_spool import NewsSpool
+from services.signal_writer import SignalWriter
+
+PUBLISHED = datetime(2026, 10, 18, 9, tzinfo=timezone.utc)
+
+
+def _article(url):
+    return {"url": url, "title": f"{url} 제목", "description": "요약", "published_at": PUBLISHED}
+
+
+def _spool(tmp_path):
+    return NewsSpool(path=str(tmp_path / "spool.jsonl"), ttl_hours=24, enabled=True)
+
+
+def test_load_resumes_staged_and_saved_entries(tmp_path):
+    spool = _spool(tmp_path)
+    spool.load()
+    spool.stage([(_article("u1"), ["kw1"]), (_article("u2"), ["kw2"]), (_article("u3"), ["kw3"])])
+    spool.saved({"u1": "a1"})
+    spool.drop(["u3"])
+    # close() 없이 죽은 것처럼 다음 실행이 같은 파일을 읽습니다.
+
+    pending = {p["url"]: p for p in _spool(tmp_path).load()}
+
+    assert set(pending) == {"u1", "u2"}
+    assert pending["u1"]["article_id"] == "a1"
+    assert "article_id" not in pending["u2"]
+    assert pending["u2"]["keywords"] == ["kw2"]
+    assert pending["u2"]["published_at"] == PUBLISHED.isoformat()
+
+
+def test_load_skips_truncated_last_line(tmp_path):
+    spool = _spool(tmp_path)
+    spool.load()
+    spool.stage([(_article("u1"), ["kw"])])
+    with open(tmp_path / "spool.jsonl", "a", encoding="utf-8") as f:
+        f.write('{"t": "done", "url": "u1"')  # 기록 도중 죽음
+
+    assert [p["url"] for p in _spool(tmp_path).load()] == ["u1"]
+
+
+def test_finished_spool_removes_file(tmp_path):
+    spool = _spool(tmp_path)
+    spool.load()
+    spool.stage([(_article("u1"), ["kw"])])
+    spool.saved({"u1": "a1"})
+    spool.analyzed(["u1"], seq=1)
+    spool.on_flushed(1)
+
+    assert spool.close() == 0
+    assert not (tmp_path / "spool.jsonl").exists()
+
+
+class _FailingDb:
+    """article_id가 fail_ids인 row가 들어 있는 upsert는 실패시키는 가짜 DB"""
+
+    def __init__(self, fail_ids):
+        self.fail_ids = set(fail_ids)
+        self._payload = None
+
+    def table(self, name):
+        return self
+
+    def upsert(self, payload, on_conflict=None, returning=None):
+        self._payload = payload if isinstance(payload, list) else [payload]
+        return self
+
+    def execute(self):
+        if any(r.get("article_id") in self.fail_ids for r in self._payload):
+            raise RuntimeError("Supabase REST error 500")
+
+
+def test_on_flushed_keeps_entries_whose_signals_failed(tmp_path):
+    spool = _spool(tmp_path)
+    spool.load()
+    spool.stage([(_article("u1"), ["kw"]), (_article("u2"), ["kw"])])
+    spool.saved({"u1": "a1", "u2": "a2"})
+
+    writer = SignalWriter(db=_FailingDb({"a2"}), on_flushed=spool.on_flushed)
+    writer.add_row({"event_hash": "h1", "article_id": "a1"})
+    writer.add_row({"event_hash": "h2", "article_id": "a2"})
+    spool.analyzed(["u1", "u2"], writer.added)
+    result = writer.close()
+
+    assert result.saved == 1 and len(result.failed) == 1
+    assert spool.close() == 1
+
+    pending = _spool(tmp_path).load()
+    assert [(p["url"], p["article_id"]) for p in pending] == [("u2", "a2")]
@@ -0,0 +1,97 @@
+"""crawlers/query_packer.py + NaverNewsCrawler 묶음 검색 테스트 (네이버 API 대신 가짜 색인)"""
+
+from datetime import datetime, timedelta, timezone
+
+from crawlers.naver_news import NaverNewsCrawler
+from crawlers.query_packer import KeywordMatcher, attribute, or_query, pack_keywords
+
+NOW = datetime(2026, 10, 18, 12, tzinfo=timezone.utc)
+MARK = (NOW - timedelta(hours=2)).replace(tzinfo=None)  # DB 워터마크처럼 UTC naive
+
+
+def _article(url, title, body="", minutes_ago=1):
+    return {
+        "title": title,
+        "description": "요약",
+        "body": body,  # 검색 엔진만 보는 본문 (attribute는 제목/요약만 봄)
+        "url": url,
+        "published_at": NOW - timedelta(minutes=minutes_ago),
+    }
+
+
+class FakeCrawler(NaverNewsCrawler):
+    """제목/요약/본문 어디든 검색어가 나오면 걸리는 가짜 색인"""
+
+    def __init__(self, index):
+        super().__init__(concurrency=2, rps=0)
+        self.index = index
+        self.queries = []
+
+    def _fetch_page(self, query, start, display):
+        self.queries.append(query)
+        terms = [t.strip() for t in query.split("|")]
+        hits = [
+            a for a in self.index
+            if any(t in f"{a['title']} {a['description']} {a['body']}" for t in terms)
+        ]
+        hits.sort(key=lambda a: a["published_at"], reverse=True)
+        return [dict(a) for a in hits[start - 1:start - 1 + display]]
+
+
+def _fetch(crawler, keywords):
+    since = {kw: MARK for kw in keywords}
+    expected = {kw: 1.0 for kw in keywords}
+    return {kw: [a["url"] for a in articles] for kw, articles in crawler.fetch_many(keywords, since=since, expected=expected)}
+
+
+def test_packed_group_is_split_by_keyword():
+    crawler = FakeCrawler([
+        _article("a1", "알파제약 신약 승인"),
+        _article("b1", "베타바이오 실적", minutes_ago=3),
+    ])
+    result = _fetch(crawler, ["알파제약", "베타바이오"])
+
+    assert crawler.queries == [or_query(["알파제약", "베타바이오"])]
+    assert result == {"알파제약": ["a1"], "베타바이오": ["b1"]}
+
+
+def test_body_only_match_falls_back_to_individual_search():
+    crawler = FakeCrawler([
+        _article("a1", "알파제약 신약 승인"),
+        _article("body", "업계 동향", body="베타바이오 공장 증설", minutes_ago=2),
+    ])
+    result = _fetch(crawler, ["알파제약", "베타바이오"])
+
+    # 묶음 결과에 나눌 수 없는 기사가 있으면 키워드별로 다시 검색 → 본문 매칭 기사도 빠지지 않음
+    assert sorted(crawler.queries[1:]) == ["베타바이오", "알파제약"]
+    assert result == {"알파제약": ["a1"], "베타바이오": ["body"]}
+
+
+def test_attribute_counts_unmatched():
+    articles = [_article("a1", "알파제약"), _article("x", "무관한 기사")]
+    by_keyword, unmatched = attribute(articles, ["알파제약", "베타바이오"])
+
+    assert [a["url"] for a in by_keyword["알파제약"]] == ["a1"]
+    assert by_keyword["베타바이오"] == []
+    assert unmatched == 1
+
+
+def test_keyword_matcher_overlapping_patterns():
+    matcher = KeywordMatcher(["he", "she", "his", "hers", "삼성", "삼성바이오"])
+
+    assert matcher.find("USHERS") == {"he", "she", "hers"}
+    assert matcher.find("삼성 바이오로직스") == {"삼성", "삼성바이오"}  # 공백 무시
+    assert matcher.find("무관") == set()
+
+
+def test_pack_keywords_limits():
+    keywords = [f"kw{i}" for i in range(25)]
+    expected = {kw: 3.0 for kw in keywords}
+    expected["kw0"] = 80.0  # 상한 초과 → 개별
+
+    groups, singles = pack_keywords(keywords + ["두 단어"], expected, max_keywords=10, max_expected=50.0)
+
+    assert "kw0" in singles and "두 단어" in singles
+    assert all(2 <= len(g) <= 10 for g in groups)
+    assert all(sum(expected[kw] for kw in g) <= 50.0 for g in groups)
+    assert {kw for g in groups for kw in g} | set(singles) == set(keywords) | {"두 단어"}
@@ -36,12 +36,12 @@ def _safe_upsert(table: str, key_cols: List[str], row: Dict[str, Any]) -> None:
     existing = q.limit(1).execute().data or []
 
     if existing:
-        uq = supabase.table(table).update(row)
+        uq = supabase.table(table).update(row, returning="minimal")
         for k in key_cols:
             uq = uq.eq(k, row[k])
         uq.execute()
     else:
-        supabase.table(table).insert(row).execute()
+        supabase.table(table).insert(row, returning="minimal").execute()
 
 
 def _get_target_companies() -> List[Dict[str, Any]]:
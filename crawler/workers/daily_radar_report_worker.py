@@ -2,7 +2,7 @@
 daily_radar_report_worker.py
 
 - company_scores 기반 Top Risk / Top Opportunity 요약
-- signals(최근 30일) 기반 트렌드 집계(파이썬에서)
+- signals(최근 30일) 기반 트렌드 집계 (DB 함수 aggregate_signal_trends, 없으면 파이썬에서)
 - LLM(JSON)로 데일리 리포트 생성
 - daily_opportunity_reports(report_date)로 upsert
 
@@ -15,6 +15,7 @@ daily_radar_report_worker.py
 - REPORT_TIMEOUT (기본 60)
 - REPORT_SIGNALS_LOOKBACK_DAYS (기본 30)
 - REPORT_TRENDS_TOPN (기본 10)
+- REPORT_USE_RPC (기본 1) : 0이면 RPC 대신 signals를 내려받아 파이썬에서 집계
 """
 
 from __future__ import annotations
@@ -23,7 +24,7 @@ import os
 from datetime import datetime, timedelta, date
 from typing import Any, Dict, List, Tuple
 
-from repositories.db import supabase
+from repositories.db import supabase, stream_rows
 from llm.openai_compat import chat_completions_json
 
 
@@ -39,12 +40,12 @@ def _safe_upsert(table: str, key_cols: List[str], row: Dict[str, Any]) -> None:
     existing = q.limit(1).execute().data or []
 
     if existing:
-        uq = supabase.table(table).update(row)
+        uq = supabase.table(table).update(row, returning="minimal")
         for k in key_cols:
             uq = uq.eq(k, row[k])
         uq.execute()
     else:
-        supabase.table(table).insert(row).execute()
+        supabase.table(table).insert(row, returning="minimal").execute()
 
 
 def _raw_score(sig: Dict[str, Any]) -> float:
@@ -81,15 +82,29 @@ def _get_trends() -> List[Dict[str, Any]]:
     topn = int(os.getenv("REPORT_TRENDS_TOPN") or "10")
     since = (datetime.utcnow() - timedelta(days=lookback_days)).isoformat()
 
-    # NOTE: group by가 없으니 파이썬에서 집계
-    rows = (
-        supabase.table("signals")
-        .select("company_name,impact_type,impact_strength,severity_level,confidence,signal_category,industry_tag,trend_bucket,created_at,event_type")
-        .gte("created_at", since)
-        .limit(5000)
-        .execute()
-        .data
-        or []
+    # 서버 측 집계 (crawler/sql/rpc_aggregations.sql) → 상위 topn개 그룹만 내려받음
+    if (os.getenv("REPORT_USE_RPC") or "1").strip() != "0":
+        try:
+            trends = (
+                supabase.rpc("aggregate_signal_trends", {"p_since": since, "p_topn": topn, "p_examples": 2})
+                .execute()
+                .data
+                or []
+            )
+            for t in trends:
+                t["examples"] = list(t.get("examples") or [])
+            return trends
+        except Exception as e:
+            print(f"⚠️ RPC aggregate_signal_trends 실패 → 파이썬 집계로 폴백: {e}")
+
+    # 폴백: 파이썬에서 집계 (페이지 단위 스트리밍이라 기간 전체를 빠짐없이 읽음)
+    rows = stream_rows(
+        lambda: (
+            supabase.table("signals")
+            .select("id,company_name,impact_type,impact_strength,severity_level,confidence,signal_category,industry_tag,trend_bucket,created_at,event_type")
+            .gte("created_at", since)
+        ),
+        key="id",
     )
 
     agg: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
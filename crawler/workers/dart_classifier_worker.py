@@ -59,6 +59,18 @@ def get_pending_disclosures(limit: int = BATCH_SIZE) -> list[dict]:
     return result.data or []
 
 
+def count_pending_disclosures() -> int:
+    """PENDING 대기열 깊이. HEAD 요청으로 건수만 받습니다. (row를 내려받지 않음)"""
+    result = (
+        supabase
+        .table("dart_disclosures")
+        .select("rcept_no", count="exact", head=True)
+        .eq("scout_status", "PENDING")
+        .execute()
+    )
+    return result.count or 0
+
+
 # ──────────────────────────────────────────────────────────────────────────────
 # 2) 상태 업데이트
 # ──────────────────────────────────────────────────────────────────────────────
@@ -73,7 +85,7 @@ def update_status(rcept_no: str, status: str) -> None:
                         → dart_llm_worker.py가 이 상태를 읽어 분석을 수행합니다.
         UNMATCHED     - 어떤 키워드도 해당 없음
     """
-    supabase.table("dart_disclosures").update({"scout_status": status}).eq("rcept_no", rcept_no).execute()
+    supabase.table("dart_disclosures").update({"scout_status": status}, returning="minimal").eq("rcept_no", rcept_no).execute()
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -161,16 +173,21 @@ def run() -> None:
     unmatched = 0   # UNMATCHED 건수
     batch_num = 0   # 배치 반복 횟수
 
+    queue_depth = count_pending_disclosures()
+    print(f"[dart_classifier_worker] PENDING 대기열: {queue_depth}건")
+
     # PENDING이 없을 때까지 배치를 반복합니다.
-    while True:
+    # 시작 시점 대기열(queue_depth)만큼 처리하면 멈춥니다. (처리 중 새로 쌓인 공시는 다음 실행에서)
+    while queue_depth > 0:
         disclosures = get_pending_disclosures()
         if not disclosures:
             if batch_num == 0:
                 print("[dart_classifier_worker] PENDING 공시가 없습니다. 종료합니다.")
             break
 
-        batch_num += 1
-        total     += len(disclosures)
+        batch_num   += 1
+        total       += len(disclosures)
+        queue_depth -= len(disclosures)
         print(f"\n[배치 {batch_num}] 분류 대상: {len(disclosures)}건  (누적: {total}건)\n")
 
         for d in disclosures:
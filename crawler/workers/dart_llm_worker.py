@@ -39,9 +39,10 @@ import warnings
 
 warnings.filterwarnings("ignore", category=XMLParsedAsHTMLWarning)
 
-from repositories.db import supabase
+from repositories.db import async_supabase_client
 from config import DART_API_KEY, OPENAI_API_KEY
-from services.instant_signal_service import upsert_signal, upsert_general_company, should_promote_to_potential
+from services.instant_signal_service import upsert_general_company, should_promote_to_potential
+from services.signal_writer import AsyncSignalWriter
 from llm.openai_compat import chat_completions_json
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -78,13 +79,13 @@ FETCH_LIMIT = 200
 # 1) DB 조회 / 상태 업데이트
 # ──────────────────────────────────────────────────────────────────────────────
 
-def get_ready_disclosures(limit: int = FETCH_LIMIT) -> list[dict]:
+async def get_ready_disclosures(db, limit: int = FETCH_LIMIT) -> list[dict]:
     """
     dart_classifier_worker.py가 분류를 완료하여 READY_FOR_LLM 상태가 된
     공시 목록을 DB에서 가져옵니다.
     """
-    result = (
-        supabase
+    result = await (
+        db
         .table("dart_disclosures")
         .select("*")
         .eq("scout_status", "READY_FOR_LLM")
@@ -94,7 +95,19 @@ def get_ready_disclosures(limit: int = FETCH_LIMIT) -> list[dict]:
     return result.data or []
 
 
-async def update_status(rcept_no: str, status: str) -> None:
+async def count_ready_disclosures(db) -> int:
+    """READY_FOR_LLM 대기열 깊이. HEAD 요청으로 건수만 받습니다. (row를 내려받지 않음)"""
+    result = await (
+        db
+        .table("dart_disclosures")
+        .select("rcept_no", count="exact", head=True)
+        .eq("scout_status", "READY_FOR_LLM")
+        .execute()
+    )
+    return result.count or 0
+
+
+async def update_status(db, rcept_no: str, status: str) -> None:
     """
     공시의 처리 상태를 dart_disclosures 테이블에 업데이트합니다.
 
@@ -104,11 +117,8 @@ async def update_status(rcept_no: str, status: str) -> None:
     """
     payload: dict = {"scout_status": status}
 
-    def _do_update():
-        return supabase.table("dart_disclosures").update(payload).eq("rcept_no", rcept_no).execute()
-
-    # Supabase 요청은 동기 함수이므로 비동기 루프를 블로킹하지 않도록 스레드로 분리합니다.
-    await asyncio.to_thread(_do_update)
+    # 비동기 DB 클라이언트로 직접 요청합니다. (to_thread 스레드풀을 거치지 않음)
+    await db.table("dart_disclosures").update(payload, returning="minimal").eq("rcept_no", rcept_no).execute()
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -334,7 +344,7 @@ async def bulk_llm_analyze(items: list[dict]) -> dict[int, list]:
 # 5) 청크 단위 처리
 # ──────────────────────────────────────────────────────────────────────────────
 
-async def process_chunk(client: httpx.AsyncClient, semaphore: asyncio.Semaphore, chunk: list[dict]) -> int:
+async def process_chunk(client: httpx.AsyncClient, semaphore: asyncio.Semaphore, chunk: list[dict], db) -> int:
     """
     LLM_CHUNK_SIZE 단위의 공시 묶음(chunk)을 처리합니다.
 
@@ -380,7 +390,7 @@ async def process_chunk(client: httpx.AsyncClient, semaphore: asyncio.Semaphore,
     for disclosure, err_msg in failed_list:
         rcept_no = disclosure.get("rcept_no", "")
         print(f"    ❌ 원문 추출 실패 → 오류 처리: [{disclosure.get('report_nm', '')}] 사유: {err_msg}")
-        await update_status(rcept_no, "ERROR")
+        await update_status(db, rcept_no, "ERROR")
 
     if not llm_items:
         print("    ⚠️  분석 가능한 공시가 없습니다. (모두 원문 추출 실패)")
@@ -389,8 +399,11 @@ async def process_chunk(client: httpx.AsyncClient, semaphore: asyncio.Semaphore,
     # ── 2단계: 성공한 공시를 LLM에 묶어서 1회 호출 ───────────────
     result_map = await bulk_llm_analyze(llm_items)
 
-    # ── 3단계: LLM 결과를 각 공시에 매핑 → DB 저장 ─────────────
-    total_saved = 0
+    # ── 3단계: LLM 결과를 각 공시에 매핑 → signals 버퍼에 적재 ────
+    # 청크 전체의 시그널을 모아 배열 upsert 1회로 저장한 뒤 상태를 업데이트합니다.
+    # (저장 전에 READY_FOR_ANALYSIS로 바뀌면 중단 시 시그널이 유실되므로 순서 유지)
+    writer  = AsyncSignalWriter(db, max_rows=10_000, max_wait_sec=float("inf"))
+    summary = []  # (source_id, rcept_no, report_nm, saved, promoted)
 
     for idx, item in enumerate(llm_items):
         source_id  = idx + 1  # LLM 프롬프트에서 사용한 #번호 (1부터 시작)
@@ -402,7 +415,7 @@ async def process_chunk(client: httpx.AsyncClient, semaphore: asyncio.Semaphore,
 
         if not signals:
             print(f"    ⚠️  추출된 시그널 없음 (#{source_id}): [{report_nm}]")
-            await update_status(rcept_no, "READY_FOR_ANALYSIS")
+            await update_status(db, rcept_no, "READY_FOR_ANALYSIS")
             continue
 
         saved    = 0
@@ -419,7 +432,7 @@ async def process_chunk(client: httpx.AsyncClient, semaphore: asyncio.Semaphore,
             # confidence 임계값 미만의 시그널은 저장하지 않습니다.
             # 임계값 조절: 상단 CONFIDENCE_THRESHOLD 상수를 변경하세요.
             if float(sig.get("confidence", 1.0)) >= CONFIDENCE_THRESHOLD:
-                upsert_signal(None, sig, source="dart", rcept_no=rcept_no, company_role=source_role)
+                await writer.add(None, sig, source="dart", rcept_no=rcept_no, company_role=source_role)
                 saved += 1
 
                 # 잠재 기업 발굴 조건을 충족하면 companies에 GENERAL로 등록합니다.
@@ -427,8 +440,25 @@ async def process_chunk(client: httpx.AsyncClient, semaphore: asyncio.Semaphore,
                     upsert_general_company(sig.get("company_name", ""))
                     promoted += 1
 
+        summary.append((source_id, rcept_no, report_nm, saved, promoted))
+
+    # ── 4단계: 배열 upsert 1회 → 실패 row가 있는 공시만 ERROR ──────
+    res = await writer.close()
+    failed_rcepts: dict[str, int] = {}
+    for row, err in res.failed:
+        failed_rcepts[row.get("rcept_no") or ""] = failed_rcepts.get(row.get("rcept_no") or "", 0) + 1
+        print(f"    ❌ 시그널 저장 실패 ({row.get('rcept_no')}): {err[:200]}")
+
+    total_saved = 0
+    for source_id, rcept_no, report_nm, saved, promoted in summary:
+        if rcept_no in failed_rcepts:
+            await update_status(db, rcept_no, "ERROR")
+            saved -= failed_rcepts[rcept_no]
+            total_saved += saved
+            print(f"    ❌ 시그널 일부 저장 실패 → 오류 처리 (#{source_id}): [{report_nm}]")
+            continue
         total_saved += saved
-        await update_status(rcept_no, "READY_FOR_ANALYSIS")
+        await update_status(db, rcept_no, "READY_FOR_ANALYSIS")
         print(f"    ✅ 처리 완료 (#{source_id}): [{report_nm}] | 시그널 저장={saved}개, 잠재기업 등록={promoted}개")
 
     return total_saved
@@ -470,31 +500,37 @@ async def run() -> None:
     batch_num       = 0
 
     # READY_FOR_LLM이 없을 때까지 반복합니다.
-    while True:
-        disclosures = get_ready_disclosures()
-        if not disclosures:
-            if batch_num == 0:
-                print("[dart_llm_worker] READY_FOR_LLM 상태의 공시가 없습니다.")
-                print("  → dart_classifier_worker.py를 먼저 실행하여 분류를 완료해 주세요.")
-            break
-
-        batch_num   += 1
-        total_ready += len(disclosures)
-        est_calls    = (len(disclosures) + LLM_CHUNK_SIZE - 1) // LLM_CHUNK_SIZE
-        print(f"\n[배치 {batch_num}] 분석 대상: {len(disclosures)}건  /  예상 LLM 호출 횟수: {est_calls}회\n")
-
-        semaphore = asyncio.Semaphore(CONCURRENT_LIMIT)
-
-        async with httpx.AsyncClient() as client:
-            for i in range(0, len(disclosures), LLM_CHUNK_SIZE):
-                # ★ LLM_CHUNK_SIZE 단위로 공시를 잘라서 하나씩 Bulk 처리합니다.
-                # LLM_CHUNK_SIZE를 바꾸면 이 슬라이싱 크기가 달라집니다.
-                chunk     = disclosures[i: i + LLM_CHUNK_SIZE]
-                chunk_num = i // LLM_CHUNK_SIZE + 1
-                print(f"  [청크 {chunk_num}/{est_calls}] {len(chunk)}건 묶음 처리 시작...")
-                saved  = await process_chunk(client, semaphore, chunk)
-                total_signals   += saved
-                total_llm_calls += 1
+    # 시작 시점 대기열(queue_depth)만큼 처리하면 멈춥니다. (처리 중 새로 쌓인 공시는 다음 실행에서)
+    async with async_supabase_client() as db:
+        queue_depth = await count_ready_disclosures(db)
+        print(f"[dart_llm_worker] READY_FOR_LLM 대기열: {queue_depth}건")
+
+        while queue_depth > 0:
+            disclosures = await get_ready_disclosures(db)
+            if not disclosures:
+                if batch_num == 0:
+                    print("[dart_llm_worker] READY_FOR_LLM 상태의 공시가 없습니다.")
+                    print("  → dart_classifier_worker.py를 먼저 실행하여 분류를 완료해 주세요.")
+                break
+
+            batch_num   += 1
+            total_ready += len(disclosures)
+            queue_depth -= len(disclosures)
+            est_calls    = (len(disclosures) + LLM_CHUNK_SIZE - 1) // LLM_CHUNK_SIZE
+            print(f"\n[배치 {batch_num}] 분석 대상: {len(disclosures)}건  /  예상 LLM 호출 횟수: {est_calls}회\n")
+
+            semaphore = asyncio.Semaphore(CONCURRENT_LIMIT)
+
+            async with httpx.AsyncClient() as client:
+                for i in range(0, len(disclosures), LLM_CHUNK_SIZE):
+                    # ★ LLM_CHUNK_SIZE 단위로 공시를 잘라서 하나씩 Bulk 처리합니다.
+                    # LLM_CHUNK_SIZE를 바꾸면 이 슬라이싱 크기가 달라집니다.
+                    chunk     = disclosures[i: i + LLM_CHUNK_SIZE]
+                    chunk_num = i // LLM_CHUNK_SIZE + 1
+                    print(f"  [청크 {chunk_num}/{est_calls}] {len(chunk)}건 묶음 처리 시작...")
+                    saved  = await process_chunk(client, semaphore, chunk, db)
+                    total_signals   += saved
+                    total_llm_calls += 1
 
     print("\n" + "=" * 60)
     print("[dart_llm_worker] 분석 완료")
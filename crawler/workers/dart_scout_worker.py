@@ -27,10 +27,11 @@ import httpx
 from bs4 import BeautifulSoup
 from openai import OpenAI
 
-from repositories.db import supabase
+from repositories.db import async_supabase_client
 from config.dart_keywords import EXCLUDE_KEYWORDS, TARGET_KEYWORDS
 from config import DART_API_KEY, OPENAI_API_KEY
-from services.instant_signal_service import upsert_signal, upsert_general_company, should_promote_to_potential
+from services.instant_signal_service import upsert_general_company, should_promote_to_potential
+from services.signal_writer import AsyncSignalWriter
 from analysis.signal_scout import extract_signals
 
 openai_client = OpenAI(api_key=OPENAI_API_KEY) if OPENAI_API_KEY else None
@@ -50,7 +51,7 @@ def preprocess_title(report_nm: str) -> str:
     return title
 
 
-async def update_status(rcept_no: str, status: str, scout_result: dict | None = None):
+async def update_status(db, rcept_no: str, status: str, scout_result: dict | None = None):
     """
     공시의 처리 상태를 dart_disclosures 테이블에 업데이트합니다.
 
@@ -63,20 +64,29 @@ async def update_status(rcept_no: str, status: str, scout_result: dict | None =
     if scout_result is not None:
         payload["scout_result"] = json.dumps(scout_result, ensure_ascii=False)
 
-    def _do_update():
-        return supabase.table("dart_disclosures").update(payload).eq("rcept_no", rcept_no).execute()
+    # 비동기 DB 클라이언트로 직접 요청합니다. (to_thread 스레드풀을 거치지 않음)
+    await db.table("dart_disclosures").update(payload, returning="minimal").eq("rcept_no", rcept_no).execute()
 
-    # Supabase 요청은 동기 함수이므로 비동기 루프를 블로킹하지 않도록 스레드로 분리합니다.
-    await asyncio.to_thread(_do_update)
 
+async def count_pending_disclosures(db) -> int:
+    """PENDING 대기열 깊이. HEAD 요청으로 건수만 받습니다. (row를 내려받지 않음)"""
+    result = await (
+        db
+        .table("dart_disclosures")
+        .select("rcept_no", count="exact", head=True)
+        .eq("scout_status", "PENDING")
+        .execute()
+    )
+    return result.count or 0
 
-def get_pending_disclosures(limit: int = BATCH_SIZE) -> list[dict]:
+
+async def get_pending_disclosures(db, limit: int = BATCH_SIZE) -> list[dict]:
     """
     아직 처리하지 않은(PENDING) 공시 목록을 DB에서 가져옵니다.
     fetch_disclosures_dual_track.py가 새 공시를 PENDING으로 INSERT합니다.
     """
-    result = (
-        supabase
+    result = await (
+        db
         .table("dart_disclosures")
         .select("*")
         .eq("scout_status", "PENDING")
@@ -86,7 +96,7 @@ def get_pending_disclosures(limit: int = BATCH_SIZE) -> list[dict]:
     return result.data
 
 
-async def fetch_and_extract_signals(client: httpx.AsyncClient, rcept_no: str, corp_name: str, report_nm: str) -> dict:
+async def fetch_and_extract_signals(client: httpx.AsyncClient, db, rcept_no: str, corp_name: str, report_nm: str) -> dict:
     """
     DART 공시 원문을 다운로드하고 LLM으로 시그널을 추출합니다.
 
@@ -174,13 +184,16 @@ async def fetch_and_extract_signals(client: httpx.AsyncClient, rcept_no: str, co
             saved    = 0
             promoted = 0
 
+            # 공시 1건의 시그널을 모아 배열 upsert 1회로 저장합니다.
+            writer = AsyncSignalWriter(db)
+
             for sig in signals:
                 # LLM이 엉뚱한 회사명을 추출할 수 있으므로, DART에서 가져온 정확한 회사명으로 강제 덮어씁니다.
                 sig["company_name"] = corp_name
 
                 # 공시 데이터는 공식 자료이므로 신뢰도 0.70 이상인 시그널만 저장합니다.
                 if float(sig.get("confidence", 1.0)) >= 0.70:
-                    upsert_signal(None, sig, source="dart", rcept_no=rcept_no)
+                    await writer.add(None, sig, source="dart", rcept_no=rcept_no)
                     saved += 1
 
                     # 잠재 기업 발굴 조건을 충족하면 companies에 GENERAL로 등록합니다.
@@ -188,10 +201,15 @@ async def fetch_and_extract_signals(client: httpx.AsyncClient, rcept_no: str, co
                         upsert_general_company(sig.get("company_name", ""))
                         promoted += 1
 
+            flushed = await writer.close()
+            if flushed.failed:
+                return {"source": "html_parse_error",
+                        "error": f"시그널 저장 실패 {len(flushed.failed)}건: {flushed.failed[0][1][:200]}"}
+
             return {
                 "source":             "html_parse_llm",
                 "rcept_no":           rcept_no,
-                "signals_saved":      saved,
+                "signals_saved":      flushed.saved,
                 "potential_promoted": promoted
             }
 
@@ -205,6 +223,7 @@ async def process_disclosure(
     client: httpx.AsyncClient,
     semaphore: asyncio.Semaphore,
     disclosure: dict,
+    db,
 ):
     """
     공시 1건을 분류하고 처리합니다.
@@ -229,15 +248,15 @@ async def process_disclosure(
             for kw in EXCLUDE_KEYWORDS:
                 if kw in clean:
                     print(f"  ⏭️  SKIPPED {tag}: [{report_nm}] ('{kw}')")
-                    await update_status(rcept_no, "SKIPPED")
+                    await update_status(db, rcept_no, "SKIPPED")
                     return
 
             # ── 통합 경로: 타겟 키워드 포함 → 원문 파싱 + LLM 분석 ───
             for kw in TARGET_KEYWORDS:
                 if kw in clean:
                     print(f"  🧠 원문분석 {tag}: [{report_nm}] ('{kw}')")
-                    result = await fetch_and_extract_signals(client, rcept_no, corp_name, report_nm)
-                    await update_status(rcept_no, "READY_FOR_ANALYSIS", scout_result=result)
+                    result = await fetch_and_extract_signals(client, db, rcept_no, corp_name, report_nm)
+                    await update_status(db, rcept_no, "READY_FOR_ANALYSIS", scout_result=result)
 
                     saved_str = (
                         f"| 신호 저장: {result.get('signals_saved', 0)}개"
@@ -249,7 +268,7 @@ async def process_disclosure(
 
             # ── 경로 3: 어느 키워드도 해당 없음 → UNMATCHED 처리 ─────
             print(f"  ❓ UNMATCHED {tag}: [{report_nm}]")
-            await update_status(rcept_no, "UNMATCHED")
+            await update_status(db, rcept_no, "UNMATCHED")
 
     except Exception as e:
         print(f"  ❌ 오류 [{disclosure.get('report_nm', '?')}]: {e}")
@@ -274,21 +293,27 @@ async def run():
 
     # PENDING이 남아있지 않을 때까지 반복합니다.
     # BATCH_SIZE(100)보다 많은 공시가 쌓여 있어도 전부 처리합니다.
-    while True:
-        disclosures = get_pending_disclosures()
-        if not disclosures:
-            if batch_num == 0:
-                print("[dart_scout_worker] PENDING 공시 없음.")
-            break
-
-        batch_num += 1
-        total_processed += len(disclosures)
-        print(f"\n[배치 {batch_num}] 처리 대상: {len(disclosures)}개 (누적: {total_processed}개)\n")
-
-        semaphore = asyncio.Semaphore(CONCURRENT_LIMIT)
-        async with httpx.AsyncClient() as client:
-            tasks = [process_disclosure(client, semaphore, d) for d in disclosures]
-            await asyncio.gather(*tasks, return_exceptions=True)
+    # 시작 시점 대기열(queue_depth)만큼 처리하면 멈춥니다. (처리 중 새로 쌓인 공시는 다음 실행에서)
+    async with async_supabase_client() as db:
+        queue_depth = await count_pending_disclosures(db)
+        print(f"[dart_scout_worker] PENDING 대기열: {queue_depth}건")
+
+        while queue_depth > 0:
+            disclosures = await get_pending_disclosures(db)
+            if not disclosures:
+                if batch_num == 0:
+                    print("[dart_scout_worker] PENDING 공시 없음.")
+                break
+
+            batch_num += 1
+            total_processed += len(disclosures)
+            queue_depth -= len(disclosures)
+            print(f"\n[배치 {batch_num}] 처리 대상: {len(disclosures)}개 (누적: {total_processed}개)\n")
+
+            semaphore = asyncio.Semaphore(CONCURRENT_LIMIT)
+            async with httpx.AsyncClient() as client:
+                tasks = [process_disclosure(client, semaphore, d, db) for d in disclosures]
+                await asyncio.gather(*tasks, return_exceptions=True)
 
     print("\n" + "=" * 55)
     print("[dart_scout_worker] 완료")
@@ -13,6 +13,8 @@ env(선택):
 - SCORE_MED_THRESHOLD (기본 40)
 - SCORE_TARGET_DATE=YYYY-MM-DD (테스트용)
 - SCORE_TARGET_DAYS_AGO (기본 1)
+- SCORE_USE_RPC (기본 1) : 1이면 DB 함수 aggregate_company_signal_daily(crawler/sql/rpc_aggregations.sql)로
+                           일간 집계를 서버에서 수행. 함수가 없거나 실패하면 파이썬 집계로 폴백
 """
 
 from __future__ import annotations
@@ -20,9 +22,9 @@ from __future__ import annotations
 from datetime import datetime, timedelta, date
 import math
 import os
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
-from repositories.db import supabase
+from repositories.db import supabase, stream_rows
 
 
 def _kst_today() -> date:
@@ -45,12 +47,86 @@ def _safe_upsert(table: str, key_cols: List[str], row: Dict[str, Any]) -> None:
     existing = q.limit(1).execute().data or []
 
     if existing:
-        uq = supabase.table(table).update(row)
+        uq = supabase.table(table).update(row, returning="minimal")
         for k in key_cols:
             uq = uq.eq(k, row[k])
         uq.execute()
     else:
-        supabase.table(table).insert(row).execute()
+        supabase.table(table).insert(row, returning="minimal").execute()
+
+
+def _stream_day_signals(target_date: date) -> Iterator[Dict[str, Any]]:
+    # 하루치 signals를 페이지 단위로 읽습니다. (max-rows 제한으로 잘리지 않음)
+    # 구간은 [당일 00:00, 다음날 00:00) — 같은 컬럼의 gte/lt 두 조건이 모두 전송됩니다.
+    start = datetime.combine(target_date, datetime.min.time())
+    end = start + timedelta(days=1)
+    return stream_rows(
+        lambda: (
+            supabase.table("signals")
+            .select("id, company_name, impact_type, impact_strength, severity_level, confidence, created_at")
+            .gte("created_at", start.isoformat())
+            .lt("created_at", end.isoformat())
+        ),
+        key="id",
+    )
+
+
+def _accumulate_daily(signals: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    daily_scores: Dict[str, Dict[str, float]] = {}
+
+    for s in signals:
+        company = (s.get("company_name") or "").strip()
+        if not company:
+            continue
+
+        try:
+            raw = float(s["impact_strength"]) * float(s["severity_level"]) * float(s["confidence"])
+        except Exception:
+            continue
+
+        daily_scores.setdefault(company, {"risk": 0.0, "opp": 0.0})
+
+        if (s.get("impact_type") or "").lower() == "risk":
+            daily_scores[company]["risk"] += raw
+        else:
+            daily_scores[company]["opp"] += raw
+
+    return daily_scores
+
+
+def _rpc_daily_scores(target_date: date) -> Optional[Dict[str, Dict[str, float]]]:
+    # 서버 측 group by: 회사 수만큼의 row만 내려받습니다. 사용 불가면 None.
+    if (os.getenv("SCORE_USE_RPC") or "1").strip() == "0":
+        return None
+
+    start = datetime.combine(target_date, datetime.min.time())
+    end = start + timedelta(days=1)
+    try:
+        rows = (
+            supabase.rpc(
+                "aggregate_company_signal_daily",
+                {"p_start": start.isoformat(), "p_end": end.isoformat()},
+            )
+            .execute()
+            .data
+            or []
+        )
+    except Exception as e:
+        print(f"[ScoreWorker] ⚠️ RPC aggregate_company_signal_daily 실패 → 파이썬 집계로 폴백: {e}")
+        return None
+
+    return {
+        r["company_name"]: {"risk": float(r.get("risk_score_raw") or 0.0), "opp": float(r.get("opp_score_raw") or 0.0)}
+        for r in rows
+        if r.get("company_name")
+    }
+
+
+def _daily_scores(target_date: date) -> Dict[str, Dict[str, float]]:
+    scores = _rpc_daily_scores(target_date)
+    if scores is None:
+        scores = _accumulate_daily(_stream_day_signals(target_date))
+    return scores
 
 
 def aggregate_daily_scores() -> None:
@@ -64,21 +140,10 @@ def aggregate_daily_scores() -> None:
 
     print(f"[ScoreWorker] Aggregating signals for {target_date}")
 
-    start = datetime.combine(target_date, datetime.min.time())
-    end = datetime.combine(target_date, datetime.max.time())
-
-    signals = (
-        supabase.table("signals")
-        .select("company_name, impact_type, impact_strength, severity_level, confidence, created_at")
-        .gte("created_at", start.isoformat())
-        .lte("created_at", end.isoformat())
-        .execute()
-        .data
-        or []
-    )
+    daily_scores = _daily_scores(target_date)
 
     # 테스트 편의: 지정 날짜에 없으면 최신 날짜로 fallback
-    if not signals:
+    if not daily_scores:
         latest = (
             supabase.table("signals")
             .select("created_at")
@@ -93,36 +158,7 @@ def aggregate_daily_scores() -> None:
             if latest_date != target_date:
                 target_date = latest_date
                 print(f"[ScoreWorker] No signals on requested date. Fallback to latest date: {target_date}")
-                start = datetime.combine(target_date, datetime.min.time())
-                end = datetime.combine(target_date, datetime.max.time())
-                signals = (
-                    supabase.table("signals")
-                    .select("company_name, impact_type, impact_strength, severity_level, confidence, created_at")
-                    .gte("created_at", start.isoformat())
-                    .lte("created_at", end.isoformat())
-                    .execute()
-                    .data
-                    or []
-                )
-
-    daily_scores: Dict[str, Dict[str, float]] = {}
-
-    for s in signals:
-        company = (s.get("company_name") or "").strip()
-        if not company:
-            continue
-
-        try:
-            raw = float(s["impact_strength"]) * float(s["severity_level"]) * float(s["confidence"])
-        except Exception:
-            continue
-
-        daily_scores.setdefault(company, {"risk": 0.0, "opp": 0.0})
-
-        if (s.get("impact_type") or "").lower() == "risk":
-            daily_scores[company]["risk"] += raw
-        else:
-            daily_scores[company]["opp"] += raw
+                daily_scores = _daily_scores(target_date)
 
     for company, values in daily_scores.items():
         row = {
@@ -12,7 +12,8 @@ workers/signal_scout_worker.py — 미처리 뉴스 기사 LLM 재분석 워커
 
 함수 재사용:
     중복 코드 방지를 위해 instant_signal_service.py의 공통 함수를 사용합니다.
-    (make_event_hash, should_promote_to_potential, upsert_signal, upsert_general_company)
+    (should_promote_to_potential, upsert_general_company)
+    시그널 저장은 signal_writer.SignalWriter로 기사 단위 배열 upsert 합니다.
 """
 from __future__ import annotations
 
@@ -25,10 +26,10 @@ from repositories.db import supabase
 from analysis.signal_scout import extract_signals
 from services.instant_signal_service import (
     CONF_SIGNAL_SAVE,
-    upsert_signal,
     upsert_general_company,
     should_promote_to_potential,
 )
+from services.signal_writer import SignalWriter
 
 
 # ---------------------------------------------------
@@ -58,7 +59,7 @@ def update_article_status(article_id: str, status: str) -> None:
     (
         supabase
         .table("articles")
-        .update({"scout_status": status})
+        .update({"scout_status": status}, returning="minimal")
         .eq("id", article_id)
         .execute()
     )
@@ -92,21 +93,25 @@ def run_signal_scout(limit: int = 20) -> None:
             result = extract_signals(article) or {}
             signals = result.get("signals", []) or []
 
-            saved_cnt    = 0
             promoted_cnt = 0
 
+            # 기사 1건의 시그널을 모아 배열 upsert 1회로 저장합니다.
+            writer = SignalWriter()
             for sig in signals:
                 if float(sig.get("confidence", 1)) < CONF_SIGNAL_SAVE:
                     continue
 
-                # instant_signal_service의 공통 함수 사용 (중복 코드 제거)
-                upsert_signal(aid, sig, source="news")
-                saved_cnt += 1
+                writer.add(aid, sig, source="news")
 
                 if should_promote_to_potential(sig):
                     upsert_general_company(sig.get("company_name", ""))
                     promoted_cnt += 1
 
+            flushed = writer.close()
+            if flushed.failed:
+                raise RuntimeError(f"시그널 저장 실패 {len(flushed.failed)}건: {flushed.failed[0][1][:200]}")
+            saved_cnt = flushed.saved
+
             update_article_status(aid, "done")
             print(f"✅ done: {aid} (signals={saved_cnt}, general_added={promoted_cnt})")
 